@@ -1,4 +1,12 @@
 from django.contrib import admin
 from .models import Booking
 
-admin.site.register(Booking)
\ No newline at end of file
+class BookingAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'total_price', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('customer__username', 'hotel__name')
+    list_select_related = ('customer', 'hotel')
+    raw_id_fields = ('customer', 'hotel')
+    ordering = ('-created_at',)
+
+admin.site.register(Booking, BookingAdmin)
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class BookingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'Booking'
\ No newline at end of file
+    name = 'Booking'
+
+    def ready(self):
+        from .models import Booking
+        from .signals import booking_deleted, booking_saved
+
+        post_save.connect(booking_saved, sender=Booking)
+        post_delete.connect(booking_deleted, sender=Booking)
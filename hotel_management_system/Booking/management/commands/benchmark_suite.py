@@ -0,0 +1,150 @@
+import json
+import random
+from datetime import timedelta
+from itertools import count
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from hotel_management_system.benchmarking import database_profile, measure_queries, summarize, throwaway_database
+from hotel_management_system.datagen import generate_dataset
+from Booking.services import OverlappingBooking, RoomsUnavailable, create_booking
+from User.forms import CustomUserCreationForm
+from User.models import User
+
+PASSWORD = "Benchmark-Password-1"
+
+class Command(BaseCommand):
+    help = (
+        "Generates a realistic dataset in a throwaway test database and times the hot paths "
+        "(registration, login, booking creation, availability, search and admin changelists). "
+        "Latency percentiles and queries per operation are written to a JSON file, "
+        "and --compare prints the p50 change against a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--hotels', type=int, default=200)
+        parser.add_argument('--bookings', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=50, help="Calls per operation.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default="benchmark-results.json")
+        parser.add_argument('--compare', help="JSON file of a previous run.")
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as handle:
+                    previous = json.load(handle)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        with throwaway_database(), override_settings(ALLOWED_HOSTS=['testserver']):
+            results = self.run(options)
+
+        with open(options['output'], 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, default=str)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+        if previous:
+            self.compare(previous, results)
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        data = generate_dataset(
+            users=options['users'], hotels=options['hotels'], bookings=options['bookings'],
+            seed=options['seed'], password=PASSWORD,
+        )
+        hotels, customers = data['hotels'], data['customers']
+        today = now().date()
+        client = Client()
+        serial = count()
+
+        def register():
+            i = next(serial)
+            form = CustomUserCreationForm(data={
+                'username': f"bench_new_{i}", 'email': f"bench_new_{i}@example.com",
+                'password1': PASSWORD, 'password2': PASSWORD, 'is_customer': True,
+            })
+            if not form.is_valid():
+                raise CommandError(f"Registration form is invalid: {form.errors.as_text()}")
+            form.save()
+
+        def login():
+            response = Client().post(
+                reverse('login'), {'username': rng.choice(customers).username, 'password': PASSWORD}
+            )
+            if response.status_code != 302:
+                raise CommandError("Login failed.")
+
+        def book():
+            check_in = today + timedelta(days=rng.randint(0, 60))
+            try:
+                create_booking(
+                    rng.choice(customers), rng.choice(hotels), check_in, check_in + timedelta(days=rng.randint(1, 5))
+                )
+            except (RoomsUnavailable, OverlappingBooking):
+                pass
+
+        def availability():
+            check_in = today + timedelta(days=rng.randint(0, 60))
+            client.get(reverse('hotel_availability'), {
+                'city': rng.choice(hotels).city,
+                'check_in': check_in.isoformat(),
+                'check_out': (check_in + timedelta(days=3)).isoformat(),
+            })
+
+        def search():
+            client.get(reverse('hotel_search'), {'city': rng.choice(hotels).city, 'amenities': "wifi"})
+
+        admin = Client()
+        admin.force_login(User.objects.create_superuser(
+            username="bench_admin", email="bench_admin@example.com", password=PASSWORD
+        ))
+
+        def changelist(name):
+            return lambda: admin.get(reverse(f"admin:{name}_changelist"))
+
+        operations = {
+            'registration': register,
+            'login': login,
+            'booking_creation': book,
+            'availability': availability,
+            'hotel_search': search,
+            'admin_bookings': changelist("Booking_booking"),
+            'admin_hotels': changelist("Hotel_hotel"),
+            'admin_users': changelist("User_user"),
+        }
+        results = {
+            'meta': {
+                'timestamp': now().isoformat(),
+                'dataset': {key: options[key] for key in ('users', 'hotels', 'bookings', 'seed')},
+                'repeat': options['repeat'],
+                'database': database_profile(),
+            },
+            'operations': {},
+        }
+        for name, func in operations.items():
+            samples, queries = measure_queries(func, options['repeat'])
+            stats = summarize(samples)
+            stats['queries_mean'] = round(sum(queries) / len(queries), 1)
+            stats['queries_max'] = max(queries)
+            results['operations'][name] = stats
+            self.stdout.write(
+                f"{name:<18} p50={stats['p50_ms']:>9.3f} ms  p95={stats['p95_ms']:>9.3f} ms  "
+                f"p99={stats['p99_ms']:>9.3f} ms  queries={stats['queries_mean']}"
+            )
+        return results
+
+    def compare(self, previous, current):
+        self.stdout.write("p50 change against the previous run:")
+        for name, stats in current['operations'].items():
+            before = previous.get('operations', {}).get(name)
+            if not before or not before['p50_ms']:
+                continue
+            change = 100 * (stats['p50_ms'] - before['p50_ms']) / before['p50_ms']
+            self.stdout.write(
+                f"{name:<18} {before['p50_ms']:>9.3f} -> {stats['p50_ms']:>9.3f} ms ({change:+.1f}%)  "
+                f"queries {before['queries_mean']} -> {stats['queries_mean']}"
+            )
@@ -0,0 +1,29 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from Booking.models import Booking
+
+class Command(BaseCommand):
+    help = (
+        "Expires the pending bookings older than --minutes and releases "
+        "their rooms. Works in bounded batches, each in its own short transaction; meant to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=30, help="Age after which a pending booking expires.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **options):
+        stale = Booking.objects.stale(now() - timedelta(minutes=options['minutes']))
+        expired = 0
+        while True:
+            pks = list(stale.order_by('pk').values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            expired += Booking.objects.filter(pk__in=pks).expire()
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} pending bookings."))
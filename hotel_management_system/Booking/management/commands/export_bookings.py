@@ -0,0 +1,40 @@
+import csv
+import json
+from django.core.management.base import BaseCommand
+from Booking.models import Booking
+
+FIELDS = ('customer', 'hotel', 'check_in', 'check_out', 'status', 'total_price')
+
+class Command(BaseCommand):
+    help = "Streams every booking to a CSV or JSONL file in the format read by import_bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help="Output file. Defaults to stdout.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rows = Booking.objects.order_by('pk').values_list(
+            'customer__username', 'hotel__name', 'check_in', 'check_out', 'status', 'total_price'
+        ).iterator(chunk_size=options['chunk_size'])
+
+        output = open(options['path'], 'w', newline='', encoding='utf-8') if options['path'] else self.stdout
+        try:
+            if options['format'] == 'csv':
+                writer = csv.writer(output)
+                writer.writerow(FIELDS)
+                for customer, hotel, check_in, check_out, status, total_price in rows:
+                    writer.writerow((customer, hotel, check_in.isoformat(), check_out.isoformat(), status, total_price))
+            else:
+                for customer, hotel, check_in, check_out, status, total_price in rows:
+                    output.write(json.dumps({
+                        'customer': customer,
+                        'hotel': hotel,
+                        'check_in': check_in.isoformat(),
+                        'check_out': check_out.isoformat(),
+                        'status': status,
+                        'total_price': str(total_price) if total_price is not None else None,
+                    }) + '\n')
+        finally:
+            if output is not self.stdout:
+                output.close()
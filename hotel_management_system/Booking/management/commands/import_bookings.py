@@ -0,0 +1,204 @@
+import csv
+import json
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from Booking.models import Booking
+from Booking.services import RoomsUnavailable, reserve_rooms
+from Hotel.cache import invalidate_hotel
+from Hotel.models import Hotel, HotelDailyStats, RoomInventory
+from User.models import User
+
+class Command(BaseCommand):
+    help = (
+        "Streams bookings from a CSV or JSONL file (columns: customer, hotel, check_in, check_out, status) "
+        "and loads them with chunked bulk_create. Customers are matched by username and hotels by name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help="Validate the file without writing anything.")
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.json')) else 'csv')
+        batch_size = options['batch_size']
+
+        # One pre-built map per foreign key instead of a lookup per row.
+        hotels = {name: (pk, price) for name, pk, price in Hotel.objects.values_list('name', 'pk', 'price_night')}
+        customers = dict(User.objects.values_list('username', 'pk'))
+
+        created = invalid = 0
+        batch = []
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as handle:
+                for line, row in enumerate(self.read_rows(handle, file_format), start=1):
+                    try:
+                        if file_format == 'jsonl':
+                            row = json.loads(row)
+                        if not isinstance(row, dict):
+                            raise ValueError("A row must be an object.")
+                        booking = self.build_booking(row, hotels, customers)
+                    except (KeyError, TypeError, ValueError, InvalidOperation) as exc:
+                        invalid += 1
+                        self.stderr.write(f"Row {line}: {exc}")
+                        continue
+
+                    batch.append(booking)
+                    if len(batch) >= batch_size:
+                        loaded = self.load(batch, options['dry_run'])
+                        created += len(loaded)
+                        invalid += len(batch) - len(loaded)
+                        batch = []
+        except OSError as exc:
+            raise CommandError(exc)
+
+        loaded = self.load(batch, options['dry_run'])
+        created += len(loaded)
+        invalid += len(batch) - len(loaded)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} bookings ({invalid} invalid rows skipped)."))
+
+    def read_rows(self, handle, file_format):
+        """
+        Yields CSV rows as dicts and JSONL rows as raw lines, decoded per row by the caller
+        so one bad line only skips that row.
+        """
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield line
+
+    def build_booking(self, row, hotels, customers):
+        """
+        Validates a row the way Booking.clean does and builds the unsaved Booking.
+        The stored total_price of the row (as written by export_bookings) is kept; rows without one
+        are priced at the base price of the hotel.
+        """
+        if row.get('hotel') not in hotels:
+            raise ValueError(f"Unknown hotel {row.get('hotel')!r}.")
+        if row.get('customer') not in customers:
+            raise ValueError(f"Unknown customer {row.get('customer')!r}.")
+
+        check_in = date.fromisoformat(row['check_in'])
+        check_out = date.fromisoformat(row['check_out'])
+        if check_in >= check_out:
+            raise ValueError("Check-in date must be before check-out date.")
+
+        status = row.get('status') or Booking.PENDING
+        if status not in dict(Booking.STATUS_CHOICES):
+            raise ValueError(f"Unknown status {status!r}.")
+
+        hotel_id, price_night = hotels[row['hotel']]
+        if row.get('total_price') not in (None, ''):
+            total_price = Decimal(str(row['total_price']))
+            if not total_price.is_finite() or total_price < 0:
+                raise ValueError(f"Invalid total price {row['total_price']!r}.")
+        else:
+            total_price = price_night * Decimal((check_out - check_in).days)
+        return Booking(
+            customer_id=customers[row['customer']],
+            hotel_id=hotel_id,
+            check_in=check_in,
+            check_out=check_out,
+            status=status,
+            total_price=total_price,
+        )
+
+    def load(self, batch, dry_run):
+        """
+        Inserts a batch and applies its side effects in the same transaction, so a batch is either
+        fully accounted for or not loaded at all. The rooms of the held bookings are reserved first,
+        and the bookings that do not fit the hotel are rejected. The overlap and date constraints
+        are enforced by the database, so a batch is only retried row by row when one of its rows
+        breaks them. Returns the bookings loaded.
+        """
+        if dry_run or not batch:
+            return batch
+        with transaction.atomic():
+            batch = self.reserve(batch)
+            try:
+                with transaction.atomic():
+                    loaded = Booking.objects.bulk_create(batch)
+            except IntegrityError:
+                loaded, rejected = [], []
+                for booking in batch:
+                    try:
+                        with transaction.atomic():
+                            loaded += Booking.objects.bulk_create([booking])
+                    except IntegrityError as exc:
+                        rejected.append(booking)
+                        self.reject(booking, exc)
+                # Give back the rooms reserved for the rejected bookings
+                RoomInventory.objects.add_nights(self.held_nights(rejected, -1))
+            self.apply_effects(loaded)
+        return loaded
+
+    def reserve(self, batch):
+        """
+        Reserves the rooms of the held bookings of a batch and returns the bookings that fit.
+        The whole batch is tried with one conditional update per hotel and night group; when some
+        night is full or not opened yet, the bookings are reserved one by one like create_booking does.
+        """
+        held = [booking for booking in batch if booking.status in Booking.HOLDS_INVENTORY]
+        if RoomInventory.objects.add_nights(self.held_nights(held, 1)):
+            return batch
+
+        hotels = Hotel.objects.in_bulk({booking.hotel_id for booking in held})
+        fitting = []
+        for booking in batch:
+            if booking.status in Booking.HOLDS_INVENTORY:
+                try:
+                    with transaction.atomic():
+                        reserve_rooms(hotels[booking.hotel_id], booking.check_in, booking.check_out)
+                except RoomsUnavailable as exc:
+                    self.reject(booking, exc.message)
+                    continue
+            fitting.append(booking)
+        return fitting
+
+    def held_nights(self, bookings, rooms):
+        """
+        Returns the {(hotel_id, night): rooms} deltas of the held bookings among `bookings`.
+        """
+        nights = Counter()
+        for booking in bookings:
+            if booking.status in Booking.HOLDS_INVENTORY:
+                for offset in range(booking.get_duration()):
+                    nights[booking.hotel_id, booking.check_in + timedelta(days=offset)] += rooms
+        return nights
+
+    def reject(self, booking, reason):
+        self.stderr.write(
+            f"Booking of customer {booking.customer_id} at hotel {booking.hotel_id} "
+            f"({booking.check_in} to {booking.check_out}) rejected: {reason}"
+        )
+
+    def apply_effects(self, bookings):
+        """
+        Applies the counter and rollup changes of the loaded bookings in bulk,
+        since bulk_create skips the signal receivers (their rooms are reserved by `reserve`).
+        """
+        total_bookings = Counter()
+        confirmed_bookings = Counter()
+        confirmed_nights = defaultdict(lambda: [0, Decimal('0')])
+        for booking in bookings:
+            total_bookings[booking.customer_id] += 1
+            stay = [booking.check_in + timedelta(days=offset) for offset in range(booking.get_duration())]
+            if booking.status == Booking.CONFIRMED:
+                confirmed_bookings[booking.customer_id] += 1
+                for night, amount in zip(stay, booking.get_night_amounts()):
+                    totals = confirmed_nights[booking.hotel_id, night]
+                    totals[0] += 1
+                    totals[1] += amount
+
+        User.objects.adjust_counter('total_bookings', total_bookings)
+        User.objects.adjust_counter('confirmed_bookings', confirmed_bookings)
+        HotelDailyStats.objects.record_nights({key: tuple(totals) for key, totals in confirmed_nights.items()})
+        for hotel_id in {booking.hotel_id for booking in bookings}:
+            invalidate_hotel(hotel_id)
@@ -0,0 +1,83 @@
+import threading
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from hotel_management_system.benchmarking import database_profile
+from Booking.models import Booking
+from Booking.services import RoomsUnavailable, create_booking
+from Hotel.models import Hotel, RoomInventory
+from User.models import User
+
+class Command(BaseCommand):
+    help = (
+        "Runs N parallel bookers against one hotel and reports overselling and write throughput "
+        "for the active database profile (see DB_ENGINE and the SQLITE_* settings)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+        parser.add_argument('--rooms', type=int, default=200, help="Rooms of the stress hotel.")
+        parser.add_argument('--attempts', type=int, default=400, help="Booking attempts per run.")
+
+    def handle(self, *args, **options):
+        profile = database_profile()
+        self.stdout.write("database: " + " ".join(f"{key}={value}" for key, value in profile.items()))
+        owner = User.objects.create_user(
+            username="stress_owner", email="stress_owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        # One customer per attempt: a customer cannot hold two overlapping stays at the same hotel.
+        customers = [
+            User.objects.create_user(username=f"stress_customer_{i}", email=f"stress_customer_{i}@example.com")
+            for i in range(options['attempts'])
+        ]
+        try:
+            for threads in options['threads']:
+                self.run(owner, [customers[i::threads] for i in range(threads)], options['rooms'])
+        finally:
+            User.objects.filter(pk__in=[owner.pk] + [customer.pk for customer in customers]).delete()
+
+    def run(self, owner, groups, rooms):
+        hotel = Hotel.objects.create(
+            name=f"Stress Hotel {len(groups)}", address="-", city="-", country="-",
+            owner=owner, total_rooms=rooms, available_rooms=rooms, price_night=100
+        )
+        check_in = date.today() + timedelta(days=30)
+        check_out = check_in + timedelta(days=3)
+        RoomInventory.objects.initialize([hotel], start=check_in, days=3)
+
+        attempts = sum(len(group) for group in groups)
+        results = {'booked': 0, 'rejected': 0}
+        lock = threading.Lock()
+
+        def booker(group):
+            booked = rejected = 0
+            try:
+                for customer in group:
+                    try:
+                        create_booking(customer, hotel, check_in, check_out, retries=20)
+                        booked += 1
+                    except RoomsUnavailable:
+                        rejected += 1
+            finally:
+                connection.close()
+            with lock:
+                results['booked'] += booked
+                results['rejected'] += rejected
+
+        workers = [threading.Thread(target=booker, args=(group,)) for group in groups]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        stored = Booking.objects.filter(hotel=hotel).count()
+        max_booked = max(RoomInventory.objects.for_stay(hotel, check_in, check_out).values_list('booked_rooms', flat=True))
+        oversold = max(stored - rooms, max_booked - rooms, 0)
+        self.stdout.write(
+            f"threads={len(groups):>3} booked={results['booked']:>5} rejected={results['rejected']:>5} "
+            f"oversold={oversold} throughput={attempts / elapsed:,.0f} attempts/s"
+        )
+        hotel.delete()
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Booking', '0002_booking_expired_status'),
+        ('Hotel', '0005_hotel_stats_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='booking',
+            options={'verbose_name': 'Booking', 'verbose_name_plural': 'Bookings'},
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['hotel', 'check_in', 'check_out'], name='booking_hotel_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'confirmed')), fields=['check_out'], name='booking_confirmed_checkout_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='booking_pending_created_idx'),
+        ),
+    ]
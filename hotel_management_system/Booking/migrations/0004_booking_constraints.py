@@ -0,0 +1,79 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A customer may not hold (pending or confirmed) two overlapping stays at the same hotel.
+HOLDING = "('pending', 'confirmed')"
+
+SQLITE_OVERLAP_CHECK = """
+BEGIN
+    SELECT RAISE(ABORT, 'booking_no_overlap')
+    WHERE EXISTS (
+        SELECT 1 FROM "{table}"
+        WHERE hotel_id = NEW.hotel_id AND customer_id = NEW.customer_id
+          AND check_in < NEW.check_out AND check_out > NEW.check_in
+          AND status IN {holding} AND id IS NOT NEW.id
+    );
+END
+"""
+
+
+def create_overlap_guard(apps, schema_editor):
+    """
+    Adds the overlap guard: an exclusion constraint on PostgreSQL, triggers on SQLite.
+    """
+    table = apps.get_model('Booking', 'Booking')._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        schema_editor.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT booking_no_overlap EXCLUDE USING gist '
+            f"(customer_id WITH =, hotel_id WITH =, daterange(check_in, check_out) WITH &&) "
+            f"WHERE (status IN {HOLDING})"
+        )
+    elif vendor == 'sqlite':
+        check = SQLITE_OVERLAP_CHECK.format(table=table, holding=HOLDING)
+        schema_editor.execute(
+            f'CREATE TRIGGER booking_no_overlap_insert BEFORE INSERT ON "{table}" '
+            f"WHEN NEW.status IN {HOLDING} {check}"
+        )
+        # Moving between holding statuses (pending -> confirmed) cannot create an overlap.
+        schema_editor.execute(
+            f'CREATE TRIGGER booking_no_overlap_update '
+            f'BEFORE UPDATE OF customer_id, hotel_id, check_in, check_out, status ON "{table}" '
+            f"WHEN NEW.status IN {HOLDING} AND (OLD.status NOT IN {HOLDING} "
+            f"OR NEW.customer_id != OLD.customer_id OR NEW.hotel_id != OLD.hotel_id "
+            f"OR NEW.check_in != OLD.check_in OR NEW.check_out != OLD.check_out) {check}"
+        )
+
+
+def drop_overlap_guard(apps, schema_editor):
+    table = apps.get_model('Booking', 'Booking')._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS booking_no_overlap')
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TRIGGER IF EXISTS booking_no_overlap_insert")
+        schema_editor.execute("DROP TRIGGER IF EXISTS booking_no_overlap_update")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Booking', '0003_booking_indexes'),
+        ('Hotel', '0006_hotel_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(('check_in__lt', models.F('check_out'))), name='booking_dates_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(('total_price__isnull', True), ('total_price__gte', 0), _connector='OR'), name='booking_total_price_non_negative'),
+        ),
+        migrations.RunPython(create_overlap_guard, drop_overlap_guard),
+    ]
@@ -1,20 +1,127 @@
-from django.db import models
+from collections import Counter, defaultdict
+from datetime import timedelta
+from decimal import ROUND_DOWN, Decimal
+from django.db import models, transaction
 from django.forms import ValidationError
 from User.models import User
-from Hotel.models import Hotel
+from Hotel.cache import invalidate_hotel
+from Hotel.models import Hotel, HotelDailyStats, RoomInventory
 from django.utils.timezone import now
 
+class BookingQuerySet(models.QuerySet):
+    def transition(self, status, batch_size=1000):
+        """
+        Moves the bookings of the queryset that allow it to `status` with set-based
+        UPDATE ... WHERE status IN (...) statements, and applies the side effects in the same
+        transaction: released room inventory, customer counters, hotel rollups and hotel cache.
+        Returns the number of bookings moved.
+        """
+        sources = Booking.TRANSITIONS[status]
+        with transaction.atomic():
+            moving = list(
+                self.filter(status__in=sources).select_for_update().only(
+                    'pk', 'customer_id', 'hotel_id', 'check_in', 'check_out', 'status', 'total_price'
+                )
+            )
+            if not moving:
+                return 0
+            pks = [booking.pk for booking in moving]
+            for offset in range(0, len(pks), batch_size):
+                Booking.objects.filter(pk__in=pks[offset:offset + batch_size], status__in=sources).update(
+                    status=status, updated_at=now()
+                )
+
+            released = Counter()
+            confirmed = Counter()
+            confirmed_nights = defaultdict(lambda: [0, Decimal('0')])
+            for booking in moving:
+                stay = [booking.check_in + timedelta(days=offset) for offset in range(booking.get_duration())]
+                if status not in Booking.HOLDS_INVENTORY:
+                    for night in stay:
+                        released[booking.hotel_id, night] -= 1
+                delta = (status == Booking.CONFIRMED) - (booking.status == Booking.CONFIRMED)
+                if delta:
+                    confirmed[booking.customer_id] += delta
+                    for night, amount in zip(stay, booking.get_night_amounts()):
+                        totals = confirmed_nights[booking.hotel_id, night]
+                        totals[0] += delta
+                        totals[1] += delta * amount
+
+            RoomInventory.objects.add_nights(released)
+            User.objects.adjust_counter('confirmed_bookings', confirmed)
+            HotelDailyStats.objects.record_nights({key: tuple(totals) for key, totals in confirmed_nights.items()})
+            for hotel_id in {booking.hotel_id for booking in moving}:
+                invalidate_hotel(hotel_id)
+        return len(moving)
+
+    def confirm(self):
+        """
+        Confirms the pending bookings.
+        """
+        return self.transition(Booking.CONFIRMED)
+
+    def cancel(self):
+        """
+        Cancels the pending and confirmed bookings, releasing their rooms.
+        """
+        return self.transition(Booking.CANCELED)
+
+    def expire(self):
+        """
+        Expires the pending bookings, releasing their rooms.
+        """
+        return self.transition(Booking.EXPIRED)
+
+    def overlapping(self, hotel, start, end):
+        """
+        Returns the bookings of a hotel whose stay intersects [start, end),
+        a range scan on the (hotel, check_in, check_out) index.
+        """
+        return self.filter(hotel=hotel, check_in__lt=end, check_out__gt=start)
+
+    def active(self, today=None):
+        """
+        Returns the confirmed bookings whose departure date has not passed (see Booking.is_active),
+        a range scan on the partial index of confirmed bookings.
+        """
+        return self.filter(status=Booking.CONFIRMED, check_out__gte=today or now().date())
+
+    def stale(self, created_before):
+        """
+        Returns the pending bookings created before `created_before`,
+        a range scan on the partial index of pending bookings.
+        """
+        return self.filter(status=Booking.PENDING, created_at__lt=created_before)
+
+
 class Booking(models.Model):
     PENDING = 'pending'
     CONFIRMED = 'confirmed'
     CANCELED = 'canceled'
+    EXPIRED = 'expired'
 
     STATUS_CHOICES = (
         (PENDING, 'Pending'),
         (CONFIRMED, 'Confirmed'),
         (CANCELED, 'Canceled'),
+        (EXPIRED, 'Expired'),
     )
 
+    # Allowed source statuses of every transition, and the statuses that keep their rooms booked
+    TRANSITIONS = {
+        CONFIRMED: (PENDING,),
+        CANCELED: (PENDING, CONFIRMED),
+        EXPIRED: (PENDING,),
+    }
+    HOLDS_INVENTORY = (PENDING, CONFIRMED)
+
+    # Database guard (trigger or exclusion constraint, see migration 0004) against a customer
+    # holding two overlapping stays at the same hotel. It lives outside Django's model state:
+    # on SQLite, any later AlterField/AddField/RemoveField on Booking rebuilds the table and drops
+    # the triggers, so such a migration must run create_overlap_guard again (test_overlap_guard_installed
+    # checks that they are still installed).
+    OVERLAP_GUARD = 'booking_no_overlap'
+
     #Fields
     customer = models.ForeignKey(User,on_delete=models.CASCADE, related_name="bookings")
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="bookings")
@@ -24,15 +131,81 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add= True)
     updated_at = models.DateTimeField(auto_now= True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
-    
+
+    objects = BookingQuerySet.as_manager()
 
     #Metadata
     class Meta:
-        ordering = ['-created_at']
         verbose_name = "Booking"
         verbose_name_plural = "Bookings"
+        indexes = [
+            models.Index(fields=['hotel', 'check_in', 'check_out'], name='booking_hotel_dates_idx'),
+            # Partial indexes for the two hot status queries, active() and stale()
+            models.Index(
+                fields=['check_out'], condition=models.Q(status='confirmed'), name='booking_confirmed_checkout_idx'
+            ),
+            models.Index(
+                fields=['created_at'], condition=models.Q(status='pending'), name='booking_pending_created_idx'
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(check_in__lt=models.F('check_out')), name='booking_dates_order'),
+            models.CheckConstraint(
+                condition=models.Q(total_price__isnull=True) | models.Q(total_price__gte=0),
+                name='booking_total_price_non_negative',
+            ),
+        ]
+
+    # Fields whose changes move the stay in the room inventory and the hotel rollups
+    STAY_FIELDS = ('hotel_id', 'check_in', 'check_out', 'total_price')
+
+    _loaded_status = None
+    # Set by create_booking on a new booking whose rooms it already reserved
+    _rooms_reserved = False
+    _loaded_customer_id = None
+    _loaded_stay = None
 
     #Methods
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the status, customer and stay loaded from the database to detect their changes on save.
+        """
+        booking = super().from_db(db, field_names, values)
+        booking._loaded_status = booking.__dict__.get('status')
+        booking._loaded_customer_id = booking.__dict__.get('customer_id')
+        if all(field in booking.__dict__ for field in cls.STAY_FIELDS):
+            booking._loaded_stay = booking.get_stay()
+        return booking
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the booking and runs the post_save receivers (counters) in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
+        self._loaded_customer_id = self.customer_id
+        self._loaded_stay = self.get_stay()
+
+    def get_stay(self):
+        """
+        Returns the (hotel_id, check_in, check_out, total_price) of the booking.
+        """
+        return tuple(getattr(self, field) for field in self.STAY_FIELDS)
+
+    def get_loaded_stay(self):
+        """
+        Returns an unsaved copy of the booking with the stay loaded from the database,
+        or the booking itself when its stay was not loaded or has not changed.
+        """
+        if self._loaded_stay is None or self._loaded_stay == self.get_stay():
+            return self
+        return Booking(
+            pk=self.pk, customer_id=self.customer_id, status=self._loaded_status,
+            **dict(zip(self.STAY_FIELDS, self._loaded_stay)),
+        )
+
     def __str__(self):
         """
         Returns a readable representation of the booking.
@@ -45,10 +218,14 @@ class Booking(models.Model):
 
     def get_total_price(self):
         """
-        Calculate the total price of the reservation based on the number of nights.
+        Calculate the total price of the reservation from the hotel rate calendar,
+        falling back to the base price per night when the stay is not priced yet.
         """
         nights = (self.check_out - self.check_in).days
-        return self.hotel.price_night * nights if nights > 0 else 0
+        if nights <= 0:
+            return 0
+        quote = RoomInventory.objects.quote(self.hotel_id, self.check_in, self.check_out)
+        return quote if quote is not None else self.hotel.price_night * nights
     
     def get_duration(self):
         """
@@ -57,6 +234,19 @@ class Booking(models.Model):
         duration = (self.check_out - self.check_in).days
         return duration if self.check_out and self.check_in else 0
     
+    def get_night_amounts(self):
+        """
+        Returns the revenue of each night of the stay, from the price stored at booking time.
+        The nights share it evenly and the last one takes the cent remainder, so they add up to the total.
+        """
+        nights = self.get_duration()
+        if nights <= 0:
+            return []
+        total = self.total_price if self.total_price is not None else self.get_total_price()
+        total = Decimal(total).quantize(Decimal('0.01'))
+        nightly = (total / nights).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+        return [nightly] * (nights - 1) + [total - nightly * (nights - 1)]
+
     def is_active(self):
         """
         Returns True if the reservation is confirmed and the departure date has not passed.
@@ -65,19 +255,27 @@ class Booking(models.Model):
     
     def cancel_booking(self):
         """
-        Change the reservation status to 'canceled'.
+        Change the reservation status to 'canceled' and return its rooms to the hotel inventory.
         """
-        if self.status != self.CANCELED:
-            self.status = self.CANCELED
-            self.save()
+        return self._transition(self.CANCELED)
 
     def confirm_booking(self):
         """
         Change the reservation status to 'confirmed'.
         """
-        if self.status == self.PENDING:
-            self.status = self.CONFIRMED
-            self.save()
+        return self._transition(self.CONFIRMED)
+
+    def _transition(self, status):
+        """
+        Applies a status transition through BookingQuerySet.transition, which only writes the status
+        columns. Returns True if the booking was in a status that allows it.
+        """
+        if self.status not in self.TRANSITIONS[status]:
+            return False
+        if not Booking.objects.filter(pk=self.pk).transition(status):
+            return False
+        self.status = self._loaded_status = status
+        return True
 
     def has_checked_in(self):
         """
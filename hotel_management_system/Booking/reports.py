@@ -0,0 +1,95 @@
+"""
+Vectorized revenue and occupancy reporting over bookings.
+Bookings are pulled as columnar arrays with a single values_list query and
+aggregated per hotel and month with NumPy instead of per-object Python loops.
+"""
+
+from datetime import date
+from decimal import Decimal
+import numpy as np
+from Hotel.models import Hotel, month_starts
+from .models import Booking
+
+REPORT_FIELDS = ('hotel_id', 'hotel', 'month', 'room_nights', 'revenue', 'occupancy', 'adr')
+
+
+def month_range(first_month, months):
+    """
+    Returns the first day of `months` consecutive months from `first_month`, plus the following month.
+    """
+    last = date(first_month.year + (first_month.month + months - 2) // 12, (first_month.month + months - 2) % 12 + 1, 1)
+    return month_starts(months, today=last)
+
+
+def load_booking_columns(start, end, statuses=(Booking.CONFIRMED,)):
+    """
+    Returns the bookings in `statuses` overlapping [start, end) as NumPy columns:
+    check_in / check_out as day numbers, hotel_id and the stored total price in cents
+    (the base price of the hotel for the bookings stored without one).
+    """
+    rows = list(
+        Booking.objects.filter(check_in__lt=end, check_out__gt=start, status__in=statuses)
+        .order_by()
+        .values_list('check_in', 'check_out', 'hotel_id', 'total_price', 'hotel__price_night')
+    )
+    check_in, check_out, hotel_ids, totals, prices = zip(*rows) if rows else ((),) * 5
+    check_in = np.array(check_in, dtype='datetime64[D]').astype(np.int64)
+    check_out = np.array(check_out, dtype='datetime64[D]').astype(np.int64)
+    totals = np.array(totals, dtype=np.float64)
+    totals = np.where(np.isnan(totals), np.array(prices, dtype=np.float64) * (check_out - check_in), totals)
+    return {
+        'check_in': check_in,
+        'check_out': check_out,
+        'hotel_id': np.array(hotel_ids, dtype=np.int64),
+        'total_cents': np.rint(totals * 100).astype(np.int64),
+    }
+
+
+def revenue_report(first_month, months=1, statuses=(Booking.CONFIRMED,)):
+    """
+    Returns room nights, revenue, occupancy and ADR per hotel and month.
+    Stays crossing a month boundary are split between the months they cover, with the stored
+    total price spread evenly over the nights and the cent remainder on the last one.
+    """
+    if months < 1:
+        raise ValueError("A report covers at least one month.")
+    starts = month_range(first_month, months)
+    columns = load_booking_columns(starts[0], starts[-1], statuses)
+    if not len(columns['hotel_id']):
+        return []
+    check_in, check_out, total_cents = columns['check_in'], columns['check_out'], columns['total_cents']
+    stay_nights = np.maximum(check_out - check_in, 1)
+    night_cents = total_cents // stay_nights
+    remainder_cents = total_cents - night_cents * stay_nights
+    hotel_ids, hotel_index = np.unique(columns['hotel_id'], return_inverse=True)
+
+    hotels = {
+        pk: (name, total_rooms)
+        for pk, name, total_rooms in Hotel.objects.filter(pk__in=hotel_ids.tolist()).values_list('pk', 'name', 'total_rooms')
+    }
+    day_numbers = np.array(starts, dtype='datetime64[D]').astype(np.int64)
+
+    report = []
+    for month, month_start, month_end in zip(starts, day_numbers, day_numbers[1:]):
+        # Nights of each stay that fall inside the month
+        nights = np.clip(np.minimum(check_out, month_end) - np.maximum(check_in, month_start), 0, None)
+        room_nights = np.bincount(hotel_index, weights=nights, minlength=len(hotel_ids))
+        last_night_in_month = (check_out - 1 >= month_start) & (check_out - 1 < month_end)
+        cents = nights * night_cents + np.where(last_night_in_month, remainder_cents, 0)
+        revenue = np.bincount(hotel_index, weights=cents, minlength=len(hotel_ids))
+        days = int(month_end - month_start)
+        for hotel_id, sold, cents in zip(hotel_ids.tolist(), room_nights.astype(np.int64).tolist(), revenue.tolist()):
+            if not sold:
+                continue
+            name, total_rooms = hotels[hotel_id]
+            amount = Decimal(round(cents)) / 100
+            report.append({
+                'hotel_id': hotel_id,
+                'hotel': name,
+                'month': month,
+                'room_nights': sold,
+                'revenue': amount,
+                'occupancy': round(100 * sold / (total_rooms * days), 1) if total_rooms else 0.0,
+                'adr': (amount / sold).quantize(Decimal('0.01')),
+            })
+    return report
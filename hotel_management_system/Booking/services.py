@@ -0,0 +1,76 @@
+import time
+from django.db import IntegrityError, OperationalError, transaction
+from django.forms import ValidationError
+from Hotel.models import RoomInventory
+from .models import Booking
+
+class RoomsUnavailable(ValidationError):
+    """
+    Raised when the hotel has no free room for every night of the stay.
+    """
+
+
+class OverlappingBooking(ValidationError):
+    """
+    Raised when the customer already holds a booking at the hotel for overlapping dates.
+    """
+
+
+def create_booking(customer, hotel, check_in, check_out, status=Booking.PENDING, retries=5, backoff=0.01):
+    """
+    Single entry point to book a stay.
+    Reserves the nights with a conditional database-side update and creates the Booking
+    in the same transaction, so concurrent bookers can never oversell the hotel.
+    Lock conflicts (OperationalError) are retried with exponential backoff.
+    """
+    if check_in >= check_out:
+        raise ValidationError("Check-in date must be before check-out date.")
+
+    # A failed statement breaks an outer transaction, so retrying only makes sense at the top level.
+    if transaction.get_connection().in_atomic_block:
+        retries = 0
+
+    for attempt in range(retries + 1):
+        try:
+            with transaction.atomic():
+                return _reserve_and_create(customer, hotel, check_in, check_out, status)
+        except IntegrityError as exc:
+            # The overlap guard lives in the database, so concurrent requests cannot both pass it.
+            if Booking.OVERLAP_GUARD in str(exc):
+                raise OverlappingBooking("You already have a booking at this hotel for these dates.") from exc
+            raise
+        except OperationalError:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def reserve_rooms(hotel, check_in, check_out):
+    """
+    Reserves one room on every night of a stay, opening the calendar for the nights it does not cover yet.
+    Raises RoomsUnavailable when some night has no free room.
+    """
+    nights = (check_out - check_in).days
+    reserved = RoomInventory.objects.reserve(hotel, check_in, check_out)
+    if not reserved and 0 < nights and RoomInventory.objects.for_stay(hotel, check_in, check_out).count() < nights:
+        # The calendar has not been opened for these dates yet.
+        RoomInventory.objects.initialize([hotel], start=check_in, days=nights)
+        reserved = RoomInventory.objects.reserve(hotel, check_in, check_out)
+    if not reserved:
+        raise RoomsUnavailable("No rooms available for the selected dates.")
+
+
+def _reserve_and_create(customer, hotel, check_in, check_out, status):
+    reserve_rooms(hotel, check_in, check_out)
+    booking = Booking(
+        customer=customer,
+        hotel=hotel,
+        check_in=check_in,
+        check_out=check_out,
+        status=status,
+        total_price=RoomInventory.objects.quote(hotel, check_in, check_out),
+    )
+    # The rooms are already held: the post_save receiver must not reserve them again
+    booking._rooms_reserved = True
+    booking.save(force_insert=True)
+    return booking
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from django.db.models import F
+from Hotel.cache import invalidate_hotel
+from Hotel.models import HotelDailyStats, RoomInventory
+from User.models import User
+from .models import Booking
+from .services import reserve_rooms
+
+def booking_saved(sender, instance, created, **kwargs):
+    """
+    Keeps the customer booking counters, the room inventory, the hotel daily rollups and
+    the hotel cache in sync when a booking is created, changes status, customer or stay
+    (hotel, dates or price).
+    """
+    was_confirmed = not created and instance._loaded_status == Booking.CONFIRMED
+    is_confirmed = instance.status == Booking.CONFIRMED
+    moved = (
+        not created and instance._loaded_customer_id is not None
+        and instance._loaded_customer_id != instance.customer_id
+    )
+
+    changes = {}
+    if moved:
+        # The booking leaves the counters of its previous customer and joins the new one's
+        leaving = {'total_bookings': F('total_bookings') - 1}
+        if was_confirmed:
+            leaving['confirmed_bookings'] = F('confirmed_bookings') - 1
+        User.objects.filter(pk=instance._loaded_customer_id).update(**leaving)
+        changes['total_bookings'] = F('total_bookings') + 1
+        if is_confirmed:
+            changes['confirmed_bookings'] = F('confirmed_bookings') + 1
+    else:
+        if created:
+            changes['total_bookings'] = F('total_bookings') + 1
+        if is_confirmed != was_confirmed:
+            changes['confirmed_bookings'] = F('confirmed_bookings') + (1 if is_confirmed else -1)
+    if changes:
+        User.objects.filter(pk=instance.customer_id).update(**changes)
+
+    # The previous stay is taken off the rollups and the inventory and the new one added
+    previous = instance if created else instance.get_loaded_stay()
+    moved_stay = previous is not instance
+    if is_confirmed != was_confirmed or moved_stay:
+        if was_confirmed:
+            record_confirmed_stay(previous, -1)
+        if is_confirmed:
+            record_confirmed_stay(instance, 1)
+
+    # Bookings created, reopened or moved outside create_booking and transition() (e.g. from the admin)
+    # reserve their rooms like create_booking does, failing the save when the hotel is full.
+    had_rooms = instance._rooms_reserved if created else instance._loaded_status in Booking.HOLDS_INVENTORY
+    holds_rooms = instance.status in Booking.HOLDS_INVENTORY
+    if had_rooms and (not holds_rooms or moved_stay):
+        record_held_rooms(previous, -1)
+    if holds_rooms and (not had_rooms or moved_stay):
+        reserve_rooms(instance.hotel, instance.check_in, instance.check_out)
+
+    if created or instance.status != instance._loaded_status or moved_stay:
+        invalidate_hotel(instance.hotel_id)
+    if previous.hotel_id != instance.hotel_id:
+        invalidate_hotel(previous.hotel_id)
+
+def booking_deleted(sender, instance, **kwargs):
+    """
+    Keeps the customer booking counters, the room inventory, the hotel daily rollups and
+    the hotel cache in sync when a booking is deleted (also on cascades).
+    """
+    changes = {'total_bookings': F('total_bookings') - 1}
+    if instance.status == Booking.CONFIRMED:
+        changes['confirmed_bookings'] = F('confirmed_bookings') - 1
+        record_confirmed_stay(instance, -1)
+    if instance.status in Booking.HOLDS_INVENTORY:
+        record_held_rooms(instance, -1)
+    User.objects.filter(pk=instance.customer_id).update(**changes)
+    invalidate_hotel(instance.hotel_id)
+
+def record_confirmed_stay(booking, rooms):
+    """
+    Adds (rooms=1) or removes (rooms=-1) a confirmed stay from the hotel daily rollups.
+    """
+    HotelDailyStats.objects.record_stay(
+        booking.hotel_id, booking.check_in, booking.check_out, rooms,
+        [rooms * amount for amount in booking.get_night_amounts()],
+    )
+
+def record_held_rooms(booking, rooms):
+    """
+    Releases (rooms=-1) one room on every night of a stay in the room inventory.
+    """
+    RoomInventory.objects.add_nights({
+        (booking.hotel_id, booking.check_in + timedelta(days=offset)): rooms for offset in range(booking.get_duration())
+    })
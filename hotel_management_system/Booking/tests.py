@@ -1,3 +1,667 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.forms import ValidationError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils.timezone import now
+from hotel_management_system.datagen import generate_dataset
+from hotel_management_system.testing import ChangelistQueryCountMixin
+from Hotel.models import Hotel, HotelDailyStats, HotelMonthlyStats, RoomInventory
+from User.models import User
+from .models import Booking
+from .reports import revenue_report
+from .services import OverlappingBooking, RoomsUnavailable, create_booking
 
-# Create your tests here.
+class BookingTestMixin:
+
+    def create_hotel(self, total_rooms=2, name="Hotel Quito"):
+        """Crea un hotel con su inventario abierto desde self.start"""
+        hotel = Hotel.objects.create(
+            name=name,
+            address="Av. Amazonas",
+            city="Quito",
+            country="Ecuador",
+            owner=self.owner,
+            total_rooms=total_rooms,
+            available_rooms=total_rooms,
+            price_night=50
+        )
+        RoomInventory.objects.initialize([hotel], start=self.start, days=30)
+        return hotel
+
+    def create_users(self, customers=1):
+        """Crea un dueño de hotel y los clientes pedidos"""
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        return [
+            User.objects.create_user(username=f"customer_{i}", email=f"customer_{i}@example.com")
+            for i in range(customers)
+        ]
+
+
+class CreateBookingTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel()
+
+    def test_create_booking_reserves_nights(self):
+        """Verifica que la reserva descuente cada noche y calcule el precio total"""
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=3))
+
+        self.assertEqual(booking.status, Booking.PENDING)
+        self.assertEqual(booking.total_price, 150)
+        self.assertEqual(self.hotel.get_available_rooms(self.start, self.start + timedelta(days=3)), 1)
+
+    def test_no_overselling(self):
+        """Verifica que no se pueda reservar cuando el hotel está lleno"""
+        check_out = self.start + timedelta(days=2)
+        others = [
+            User.objects.create_user(username=f"other_{i}", email=f"other_{i}@example.com") for i in range(2)
+        ]
+        create_booking(self.customer, self.hotel, self.start, check_out)
+        create_booking(others[0], self.hotel, self.start, check_out)
+
+        with self.assertRaises(RoomsUnavailable):
+            create_booking(others[1], self.hotel, self.start, check_out)
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_overlap_guard(self):
+        """Verifica que la base de datos impida reservas solapadas del mismo cliente en el mismo hotel"""
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=3))
+        with self.assertRaises(OverlappingBooking):
+            create_booking(self.customer, self.hotel, self.start + timedelta(days=2), self.start + timedelta(days=4))
+        # El rechazo deshace también la reserva de inventario
+        self.assertEqual(self.hotel.get_available_rooms(self.start + timedelta(days=2), self.start + timedelta(days=3)), 1)
+
+        # Estancias contiguas y reservas canceladas no se solapan
+        create_booking(self.customer, self.hotel, self.start + timedelta(days=3), self.start + timedelta(days=4))
+        booking.cancel_booking()
+        create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=2))
+
+        # Reactivar una reserva cancelada con una fecha solapada también falla
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Booking.objects.filter(pk=booking.pk).update(status=Booking.PENDING)
+
+    def test_check_constraints(self):
+        """Verifica las restricciones de fechas y habitaciones en la base de datos"""
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Booking.objects.bulk_create([
+                Booking(customer=self.customer, hotel=self.hotel, check_in=self.start, check_out=self.start)
+            ])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Hotel.objects.filter(pk=self.hotel.pk).update(available_rooms=3)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Hotel.objects.filter(pk=self.hotel.pk).update(price_night=0)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            RoomInventory.objects.filter(hotel=self.hotel, date=self.start).update(booked_rooms=3)
+
+    def test_overlap_guard_installed(self):
+        """Verifica que el guardia de solapamiento siga instalado (una migración que reconstruya la tabla en SQLite lo borra)"""
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [Booking._meta.db_table])
+                expected = {f"{Booking.OVERLAP_GUARD}_insert", f"{Booking.OVERLAP_GUARD}_update"}
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT conname FROM pg_constraint WHERE conname = %s", [Booking.OVERLAP_GUARD])
+                expected = {Booking.OVERLAP_GUARD}
+            else:
+                self.skipTest("Overlap guard only installed on SQLite and PostgreSQL")
+            self.assertEqual({name for name, in cursor.fetchall()}, expected)
+
+    def test_invalid_dates(self):
+        """Verifica que la fecha de entrada sea anterior a la de salida"""
+        with self.assertRaises(ValidationError):
+            create_booking(self.customer, self.hotel, self.start, self.start)
+
+    def test_opens_missing_nights(self):
+        """Verifica que se abran las noches que aún no tienen inventario"""
+        check_in = self.start + timedelta(days=60)
+        create_booking(self.customer, self.hotel, check_in, check_in + timedelta(days=2))
+        self.assertEqual(RoomInventory.objects.filter(hotel=self.hotel, date__gte=check_in, booked_rooms=1).count(), 2)
+
+    def test_legacy_counter_is_conditional(self):
+        """Verifica que el contador general no baje de cero ni supere el total"""
+        self.assertTrue(self.hotel.book_room())
+        self.assertTrue(self.hotel.book_room())
+        self.assertFalse(self.hotel.book_room())
+        self.assertEqual(self.hotel.available_rooms, 0)
+
+        for _ in range(3):
+            self.hotel.cancel_booking()
+        self.assertEqual(self.hotel.available_rooms, 2)
+
+
+class BookingViewsTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel(total_rooms=1)
+        self.client.force_login(self.customer)
+
+    def book(self, **data):
+        params = {"hotel": self.hotel.pk, "check_in": "2030-01-01", "check_out": "2030-01-03"}
+        params.update(data)
+        return self.client.post(reverse("booking_create"), params)
+
+    def test_create_and_list(self):
+        """Verifica que las vistas asíncronas creen y listen las reservas"""
+        response = self.book()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["total_price"], "100.00")
+
+        self.assertEqual(self.book().status_code, 409)
+        self.assertEqual(self.book(check_out="2030-01-01").status_code, 400)
+        self.assertEqual(self.book(hotel=0).status_code, 404)
+
+        data = self.client.get(reverse("booking_list")).json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["results"][0]["hotel__name"], "Hotel Quito")
+
+    def test_requires_login(self):
+        """Verifica que las vistas exijan un usuario autenticado"""
+        self.client.logout()
+        self.assertEqual(self.book().status_code, 401)
+        self.assertEqual(self.client.get(reverse("booking_list")).status_code, 401)
+
+
+class BookingStressTest(BookingTestMixin, TransactionTestCase):
+    threads = 8
+    attempts_per_thread = 5
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        # Un cliente por intento: un mismo cliente no puede tener dos estancias solapadas
+        customers = self.create_users(customers=self.threads * self.attempts_per_thread)
+        self.customers = [customers[i::self.threads] for i in range(self.threads)]
+        self.hotel = self.create_hotel(total_rooms=10)
+
+    def test_parallel_bookers_do_not_oversell(self):
+        """Verifica que N reservas en paralelo no vendan más habitaciones de las que hay"""
+        check_in, check_out = self.start, self.start + timedelta(days=3)
+        errors = []
+
+        def booker(customers):
+            try:
+                for customer in customers:
+                    try:
+                        create_booking(customer, self.hotel, check_in, check_out, retries=50)
+                    except RoomsUnavailable:
+                        pass
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=booker, args=(customers,)) for customers in self.customers]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Booking.objects.filter(hotel=self.hotel).count(), 10)
+        self.assertEqual(
+            list(RoomInventory.objects.for_stay(self.hotel, check_in, check_out).values_list('booked_rooms', flat=True)),
+            [10, 10, 10]
+        )
+
+
+class BookingImportExportTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        return path
+
+    def test_import_csv(self):
+        """Verifica la carga por lotes, el precio calculado y las filas inválidas o solapadas"""
+        path = self.write_file("bookings.csv", (
+            "customer,hotel,check_in,check_out,status\n"
+            "customer_0,Hotel Quito,2030-01-01,2030-01-04,confirmed\n"
+            "customer_0,Hotel Quito,2030-01-02,2030-01-03,canceled\n"
+            "customer_0,Hotel Quito,2030-01-05,2030-01-05,pending\n"
+            "customer_0,Hotel Quito,2030-01-03,2030-01-05,pending\n"
+            "nobody,Hotel Quito,2030-01-01,2030-01-02,pending\n"
+        ))
+        call_command("import_bookings", path, "--batch-size", "2", stdout=StringIO(), stderr=StringIO())
+
+        booking = Booking.objects.get(status=Booking.CONFIRMED)
+        self.assertEqual(booking.total_price, 150)
+        self.assertEqual(Booking.objects.count(), 2)
+        # Solo las reservas no canceladas ocupan inventario
+        self.assertEqual(self.hotel.get_available_rooms(self.start, self.start + timedelta(days=3)), 1)
+
+    def test_import_jsonl(self):
+        """Verifica la carga de un archivo JSONL"""
+        path = self.write_file("bookings.jsonl", json.dumps({
+            "customer": "customer_0", "hotel": "Hotel Quito", "check_in": "2030-01-01", "check_out": "2030-01-02"
+        }) + "\n")
+        call_command("import_bookings", path, stdout=StringIO())
+        self.assertEqual(Booking.objects.get().status, Booking.PENDING)
+
+    def test_import_jsonl_skips_malformed_lines(self):
+        """Verifica que una línea JSONL inválida solo descarte esa fila"""
+        valid = json.dumps({
+            "customer": "customer_0", "hotel": "Hotel Quito", "check_in": "2030-01-01", "check_out": "2030-01-02"
+        })
+        path = self.write_file("bookings.jsonl", valid + "\n{not json\n[1, 2]\n")
+        stdout = StringIO()
+        call_command("import_bookings", path, stdout=stdout, stderr=StringIO())
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertIn("2 invalid rows", stdout.getvalue())
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.total_bookings, 1)
+
+    def test_export_round_trip(self):
+        """Verifica que lo exportado se pueda volver a importar"""
+        create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=2))
+        path = os.path.join(self.directory.name, "export.jsonl")
+        call_command("export_bookings", path, "--format", "jsonl")
+
+        # Un precio que no sale de precio base x noches (p. ej. con tarifas de fin de semana) se conserva
+        Booking.objects.update(total_price=Decimal("123.45"))
+        call_command("export_bookings", path, "--format", "jsonl")
+
+        Booking.objects.all().delete()
+        call_command("import_bookings", path, stdout=StringIO())
+        booking = Booking.objects.get()
+        self.assertEqual((booking.check_in, booking.total_price), (self.start, Decimal("123.45")))
+        self.assertEqual(self.hotel.get_available_rooms(self.start, self.start + timedelta(days=2)), 1)
+
+    def test_import_rejects_overbooking(self):
+        """Verifica que las reservas que no caben en el hotel se cuenten como inválidas"""
+        hotel = self.create_hotel(total_rooms=1, name="Hotel Cuenca")
+        customers = [self.customer] + [
+            User.objects.create_user(username=f"guest_{i}", email=f"guest_{i}@example.com") for i in range(2)
+        ]
+        path = self.write_file("bookings.csv", "customer,hotel,check_in,check_out,status\n" + "".join(
+            f"{customer.username},Hotel Cuenca,2030-01-01,2030-01-03,confirmed\n" for customer in customers
+        ) + "customer_0,Hotel Cuenca,2031-06-01,2031-06-02,pending\n")
+        stdout = StringIO()
+        call_command("import_bookings", path, stdout=stdout, stderr=StringIO())
+
+        self.assertIn("Imported 2 bookings (2 invalid rows skipped)", stdout.getvalue())
+        self.assertEqual(
+            list(RoomInventory.objects.filter(hotel=hotel, date__lt=date(2030, 1, 3)).values_list("booked_rooms", flat=True)),
+            [1, 1],
+        )
+        # Las noches sin calendario se abren como en create_booking
+        self.assertEqual(RoomInventory.objects.get(hotel=hotel, date=date(2031, 6, 1)).booked_rooms, 1)
+
+
+class BookingAdminTest(BookingTestMixin, ChangelistQueryCountMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.create_users(customers=0)
+        self.hotel = self.create_hotel(total_rooms=100)
+        self.superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+
+    def test_changelist_query_count(self):
+        """Verifica que el listado de reservas no haga consultas por fila"""
+        def add_rows(count):
+            start = User.objects.count()
+            for i in range(start, start + count):
+                customer = User.objects.create_user(username=f"customer_{i}", email=f"customer_{i}@example.com")
+                create_booking(customer, self.hotel, self.start, self.start + timedelta(days=1))
+
+        self.assertChangelistQueriesConstant(Booking, add_rows, self.superuser)
+
+
+class UserCountersTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel()
+
+    def counters(self, user):
+        user.refresh_from_db()
+        return user.get_total_bookings(), user.has_bookings(), user.is_active_customer()
+
+    def test_booking_counters_follow_status(self):
+        """Verifica que los contadores sigan la creación, confirmación, cancelación y borrado"""
+        self.assertEqual(self.counters(self.customer), (0, False, False))
+
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=1))
+        self.assertEqual(self.counters(self.customer), (1, True, False))
+
+        booking.confirm_booking()
+        self.assertEqual(self.counters(self.customer), (1, True, True))
+
+        booking.cancel_booking()
+        self.assertEqual(self.counters(self.customer), (1, True, False))
+
+        booking.delete()
+        self.assertEqual(self.counters(self.customer), (0, False, False))
+
+    def test_booking_counters_follow_customer_change(self):
+        """Verifica que reasignar una reserva (p. ej. desde el admin) mueva los contadores al nuevo cliente"""
+        other = User.objects.create_user(username="customer_1", email="customer_1@example.com")
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=1))
+        booking.confirm_booking()
+
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.customer = other
+        booking.save()
+        self.assertEqual(self.counters(self.customer), (0, False, False))
+        self.assertEqual(self.counters(other), (1, True, True))
+
+    def test_hotel_counter_follows_cascades(self):
+        """Verifica el contador de hoteles y el borrado en cascada de reservas"""
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=1))
+        booking.confirm_booking()
+        self.owner.refresh_from_db()
+        self.assertEqual(self.owner.get_total_hotels(), 1)
+
+        self.hotel.delete()
+        self.owner.refresh_from_db()
+        self.assertEqual(self.owner.get_total_hotels(), 0)
+        self.assertEqual(self.counters(self.customer), (0, False, False))
+
+    def test_reconcile_command(self):
+        """Verifica que el comando de conciliación recalcule los contadores"""
+        create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=1)).confirm_booking()
+        User.objects.update(total_bookings=7, confirmed_bookings=0, hotels_owned=3)
+
+        call_command("reconcile_user_counters", stdout=StringIO())
+        self.assertEqual(self.counters(self.customer), (1, True, True))
+        self.owner.refresh_from_db()
+        self.assertEqual(self.owner.get_total_hotels(), 1)
+
+
+class HotelDailyStatsTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel()
+
+    def rollups(self):
+        return list(HotelDailyStats.objects.filter(rooms_sold__gt=0).order_by("date").values_list("date", "rooms_sold", "revenue"))
+
+    def monthly_rollups(self):
+        return list(HotelMonthlyStats.objects.filter(rooms_sold__gt=0).order_by("date").values_list("date", "rooms_sold", "revenue"))
+
+    def test_rollups_follow_confirmation(self):
+        """Verifica que los acumulados diarios y mensuales sigan la confirmación y la cancelación"""
+        check_in = date(2030, 1, 31)
+        booking = create_booking(self.customer, self.hotel, check_in, check_in + timedelta(days=2))
+        self.assertEqual(self.rollups(), [])
+
+        booking.confirm_booking()
+        self.assertEqual(self.rollups(), [(check_in, 1, 50), (date(2030, 2, 1), 1, 50)])
+        self.assertEqual(self.monthly_rollups(), [(date(2030, 1, 1), 1, 50), (date(2030, 2, 1), 1, 50)])
+
+        booking.cancel_booking()
+        self.assertEqual(self.rollups(), [])
+        self.assertEqual(self.monthly_rollups(), [])
+
+    def test_uneven_price_adds_up(self):
+        """Verifica que los centavos sobrantes vayan a la última noche y los acumulados sumen el precio total"""
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=3))
+        Booking.objects.filter(pk=booking.pk).update(total_price=Decimal("100.00"))
+        booking.refresh_from_db()
+        self.assertEqual(booking.get_night_amounts(), [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")])
+
+        booking.confirm_booking()
+        self.assertEqual([revenue for _, _, revenue in self.rollups()], [Decimal("33.33"), Decimal("33.33"), Decimal("33.34")])
+        self.assertEqual(self.monthly_rollups(), [(self.start, 3, 100)])
+
+        # La ruta por señales (guardado directo) usa el mismo reparto
+        booking.cancel_booking()
+        booking.status = Booking.CONFIRMED
+        booking.save()
+        self.assertEqual(self.monthly_rollups(), [(self.start, 3, 100)])
+
+    def test_moving_a_stay_moves_rollups_and_rooms(self):
+        """Verifica que cambiar las fechas de una reserva (p. ej. desde el admin) mueva acumulados e inventario"""
+        booking = create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=2))
+        booking.confirm_booking()
+
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.check_in, booking.check_out = self.start + timedelta(days=10), self.start + timedelta(days=12)
+        booking.save()
+        self.assertEqual(self.rollups(), [(date(2030, 1, 11), 1, 50), (date(2030, 1, 12), 1, 50)])
+        booked = dict(RoomInventory.objects.filter(hotel=self.hotel, booked_rooms__gt=0).values_list("date", "booked_rooms"))
+        self.assertEqual(booked, {date(2030, 1, 11): 1, date(2030, 1, 12): 1})
+
+        booking.cancel_booking()
+        self.assertEqual(self.rollups(), [])
+        self.assertFalse(HotelDailyStats.objects.exclude(rooms_sold=0, revenue=0).exists())
+        self.assertFalse(RoomInventory.objects.filter(booked_rooms__gt=0).exists())
+
+    def test_rebuild_command(self):
+        """Verifica que el comando reconstruya los acumulados desde las reservas confirmadas"""
+        other = User.objects.create_user(username="other", email="other@example.com")
+        create_booking(self.customer, self.hotel, self.start, self.start + timedelta(days=1)).confirm_booking()
+        create_booking(other, self.hotel, self.start, self.start + timedelta(days=1), status=Booking.CONFIRMED)
+        HotelDailyStats.objects.all().delete()
+
+        HotelMonthlyStats.objects.all().delete()
+
+        call_command("rebuild_hotel_stats", stdout=StringIO())
+        self.assertEqual(self.rollups(), [(self.start, 2, 100)])
+        self.assertEqual(self.monthly_rollups(), [(self.start, 2, 100)])
+
+
+class BookingTransitionTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customers = self.create_users(customers=3)
+        self.hotel = self.create_hotel(total_rooms=3)
+        self.check_out = self.start + timedelta(days=2)
+        self.bookings = [create_booking(customer, self.hotel, self.start, self.check_out) for customer in self.customers]
+
+    def free_rooms(self):
+        return self.hotel.get_available_rooms(self.start, self.check_out)
+
+    def test_batched_transitions(self):
+        """Verifica que las transiciones masivas ajusten inventario, contadores y acumulados"""
+        self.assertEqual(Booking.objects.filter(customer__in=self.customers[:2]).confirm(), 2)
+        self.assertEqual(HotelDailyStats.objects.get(date=self.start).rooms_sold, 2)
+        self.assertEqual(User.objects.get(pk=self.customers[0].pk).confirmed_bookings, 1)
+        self.assertEqual(self.free_rooms(), 0)
+
+        # Solo se pueden confirmar las reservas pendientes
+        self.assertEqual(Booking.objects.confirm(), 1)
+        self.assertEqual(Booking.objects.all().confirm(), 0)
+
+        self.assertEqual(Booking.objects.all().cancel(), 3)
+        self.assertEqual(self.free_rooms(), 3)
+        self.assertEqual(HotelDailyStats.objects.get(date=self.start).rooms_sold, 0)
+        self.assertFalse(User.objects.filter(confirmed_bookings__gt=0).exists())
+
+    def test_instance_methods_release_rooms(self):
+        """Verifica que cancelar una reserva devuelva sus habitaciones y no se repita"""
+        booking = self.bookings[0]
+        self.assertTrue(booking.cancel_booking())
+        self.assertEqual(booking.status, Booking.CANCELED)
+        self.assertEqual(self.free_rooms(), 1)
+
+        self.assertFalse(booking.cancel_booking())
+        self.assertFalse(booking.confirm_booking())
+        self.assertEqual(self.free_rooms(), 1)
+
+    def test_direct_saves_and_deletes_release_rooms(self):
+        """Verifica que cancelar con save() (como el admin) o borrar una reserva devuelva sus habitaciones"""
+        booking = Booking.objects.get(pk=self.bookings[0].pk)
+        booking.status = Booking.CANCELED
+        booking.save()
+        self.assertEqual(self.free_rooms(), 1)
+
+        # Reactivarla vuelve a ocupar la habitación
+        booking.status = Booking.PENDING
+        booking.save()
+        self.assertEqual(self.free_rooms(), 0)
+
+        Booking.objects.get(pk=self.bookings[1].pk).delete()
+        self.assertEqual(self.free_rooms(), 1)
+
+        # Borrar una reserva cancelada no devuelve habitaciones dos veces
+        self.bookings[2].cancel_booking()
+        Booking.objects.get(pk=self.bookings[2].pk).delete()
+        self.assertEqual(self.free_rooms(), 2)
+
+    def test_direct_creates_and_reopens_reserve_rooms(self):
+        """Verifica que crear o reactivar una reserva sin create_booking ocupe habitación y no sobrevenda"""
+        # El hotel está lleno: una creación directa (como el admin) falla
+        other = User.objects.create_user(username="other", email="other@example.com")
+        with self.assertRaises(RoomsUnavailable):
+            Booking.objects.create(customer=other, hotel=self.hotel, check_in=self.start, check_out=self.check_out)
+        self.assertEqual(Booking.objects.count(), 3)
+
+        self.bookings[0].cancel_booking()
+        direct = Booking.objects.create(
+            customer=other, hotel=self.hotel, check_in=self.start, check_out=self.check_out
+        )
+        self.assertEqual(self.free_rooms(), 0)
+
+        # Reactivar la cancelada no puede sobrevender
+        booking = Booking.objects.get(pk=self.bookings[0].pk)
+        booking.status = Booking.PENDING
+        with self.assertRaises(RoomsUnavailable):
+            booking.save()
+        self.assertEqual(Booking.objects.get(pk=booking.pk).status, Booking.CANCELED)
+
+        direct.delete()
+        self.assertEqual(self.free_rooms(), 1)
+        self.assertFalse(RoomInventory.objects.add_nights({(self.hotel.pk, self.start): 2}))
+        self.assertEqual(self.free_rooms(), 1)
+
+    def test_expire_command(self):
+        """Verifica que el barrido expire las reservas pendientes antiguas por lotes"""
+        self.bookings[0].confirm_booking()
+        Booking.objects.filter(pk=self.bookings[1].pk).update(created_at=now() - timedelta(hours=2))
+        Booking.objects.filter(pk=self.bookings[2].pk).update(created_at=now() - timedelta(hours=3))
+
+        call_command("expire_bookings", "--minutes=60", "--batch-size=1", stdout=StringIO())
+        statuses = [booking.status for booking in Booking.objects.order_by("pk")]
+        self.assertEqual(statuses, [Booking.CONFIRMED, Booking.EXPIRED, Booking.EXPIRED])
+        self.assertEqual(self.free_rooms(), 2)
+
+
+class BookingIndexesTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel(total_rooms=5)
+        for offset in range(5):
+            check_in = self.start + timedelta(days=3 * offset)
+            create_booking(self.customer, self.hotel, check_in, check_in + timedelta(days=2))
+        Booking.objects.filter(check_in__gte=self.start + timedelta(days=6)).confirm()
+
+    def test_overlapping_and_active(self):
+        """Verifica los filtros de solapamiento y de reservas activas"""
+        overlapping = Booking.objects.overlapping(self.hotel, self.start + timedelta(days=1), self.start + timedelta(days=4))
+        self.assertEqual(sorted(booking.check_in.day for booking in overlapping), [1, 4])
+        self.assertEqual(Booking.objects.active(today=self.start + timedelta(days=10)).count(), 2)
+
+    def test_queries_use_indexes(self):
+        """Verifica con EXPLAIN que las consultas usen los índices compuestos y parciales"""
+        plans = {
+            "booking_hotel_dates_idx": Booking.objects.overlapping(self.hotel, self.start, self.start + timedelta(days=3)),
+            "booking_confirmed_checkout_idx": Booking.objects.active(today=self.start),
+            "booking_pending_created_idx": Booking.objects.stale(now()),
+        }
+        for index, queryset in plans.items():
+            with self.subTest(index=index):
+                self.assertIn(index, queryset.explain())
+
+
+class DatasetGeneratorTest(TestCase):
+
+    def test_generated_data_is_consistent(self):
+        """Verifica que los datos generados para los benchmarks mantengan contadores e inventario coherentes"""
+        data = generate_dataset(users=40, hotels=4, bookings=60, days=30)
+
+        self.assertEqual((len(data["owners"]), len(data["customers"]), len(data["hotels"])), (2, 38, 4))
+        self.assertEqual(sum(User.objects.values_list("hotels_owned", flat=True)), 4)
+        self.assertEqual(sum(User.objects.values_list("total_bookings", flat=True)), Booking.objects.count())
+        booked_nights = sum(booking.get_duration() for booking in Booking.objects.all())
+        self.assertEqual(sum(RoomInventory.objects.values_list("booked_rooms", flat=True)), booked_nights)
+
+
+class RevenueReportTest(BookingTestMixin, TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.start = date(2030, 1, 1)
+        self.customer, = self.create_users()
+        self.hotel = self.create_hotel(total_rooms=10)
+        other = self.create_hotel(total_rooms=10, name="Hotel Cuenca")
+        # 2 noches en enero y 1 en febrero
+        create_booking(self.customer, self.hotel, date(2030, 1, 30), date(2030, 2, 2), status=Booking.CONFIRMED)
+        create_booking(self.customer, other, date(2030, 1, 10), date(2030, 1, 11), status=Booking.CONFIRMED)
+        create_booking(self.customer, self.hotel, date(2030, 1, 10), date(2030, 1, 15))
+
+    def test_report_splits_stays_by_month(self):
+        """Verifica noches, ingresos, ocupación y tarifa media por hotel y mes"""
+        report = revenue_report(date(2030, 1, 1), months=2)
+        rows = {(row["hotel"], row["month"].month): row for row in report}
+
+        self.assertEqual(len(rows), 3)
+        january = rows["Hotel Quito", 1]
+        self.assertEqual((january["room_nights"], january["revenue"], january["adr"]), (2, 100, 50))
+        self.assertEqual(january["occupancy"], round(100 * 2 / 310, 1))
+        self.assertEqual(rows["Hotel Quito", 2]["room_nights"], 1)
+        self.assertEqual(rows["Hotel Cuenca", 1]["revenue"], 50)
+
+    def test_report_statuses(self):
+        """Verifica que se puedan incluir otros estados"""
+        report = revenue_report(date(2030, 1, 1), statuses=(Booking.CONFIRMED, Booking.PENDING))
+        quito = next(row for row in report if row["hotel"] == "Hotel Quito")
+        self.assertEqual(quito["room_nights"], 7)
+        self.assertEqual(revenue_report(date(2031, 1, 1)), [])
+
+    def test_report_uses_stored_price(self):
+        """Verifica que el ingreso salga del precio guardado, repartido por noche sin perder centavos"""
+        Booking.objects.filter(check_in=date(2030, 1, 30)).update(total_price=Decimal("100.00"))
+        Hotel.objects.update(price_night=999)
+        rows = {(row["hotel"], row["month"].month): row for row in revenue_report(date(2030, 1, 1), months=2)}
+        self.assertEqual(rows["Hotel Quito", 1]["revenue"], Decimal("66.66"))
+        self.assertEqual(rows["Hotel Quito", 2]["revenue"], Decimal("33.34"))
+
+    def test_command_rejects_empty_range(self):
+        """Verifica que --months deba ser al menos 1"""
+        with self.assertRaises(CommandError):
+            call_command("revenue_report", "--months", "0", stdout=StringIO())
+
+    def test_command_csv(self):
+        """Verifica la salida CSV del comando"""
+        output = StringIO()
+        call_command("revenue_report", "--month", "2030-01", "--months", "2", stdout=output)
+        lines = output.getvalue().strip().splitlines()
+        self.assertEqual(lines[0], "hotel_id,hotel,month,room_nights,revenue,occupancy,adr")
+        self.assertEqual(len(lines), 4)
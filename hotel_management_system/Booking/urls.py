@@ -2,5 +2,6 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-
-]
\ No newline at end of file
+    path('', views.CustomerBookingsView.as_view(), name="booking_list"),
+    path('create/', views.BookingCreateView.as_view(), name="booking_create"),
+]
@@ -1,3 +1,67 @@
-from django.shortcuts import render
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.forms import ValidationError
+from django.http import JsonResponse
+from django.views import View
+from Hotel.models import Hotel
+from .models import Booking
+from .services import OverlappingBooking, RoomsUnavailable, create_booking
 
-# Create your views here.
+class BookingCreateView(View):
+
+    async def post(self, request):
+        """
+        Books a stay for the logged-in customer.
+        The booking transaction is blocking, so it runs in a worker thread through sync_to_async.
+        """
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({'error': "Authentication required."}, status=401)
+        try:
+            hotel_id = int(request.POST['hotel'])
+            check_in = date.fromisoformat(request.POST['check_in'])
+            check_out = date.fromisoformat(request.POST['check_out'])
+        except (KeyError, ValueError):
+            return JsonResponse({'error': "Invalid booking parameters."}, status=400)
+
+        try:
+            hotel = await Hotel.objects.aget(pk=hotel_id)
+        except Hotel.DoesNotExist:
+            return JsonResponse({'error': "Hotel not found."}, status=404)
+
+        try:
+            booking = await sync_to_async(create_booking)(user, hotel, check_in, check_out)
+        except (RoomsUnavailable, OverlappingBooking) as exc:
+            return JsonResponse({'error': exc.messages[0]}, status=409)
+        except ValidationError as exc:
+            return JsonResponse({'error': exc.messages[0]}, status=400)
+
+        return JsonResponse({
+            'id': booking.pk,
+            'hotel': hotel.pk,
+            'check_in': booking.check_in,
+            'check_out': booking.check_out,
+            'status': booking.status,
+            'total_price': booking.total_price,
+        }, status=201)
+
+
+class CustomerBookingsView(View):
+    limit = 50
+
+    async def get(self, request):
+        """
+        Lists the latest bookings of the logged-in customer together with their total count.
+        """
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({'error': "Authentication required."}, status=401)
+
+        bookings = Booking.objects.filter(customer=user)
+        latest = bookings.order_by('-check_in', '-pk').values(
+            'id', 'hotel_id', 'hotel__name', 'check_in', 'check_out', 'status', 'total_price'
+        )[:self.limit]
+        return JsonResponse({
+            'count': await bookings.acount(),
+            'results': [booking async for booking in latest],
+        })
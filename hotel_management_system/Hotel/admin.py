@@ -1,4 +1,37 @@
 from django.contrib import admin
-from .models import Hotel
+from .models import Amenity, Hotel, HotelAmenity, RateRule, RoomInventory
 
-admin.site.register(Hotel)
\ No newline at end of file
+class HotelAmenityInline(admin.TabularInline):
+    model = HotelAmenity
+    extra = 1
+
+class RateRuleInline(admin.TabularInline):
+    model = RateRule
+    extra = 0
+
+class HotelAdmin(admin.ModelAdmin):
+    list_display = ('name', 'city', 'country', 'owner', 'total_rooms', 'available_rooms', 'price_night', 'amenities_list')
+    search_fields = ('name', 'city', 'country')
+    list_filter = ('country',)
+    list_select_related = ('owner',)
+    raw_id_fields = ('owner',)
+    inlines = [HotelAmenityInline, RateRuleInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('amenities')
+
+    def amenities_list(self, obj):
+        return ", ".join(obj.get_amenities_list())
+    amenities_list.short_description = 'Amenities'
+
+class AmenityAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+
+class RoomInventoryAdmin(admin.ModelAdmin):
+    list_display = ('hotel', 'date', 'total_rooms', 'booked_rooms', 'rate')
+    list_select_related = ('hotel',)
+    raw_id_fields = ('hotel',)
+
+admin.site.register(Hotel, HotelAdmin)
+admin.site.register(Amenity, AmenityAdmin)
+admin.site.register(RoomInventory, RoomInventoryAdmin)
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class HotelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'Hotel'
\ No newline at end of file
+    name = 'Hotel'
+
+    def ready(self):
+        from .models import Hotel, RateRule
+        from .signals import hotel_amenities_changed, hotel_deleted, hotel_saved, rate_rule_changed
+
+        post_save.connect(hotel_saved, sender=Hotel)
+        post_delete.connect(hotel_deleted, sender=Hotel)
+        m2m_changed.connect(hotel_amenities_changed, sender=Hotel.amenities.through)
+        post_save.connect(rate_rule_changed, sender=RateRule)
+        post_delete.connect(rate_rule_changed, sender=RateRule)
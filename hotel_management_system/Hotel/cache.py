@@ -0,0 +1,130 @@
+"""
+Cache layer for hotel detail data and computed availability.
+
+Keys are versioned per hotel: every change to a hotel bumps its version, which makes all
+of its cached entries unreachable at once, on any backend, without pattern deletes.
+"""
+
+import threading
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(result):
+    with _stats_lock:
+        _stats[result] += 1
+
+
+def cache_stats():
+    """
+    Returns the in-process hit/miss counters of the hotel cache.
+    """
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 3) if total else 0.0}
+
+
+def reset_cache_stats():
+    """
+    Resets the hit/miss counters.
+    """
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def _version_key(hotel_id):
+    return f"hotel:{hotel_id}:version"
+
+
+def get_version(hotel_id):
+    """
+    Returns the current cache version of a hotel.
+    A missing version (never set, or evicted) is seeded from the clock rather than a constant,
+    so the entries cached under the versions before the eviction never become reachable again.
+    """
+    version = cache.get(_version_key(hotel_id))
+    if version is None:
+        seed = time.time_ns()
+        cache.add(_version_key(hotel_id), seed, timeout=None)
+        version = cache.get(_version_key(hotel_id), seed)
+    return version
+
+
+def make_key(hotel_id, *parts):
+    """
+    Builds a versioned cache key for a hotel entry.
+    """
+    return ":".join(["hotel", str(hotel_id), f"v{get_version(hotel_id)}", *map(str, parts)])
+
+
+def get_or_set(key, compute):
+    """
+    Returns the cached value of key, computing and caching it on a miss.
+    """
+    value = cache.get(key)
+    if value is not None:
+        _count('hits')
+        return value
+    _count('misses')
+    value = compute()
+    if value is not None:
+        cache.set(key, value)
+    return value
+
+
+def _bump(hotel_id):
+    try:
+        cache.incr(_version_key(hotel_id))
+    except ValueError:
+        cache.set(_version_key(hotel_id), time.time_ns(), timeout=None)
+
+
+def invalidate_hotel(hotel_id):
+    """
+    Drops every cached entry of a hotel once the current transaction commits,
+    so a concurrent read can never cache the pre-commit state again.
+    """
+    transaction.on_commit(lambda: _bump(hotel_id))
+
+
+def get_hotel_detail(hotel_id):
+    """
+    Returns the detail data of a hotel as a dict (None if it does not exist).
+    """
+    from .models import Hotel
+
+    def build():
+        hotel = Hotel.objects.select_related('owner').prefetch_related('amenities').filter(pk=hotel_id).first()
+        if hotel is None:
+            return None
+        return {
+            'id': hotel.pk,
+            'name': hotel.name,
+            'address': hotel.address,
+            'city': hotel.city,
+            'country': hotel.country,
+            'description': hotel.description,
+            'owner': hotel.owner.get_full_name(),
+            'total_rooms': hotel.total_rooms,
+            'price_night': hotel.price_night,
+            'amenities': hotel.get_amenities_list(),
+        }
+
+    return get_or_set(make_key(hotel_id, 'detail'), build)
+
+
+def get_availability(hotel_id, check_in, check_out):
+    """
+    Returns the number of rooms free on every night of a stay.
+    """
+    from .models import RoomInventory
+
+    return get_or_set(
+        make_key(hotel_id, 'availability', check_in.isoformat(), check_out.isoformat()),
+        lambda: RoomInventory.objects.free_rooms(hotel_id, check_in, check_out),
+    )
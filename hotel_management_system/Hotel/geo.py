@@ -0,0 +1,214 @@
+"""
+In-memory spatial index over the hotel coordinates.
+
+GridIndex buckets hotels into cells of `cell_size` degrees. A radius search only measures the
+hotels of the cells the search circle overlaps, so it touches a few cells whatever the number
+of hotels, and nearest-N searches widen the radius until enough hotels are found.
+
+Every process keeps one index, built from the database on first use and kept in sync by the
+Hotel signal receivers. Every GEO_INDEX_MAX_AGE seconds one request also pulls the hotels whose
+`updated_at` moved since the last sync, which picks up the changes saved by other processes
+without rebuilding the index.
+
+Searches never take the lock: the cells are never modified in place, an update replaces the
+cell it touches with a new dict, so a search iterating a cell is unaffected by concurrent updates.
+"""
+
+import math
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Each sync looks this far behind the previous one, for the transactions that committed late
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance in kilometres between two points.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+
+    def __init__(self, cell_size=0.1):
+        self.cell_size = cell_size
+        self.columns = math.ceil(360 / cell_size)
+        # (row, column) -> {hotel_id: (latitude, longitude)}, and hotel_id -> its cell
+        self._cells = {}
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _cell(self, latitude, longitude):
+        row = math.floor((latitude + 90) / self.cell_size)
+        column = math.floor((longitude + 180) / self.cell_size) % self.columns
+        return row, column
+
+    def load(self, rows):
+        """
+        Fills an index nobody searches yet from (hotel_id, latitude, longitude) rows, in place.
+        """
+        for hotel_id, latitude, longitude in rows:
+            cell = self._cell(latitude, longitude)
+            self._cells.setdefault(cell, {})[hotel_id] = (latitude, longitude)
+            self._positions[hotel_id] = cell
+        return self
+
+    def add(self, hotel_id, latitude, longitude):
+        """
+        Adds a hotel, or moves it if it is already indexed.
+        """
+        self.remove(hotel_id)
+        cell = self._cell(latitude, longitude)
+        hotels = dict(self._cells.get(cell, {}))
+        hotels[hotel_id] = (latitude, longitude)
+        self._cells[cell] = hotels
+        self._positions[hotel_id] = cell
+
+    def remove(self, hotel_id):
+        cell = self._positions.pop(hotel_id, None)
+        if cell is not None:
+            hotels = {other: position for other, position in self._cells[cell].items() if other != hotel_id}
+            if hotels:
+                self._cells[cell] = hotels
+            else:
+                del self._cells[cell]
+
+    def within(self, latitude, longitude, radius_km):
+        """
+        Returns the (distance_km, hotel_id) of the hotels within `radius_km`, nearest first.
+        """
+        span = radius_km / KM_PER_DEGREE
+        first_row, _ = self._cell(max(latitude - span, -90), longitude)
+        last_row, _ = self._cell(min(latitude + span, 90), longitude)
+
+        # Longitude degrees shrink towards the poles: size the column span for the widest latitude
+        widest = min(abs(latitude) + span, 90)
+        cos_widest = math.cos(math.radians(widest))
+        lon_span = span / cos_widest if cos_widest > 1e-9 else 360
+        if lon_span >= 180:
+            columns = range(self.columns)
+        else:
+            _, first_column = self._cell(latitude, longitude - lon_span)
+            count = math.floor((longitude + lon_span + 180) / self.cell_size) - math.floor((longitude - lon_span + 180) / self.cell_size)
+            columns = [(first_column + offset) % self.columns for offset in range(min(count, self.columns - 1) + 1)]
+
+        found = []
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                for hotel_id, (lat, lon) in self._cells.get((row, column), {}).items():
+                    distance = haversine(latitude, longitude, lat, lon)
+                    if distance <= radius_km:
+                        found.append((distance, hotel_id))
+        found.sort()
+        return found
+
+    def nearest(self, latitude, longitude, limit=10, max_radius_km=None):
+        """
+        Returns the (distance_km, hotel_id) of the `limit` nearest hotels, optionally within `max_radius_km`.
+        Every hotel within the searched radius is measured, so once it holds `limit` hotels they are the nearest.
+        """
+        max_radius_km = max_radius_km or math.pi * EARTH_RADIUS_KM
+        radius = min(self.cell_size * KM_PER_DEGREE, max_radius_km)
+        while True:
+            found = self.within(latitude, longitude, radius)
+            if len(found) >= limit or radius >= max_radius_km:
+                return found[:limit]
+            radius = min(radius * 4, max_radius_km)
+
+
+_index = None
+_synced_at = None
+_checked_at = 0.0
+# Serializes the writers (build, sync, signal updates); searches do not take it
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Returns the index of this process, building it from the database on first use. When it is older
+    than GEO_INDEX_MAX_AGE, the first request to notice syncs the hotels changed since the last sync,
+    while the concurrent requests keep searching the current index.
+    """
+    global _index, _synced_at, _checked_at
+    from .models import Hotel
+
+    if _index is None:
+        with _lock:
+            if _index is None:
+                started = now()
+                located = Hotel.objects.filter(latitude__isnull=False, longitude__isnull=False)
+                rows = located.values_list('pk', 'latitude', 'longitude').iterator(chunk_size=10000)
+                _index = GridIndex(settings.GEO_INDEX_CELL_SIZE).load(rows)
+                _synced_at, _checked_at = started, time.monotonic()
+        return _index
+
+    if time.monotonic() - _checked_at > settings.GEO_INDEX_MAX_AGE and _lock.acquire(blocking=False):
+        try:
+            started = now()
+            changed = Hotel.objects.filter(updated_at__gte=_synced_at - SYNC_OVERLAP)
+            for hotel_id, latitude, longitude in changed.values_list('pk', 'latitude', 'longitude'):
+                if latitude is None or longitude is None:
+                    _index.remove(hotel_id)
+                else:
+                    _index.add(hotel_id, latitude, longitude)
+            _synced_at, _checked_at = started, time.monotonic()
+        finally:
+            _lock.release()
+    return _index
+
+
+def reset_index():
+    """
+    Drops the index of this process; the next search rebuilds it.
+    """
+    global _index
+    with _lock:
+        _index = None
+
+
+def locate_hotel(hotel_id, latitude, longitude):
+    """
+    Updates the position of a hotel in this process's index once the transaction commits
+    (a hotel without coordinates is removed from it).
+    """
+    def update():
+        with _lock:
+            if _index is None:
+                return
+            if latitude is None or longitude is None:
+                _index.remove(hotel_id)
+            else:
+                _index.add(hotel_id, latitude, longitude)
+    transaction.on_commit(update)
+
+
+def forget_hotels(hotel_ids):
+    """
+    Removes hotels from this process's index, for the hotels deleted by other processes,
+    which the sync cannot see.
+    """
+    with _lock:
+        if _index is not None:
+            for hotel_id in hotel_ids:
+                _index.remove(hotel_id)
+
+
+def nearby(latitude, longitude, radius_km=None, limit=20):
+    """
+    Returns the (distance_km, hotel_id) of the nearest hotels, within `radius_km` when given.
+    """
+    index = get_index()
+    if radius_km is not None:
+        return index.within(latitude, longitude, radius_km)[:limit]
+    return index.nearest(latitude, longitude, limit)
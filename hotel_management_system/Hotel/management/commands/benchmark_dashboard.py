@@ -0,0 +1,67 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from hotel_management_system.benchmarking import measure, summarize, throwaway_database
+from Hotel.models import Hotel, HotelDailyStats, HotelMonthlyStats, owner_dashboard
+from User.models import User
+
+class Command(BaseCommand):
+    help = (
+        "Seeds an owner with N hotels and a year of rollups in a throwaway test database, "
+        "then times the 12-month owner dashboard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=200)
+        parser.add_argument('--queries', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        owner, created = User.objects.get_or_create(
+            username="dashboard_bench_owner",
+            defaults={'email': "dashboard_bench_owner@example.com", 'is_hotel_owner': True, 'is_customer': False},
+        )
+        if created:
+            self.seed(owner, options['hotels'])
+
+        stats = summarize(measure(lambda: owner_dashboard(owner), options['queries']))
+        self.stdout.write(
+            f"owner dashboard ({owner.hotels.count()} hotels, 12 months): "
+            f"p50={stats['p50_ms']:.3f} ms  p99={stats['p99_ms']:.3f} ms"
+        )
+
+    def seed(self, owner, hotels):
+        rng = random.Random(3)
+        created = Hotel.objects.bulk_create([
+            Hotel(
+                name=f"Dashboard Bench Hotel {i}", address="-", city="-", country="-", owner=owner,
+                total_rooms=50, available_rooms=50, price_night=Decimal(rng.randint(40, 300)),
+            )
+            for i in range(hotels)
+        ])
+        today = now().date()
+        daily = [
+            HotelDailyStats(
+                hotel_id=hotel.pk,
+                date=today - timedelta(days=offset),
+                rooms_sold=rooms,
+                revenue=hotel.price_night * rooms,
+            )
+            for hotel in created
+            for offset in range(366)
+            for rooms in [rng.randint(0, 50)]
+        ]
+        HotelDailyStats.objects.bulk_create(daily, batch_size=5000)
+
+        monthly = {}
+        for row in daily:
+            key = (row.hotel_id, row.date.replace(day=1))
+            totals = monthly.setdefault(key, HotelMonthlyStats(hotel_id=key[0], date=key[1]))
+            totals.rooms_sold += row.rooms_sold
+            totals.revenue += row.revenue
+        HotelMonthlyStats.objects.bulk_create(monthly.values(), batch_size=5000)
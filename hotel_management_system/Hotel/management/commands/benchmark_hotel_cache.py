@@ -0,0 +1,59 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from hotel_management_system.benchmarking import measure, summarize, throwaway_database
+from Hotel.cache import cache_stats, get_availability, get_hotel_detail, reset_cache_stats
+from Hotel.models import Hotel, RoomInventory
+from User.models import User
+
+class Command(BaseCommand):
+    help = (
+        "Times the hotel detail and availability lookups with a cold and a warm cache, "
+        "on a hotel seeded in a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        hotel = self.get_hotel()
+        check_in = now().date() + timedelta(days=7)
+        check_out = check_in + timedelta(days=5)
+
+        def lookup():
+            get_hotel_detail(hotel.pk)
+            get_availability(hotel.pk, check_in, check_out)
+
+        def cold_lookup():
+            cache.clear()
+            lookup()
+
+        reset_cache_stats()
+        for label, func in (("cold", cold_lookup), ("warm", lookup)):
+            stats = summarize(measure(func, options['queries']))
+            self.stdout.write(
+                f"{label} detail + availability: p50={stats['p50_ms']:.3f} ms  p99={stats['p99_ms']:.3f} ms"
+            )
+        self.stdout.write(f"cache stats: {cache_stats()}")
+
+    def get_hotel(self):
+        owner, _ = User.objects.get_or_create(
+            username="cache_bench_owner",
+            defaults={'email': "cache_bench_owner@example.com", 'is_hotel_owner': True, 'is_customer': False},
+        )
+        hotel, created = Hotel.objects.get_or_create(
+            name="Cache Bench Hotel",
+            defaults={
+                'address': "-", 'city': "Quito", 'country': "Ecuador", 'owner': owner,
+                'total_rooms': 50, 'available_rooms': 50, 'price_night': 80,
+            },
+        )
+        if created:
+            hotel.set_amenities(["wifi", "pool", "parking", "gym"])
+            RoomInventory.objects.initialize([hotel])
+        return hotel
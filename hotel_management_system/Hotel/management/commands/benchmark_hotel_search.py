@@ -0,0 +1,109 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from hotel_management_system.benchmarking import measure, summarize, throwaway_database
+from Hotel.models import Amenity, Hotel, HotelAmenity, RoomInventory
+from User.models import User
+
+CITIES = [(f"City {i}", f"Country {i % 20}") for i in range(200)]
+AMENITIES = ["wifi", "pool", "parking", "spa", "gym", "breakfast", "bar", "pets"]
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N hotels in a throwaway test database and reports p50/p99 latency of the hotel "
+        "search queries, including deep keyset pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=200, help="Samples per scenario.")
+        parser.add_argument('--deep-page', type=int, default=500, help="Page number of the deep-page scenario.")
+        parser.add_argument('--inventory-days', type=int, default=0,
+                            help="Open this many nights for every seeded hotel to benchmark availability search.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        self.seed(options['hotels'], options['batch_size'], options['inventory_days'])
+        rng = random.Random(42)
+        queries = options['queries']
+
+        def city_search():
+            city, _ = rng.choice(CITIES)
+            Hotel.objects.search(city=city).page(size=20)
+
+        def price_search():
+            city, country = rng.choice(CITIES)
+            low = Decimal(rng.randint(20, 300))
+            Hotel.objects.search(country=country, min_price=low, max_price=low + 50).page(size=20)
+
+        def amenity_search():
+            city, _ = rng.choice(CITIES)
+            Hotel.objects.search(city=city, amenities=rng.sample(AMENITIES, 2)).page(size=20)
+
+        # Walk to the deep page once, then time the deep page itself.
+        cursor = None
+        for _ in range(options['deep_page'] - 1):
+            _, cursor = Hotel.objects.all().page(cursor, size=20)
+            if cursor is None:
+                break
+
+        scenarios = {
+            'city, page 1': city_search,
+            'country + price range, page 1': price_search,
+            'city + amenities, page 1': amenity_search,
+            'all hotels, page 1': lambda: Hotel.objects.all().page(size=20),
+            f"all hotels, page {options['deep_page']}": lambda: Hotel.objects.all().page(cursor, size=20),
+        }
+        if options['inventory_days']:
+            start = date.today()
+
+            def availability_search():
+                city, _ = rng.choice(CITIES)
+                check_in = start + timedelta(days=rng.randint(0, options['inventory_days'] - 4))
+                Hotel.objects.search(city=city, check_in=check_in, check_out=check_in + timedelta(days=3)).page(size=20)
+
+            scenarios['city + 3-night availability, page 1'] = availability_search
+
+        for name, scenario in scenarios.items():
+            stats = summarize(measure(scenario, queries))
+            self.stdout.write(f"{name:<40} p50={stats['p50_ms']:>8.3f} ms  p99={stats['p99_ms']:>8.3f} ms")
+
+    def seed(self, hotels, batch_size, inventory_days):
+        existing = Hotel.objects.filter(name__startswith="Bench Hotel ").count()
+        if existing >= hotels:
+            return
+        owner, _ = User.objects.get_or_create(
+            username="bench_owner",
+            defaults={'email': "bench_owner@example.com", 'is_hotel_owner': True, 'is_customer': False},
+        )
+        amenity_ids = dict(Amenity.objects.for_names(AMENITIES).values_list('name', 'pk'))
+        rng = random.Random(7)
+        self.stdout.write(f"Seeding {hotels - existing} hotels...")
+        for offset in range(existing, hotels, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, hotels)):
+                city, country = rng.choice(CITIES)
+                rooms = rng.randint(5, 200)
+                batch.append(Hotel(
+                    name=f"Bench Hotel {i}",
+                    address=f"Street {i}",
+                    city=city,
+                    country=country,
+                    owner=owner,
+                    total_rooms=rooms,
+                    available_rooms=rooms,
+                    price_night=Decimal(rng.randint(2000, 40000)) / 100,
+                ))
+            created = Hotel.objects.bulk_create(batch)
+            HotelAmenity.objects.bulk_create([
+                HotelAmenity(hotel_id=hotel.pk, amenity_id=amenity_ids[name])
+                for hotel in created
+                for name in rng.sample(AMENITIES, rng.randint(0, 4))
+            ])
+            if inventory_days:
+                RoomInventory.objects.initialize(created, days=inventory_days, batch_size=batch_size)
@@ -0,0 +1,57 @@
+import math
+import random
+import time
+from django.core.management.base import BaseCommand
+from Hotel.geo import GridIndex, haversine
+
+class Command(BaseCommand):
+    help = (
+        "Times the in-memory spatial index on synthetic hotels spread around cities "
+        "(no database needed): index build, radius searches, nearest-N searches and a full scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=1_000_000)
+        parser.add_argument('--cities', type=int, default=2000)
+        parser.add_argument('--searches', type=int, default=1000)
+        parser.add_argument('--radius', type=float, default=5.0, help="Search radius in km.")
+        parser.add_argument('--cell-size', type=float, default=0.1, help="Grid cell size in degrees.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        # Hotels cluster around cities, like real ones do
+        cities = [
+            (math.degrees(math.asin(rng.uniform(-0.9, 0.9))), rng.uniform(-180, 180)) for _ in range(options['cities'])
+        ]
+        points = []
+        for hotel_id in range(options['hotels']):
+            latitude, longitude = rng.choice(cities)
+            points.append((hotel_id, latitude + rng.gauss(0, 0.1), (longitude + rng.gauss(0, 0.1) + 180) % 360 - 180))
+
+        started = time.perf_counter()
+        index = GridIndex(options['cell_size']).load(points)
+        self.report("index build", len(points), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for hotel_id, latitude, longitude in points[:1000]:
+            index.add(hotel_id, latitude + 0.01, longitude)
+        self.report("index update (copy-on-write cell)", 1000, time.perf_counter() - started)
+
+        centres = [rng.choice(cities) for _ in range(options['searches'])]
+        started = time.perf_counter()
+        found = sum(len(index.within(latitude, longitude, options['radius'])) for latitude, longitude in centres)
+        self.report(f"radius {options['radius']} km", len(centres), time.perf_counter() - started,
+                    f"{found / len(centres):.0f} hotels/search")
+
+        started = time.perf_counter()
+        for latitude, longitude in centres:
+            index.nearest(latitude, longitude, 10)
+        self.report("nearest 10", len(centres), time.perf_counter() - started)
+
+        latitude, longitude = centres[0]
+        started = time.perf_counter()
+        sum(1 for _, lat, lon in points if haversine(latitude, longitude, lat, lon) <= options['radius'])
+        self.report("full scan", 1, time.perf_counter() - started)
+
+    def report(self, label, count, elapsed, extra=""):
+        self.stdout.write(f"{label:<18} {count:>9} calls  {1000 * elapsed / count:>10.3f} ms/call  {extra}")
@@ -0,0 +1,97 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from hotel_management_system.benchmarking import throwaway_database
+from Hotel.models import Hotel, RateRule, RoomInventory
+from Hotel.pricing import RateCalendar
+from User.models import User
+
+class Command(BaseCommand):
+    help = (
+        "Seeds hotels with rate rules and a year of priced nights in a throwaway test database, then times stay quotes from the "
+        "in-memory prefix sums, from the database range sum and from per-night rule evaluation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=100)
+        parser.add_argument('--quotes', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self.benchmark(options)
+
+    def benchmark(self, options):
+        hotels = self.get_hotels(options['hotels'])
+        today = now().date()
+        rng = random.Random(7)
+        stays = []
+        for _ in range(options['quotes']):
+            check_in = today + timedelta(days=rng.randint(0, 340))
+            stays.append((rng.choice(hotels), check_in, check_in + timedelta(days=rng.randint(1, 14))))
+
+        started = time.perf_counter()
+        calendar = RateCalendar.load(hotels, start=today)
+        self.report("calendar load", 1, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for hotel, check_in, check_out in stays:
+            calendar.quote(hotel.pk, check_in, check_out)
+        self.report("prefix-sum quotes", len(stays), time.perf_counter() - started)
+
+        sample = stays[:1000]
+        started = time.perf_counter()
+        for hotel, check_in, check_out in sample:
+            RoomInventory.objects.quote(hotel, check_in, check_out)
+        self.report("range-sum query quotes", len(sample), time.perf_counter() - started)
+
+        rules = RateRule.objects.by_hotel([hotel.pk for hotel in hotels])
+        started = time.perf_counter()
+        for hotel, check_in, check_out in stays:
+            sum(
+                hotel.get_night_rate(check_in + timedelta(days=offset), rules[hotel.pk])
+                for offset in range((check_out - check_in).days)
+            )
+        self.report("per-night rule evaluation", len(stays), time.perf_counter() - started)
+
+        hotel = hotels[0]
+        started = time.perf_counter()
+        hotel.update_price(hotel.price_night + 1)
+        self.report("update_price (365-night reprice)", 1, time.perf_counter() - started)
+
+    def report(self, label, count, elapsed):
+        self.stdout.write(f"{label}: {count} in {elapsed * 1000:,.1f} ms ({count / elapsed:,.0f}/s)")
+
+    def get_hotels(self, count):
+        owner, _ = User.objects.get_or_create(
+            username="quote_bench_owner",
+            defaults={'email': "quote_bench_owner@example.com", 'is_hotel_owner': True, 'is_customer': False},
+        )
+        hotels = list(owner.hotels.all())
+        if len(hotels) >= count:
+            return hotels[:count]
+
+        rng = random.Random(11)
+        today = now().date()
+        new_hotels = Hotel.objects.bulk_create([
+            Hotel(
+                name=f"Quote Bench Hotel {i}", address="-", city="-", country="-", owner=owner,
+                total_rooms=20, available_rooms=20, price_night=Decimal(rng.randint(40, 300)),
+            )
+            for i in range(len(hotels), count)
+        ])
+        RateRule.objects.bulk_create(
+            rule
+            for hotel in new_hotels
+            for rule in (
+                RateRule(hotel=hotel, kind=RateRule.WEEKEND, multiplier=Decimal('1.20')),
+                RateRule(
+                    hotel=hotel, kind=RateRule.SEASON, multiplier=Decimal('1.35'),
+                    start_date=today + timedelta(days=150), end_date=today + timedelta(days=210),
+                ),
+            )
+        )
+        RoomInventory.objects.initialize(new_hotels, start=today, days=365)
+        return hotels + new_hotels
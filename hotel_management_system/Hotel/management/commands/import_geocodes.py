@@ -0,0 +1,94 @@
+import csv
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+from Hotel.models import Hotel
+
+class Command(BaseCommand):
+    help = (
+        "Loads hotel coordinates from a local CSV or JSONL file (columns: latitude, longitude and either "
+        "hotel, matched by name, or city and country). Hotel rows set the coordinates of that hotel; "
+        "city rows act as a gazetteer and only fill the hotels of that city that have no coordinates yet."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.json')) else 'csv')
+        batch_size = options['batch_size']
+
+        located = invalid = 0
+        hotels, cities = {}, {}
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as handle:
+                for line, row in enumerate(self.read_rows(handle, file_format), start=1):
+                    try:
+                        if file_format == 'jsonl':
+                            row = json.loads(row)
+                        if not isinstance(row, dict):
+                            raise ValueError("A row must be an object.")
+                        latitude, longitude = float(row['latitude']), float(row['longitude'])
+                        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                            raise ValueError("Coordinates out of range.")
+                        if row.get('hotel'):
+                            hotels[row['hotel']] = (latitude, longitude)
+                        elif row.get('city') and row.get('country'):
+                            cities[row['city'], row['country']] = (latitude, longitude)
+                        else:
+                            raise ValueError("A row needs a hotel, or a city and a country.")
+                    except (KeyError, TypeError, ValueError) as exc:
+                        invalid += 1
+                        self.stderr.write(f"Row {line}: {exc}")
+                        continue
+                    if len(hotels) >= batch_size:
+                        located += self.locate_hotels(hotels)
+                        hotels = {}
+        except OSError as exc:
+            raise CommandError(exc)
+        located += self.locate_hotels(hotels)
+        located += self.locate_cities(cities)
+
+        # bulk_update and update() skip the signal receivers: the running processes pick the
+        # new coordinates up on their next spatial index sync, from the bumped updated_at
+        self.stdout.write(self.style.SUCCESS(f"Located {located} hotels ({invalid} invalid rows skipped)."))
+
+    def read_rows(self, handle, file_format):
+        """
+        Yields CSV rows as dicts and JSONL rows as raw lines, decoded per row by the caller
+        so one bad line only skips that row.
+        """
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield line
+
+    def locate_hotels(self, coordinates):
+        """
+        Sets the coordinates of a batch of hotels ({name: (latitude, longitude)}) with one read and one bulk update.
+        """
+        hotels = list(Hotel.objects.filter(name__in=list(coordinates)).only('pk', 'name'))
+        updated_at = now()
+        for hotel in hotels:
+            hotel.latitude, hotel.longitude = coordinates[hotel.name]
+            hotel.updated_at = updated_at
+        with transaction.atomic():
+            Hotel.objects.bulk_update(hotels, ['latitude', 'longitude', 'updated_at'], batch_size=500)
+        return len(hotels)
+
+    def locate_cities(self, coordinates):
+        """
+        Gives the hotels without coordinates the coordinates of their city, one update per city.
+        """
+        located = 0
+        with transaction.atomic():
+            for (city, country), (latitude, longitude) in coordinates.items():
+                located += Hotel.objects.filter(
+                    city=city, country=country, latitude__isnull=True, longitude__isnull=True
+                ).update(latitude=latitude, longitude=longitude, updated_at=now())
+        return located
@@ -0,0 +1,27 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from Hotel.models import Hotel, RoomInventory
+
+class Command(BaseCommand):
+    help = "Creates the per-night room inventory of every hotel (a full year by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First night to initialize (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument('--days', type=int, default=365, help="Number of nights to initialize.")
+        parser.add_argument('--hotel', type=int, action='append', dest='hotels', help="Only initialize this hotel id.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+        except ValueError:
+            raise CommandError("--start must be a date in YYYY-MM-DD format.")
+
+        hotels = Hotel.objects.order_by().only('pk', 'total_rooms')
+        if options['hotels']:
+            hotels = hotels.filter(pk__in=options['hotels'])
+
+        processed = RoomInventory.objects.initialize(
+            hotels.iterator(), start=start, days=options['days'], batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Initialized {processed} inventory nights."))
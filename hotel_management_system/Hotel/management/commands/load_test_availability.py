@@ -0,0 +1,63 @@
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlencode
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils.timezone import now
+from hotel_management_system.benchmarking import summarize
+
+class Command(BaseCommand):
+    help = (
+        "Fires concurrent availability requests at running servers and reports their throughput, e.g. "
+        "`uvicorn hotel_management_system.asgi:application --port 8001` against "
+        "`gunicorn hotel_management_system.wsgi --port 8002`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True,
+            help="label=base_url of a running server, e.g. asgi=http://127.0.0.1:8001 (repeatable).",
+        )
+        parser.add_argument('--city', default="Quito")
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        check_in = now().date() + timedelta(days=14)
+        query = urlencode({
+            'city': options['city'],
+            'check_in': check_in.isoformat(),
+            'check_out': (check_in + timedelta(days=3)).isoformat(),
+        })
+        path = f"{reverse('hotel_availability')}?{query}"
+
+        for target in options['target']:
+            label, _, base_url = target.partition('=')
+            if not base_url:
+                raise CommandError(f"Invalid target '{target}', expected label=base_url.")
+            self.run(label, base_url.rstrip('/') + path, options['concurrency'], options['requests'])
+
+    def run(self, label, url, concurrency, requests):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                    ok = response.status == 200
+            except OSError:
+                ok = False
+            return (time.perf_counter() - started) * 1000, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        stats = summarize([latency for latency, _ in results])
+        errors = sum(1 for _, ok in results if not ok)
+        self.stdout.write(
+            f"{label}: {requests / elapsed:,.0f} req/s  p50={stats['p50_ms']:.1f} ms  "
+            f"p99={stats['p99_ms']:.1f} ms  errors={errors} (concurrency={concurrency})"
+        )
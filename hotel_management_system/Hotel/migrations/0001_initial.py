@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Hotel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('address', models.TextField()),
+                ('city', models.CharField(max_length=100)),
+                ('country', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('total_rooms', models.PositiveIntegerField()),
+                ('available_rooms', models.PositiveIntegerField()),
+                ('price_night', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('amenities', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hotels', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Hotel',
+                'verbose_name_plural': 'Hotels',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_rooms', models.PositiveIntegerField()),
+                ('booked_rooms', models.PositiveIntegerField(default=0)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='Hotel.hotel')),
+            ],
+            options={
+                'verbose_name': 'Room inventory',
+                'verbose_name_plural': 'Room inventory',
+                'indexes': [models.Index(fields=['date', 'hotel'], name='roominventory_date_hotel_idx')],
+                'constraints': [models.UniqueConstraint(fields=('hotel', 'date'), name='roominventory_hotel_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0002_room_inventory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='hotel',
+            options={'verbose_name': 'Hotel', 'verbose_name_plural': 'Hotels'},
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['city', 'price_night', 'id'], name='hotel_city_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['country', 'price_night', 'id'], name='hotel_country_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['price_night', 'id'], name='hotel_price_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def parse_amenities(apps, schema_editor):
+    """
+    Moves the comma-separated amenities text of every hotel into the amenity tables.
+    """
+    Hotel = apps.get_model('Hotel', 'Hotel')
+    Amenity = apps.get_model('Hotel', 'Amenity')
+    HotelAmenity = apps.get_model('Hotel', 'HotelAmenity')
+
+    names_by_hotel = {}
+    hotels = Hotel.objects.exclude(amenities_text__isnull=True).exclude(amenities_text='')
+    for hotel_id, text in hotels.values_list('pk', 'amenities_text').iterator(chunk_size=2000):
+        names_by_hotel[hotel_id] = {name.strip().lower() for name in text.split(',') if name.strip()}
+
+    all_names = set().union(*names_by_hotel.values())
+    Amenity.objects.bulk_create([Amenity(name=name) for name in all_names], ignore_conflicts=True)
+    amenity_ids = dict(Amenity.objects.filter(name__in=all_names).values_list('name', 'pk'))
+
+    HotelAmenity.objects.bulk_create(
+        (
+            HotelAmenity(hotel_id=hotel_id, amenity_id=amenity_ids[name])
+            for hotel_id, names in names_by_hotel.items()
+            for name in names
+        ),
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+def join_amenities(apps, schema_editor):
+    """
+    Rebuilds the comma-separated amenities text from the amenity tables.
+    """
+    Hotel = apps.get_model('Hotel', 'Hotel')
+    for hotel in Hotel.objects.prefetch_related('amenities').iterator(chunk_size=2000):
+        hotel.amenities_text = ", ".join(amenity.name for amenity in hotel.amenities.all())
+        hotel.save(update_fields=['amenities_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0003_hotel_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Amenity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Amenity',
+                'verbose_name_plural': 'Amenities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RenameField(
+            model_name='hotel',
+            old_name='amenities',
+            new_name='amenities_text',
+        ),
+        migrations.CreateModel(
+            name='HotelAmenity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amenity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Hotel.amenity')),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Hotel.hotel')),
+            ],
+            options={
+                'verbose_name': 'Hotel amenity',
+                'verbose_name_plural': 'Hotel amenities',
+            },
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='amenities',
+            field=models.ManyToManyField(blank=True, related_name='hotels', through='Hotel.HotelAmenity', to='Hotel.amenity'),
+        ),
+        migrations.AddIndex(
+            model_name='hotelamenity',
+            index=models.Index(fields=['amenity', 'hotel'], name='hotelamenity_amenity_hotel_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='hotelamenity',
+            constraint=models.UniqueConstraint(fields=('hotel', 'amenity'), name='hotelamenity_hotel_amenity_uniq'),
+        ),
+        migrations.RunPython(parse_amenities, join_amenities),
+        migrations.RemoveField(
+            model_name='hotel',
+            name='amenities_text',
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:16
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0004_amenities'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotelDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rooms_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='Hotel.hotel')),
+            ],
+            options={
+                'verbose_name': 'Hotel daily stats',
+                'verbose_name_plural': 'Hotel daily stats',
+                'constraints': [models.UniqueConstraint(fields=('hotel', 'date'), name='hoteldailystats_hotel_date_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HotelMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='First day of the month.')),
+                ('rooms_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_stats', to='Hotel.hotel')),
+            ],
+            options={
+                'verbose_name': 'Hotel monthly stats',
+                'verbose_name_plural': 'Hotel monthly stats',
+                'constraints': [models.UniqueConstraint(fields=('hotel', 'date'), name='hotelmonthlystats_hotel_date_uniq')],
+            },
+        ),
+    ]
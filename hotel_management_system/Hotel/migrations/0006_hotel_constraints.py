@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0005_hotel_stats_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='hotel',
+            constraint=models.CheckConstraint(condition=models.Q(('available_rooms__lte', models.F('total_rooms'))), name='hotel_available_lte_total'),
+        ),
+        migrations.AddConstraint(
+            model_name='hotel',
+            constraint=models.CheckConstraint(condition=models.Q(('price_night__gt', 0)), name='hotel_price_positive'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def price_calendar(apps, schema_editor):
+    """
+    Prices every existing inventory night with the base price of its hotel.
+    """
+    Hotel = apps.get_model('Hotel', 'Hotel')
+    RoomInventory = apps.get_model('Hotel', 'RoomInventory')
+    RoomInventory.objects.update(
+        rate=Subquery(Hotel.objects.filter(pk=OuterRef('hotel_id')).values('price_night')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0006_hotel_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roominventory',
+            name='rate',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(price_calendar, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='RateRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('weekend', 'Weekend (Friday and Saturday nights)'), ('season', 'Season (date range)'), ('occupancy', 'Occupancy surge')], max_length=10)),
+                ('multiplier', models.DecimalField(decimal_places=2, help_text='1.25 adds 25% to the base price.', max_digits=4)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, help_text='Last night of the season (inclusive).', null=True)),
+                ('min_occupancy', models.PositiveSmallIntegerField(blank=True, help_text='Booked percentage of the night from which the surge applies.', null=True)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_rules', to='Hotel.hotel')),
+            ],
+            options={
+                'verbose_name': 'Rate rule',
+                'verbose_name_plural': 'Rate rules',
+                'constraints': [models.CheckConstraint(condition=models.Q(('multiplier__gt', 0)), name='raterule_multiplier_positive')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Hotel', '0009_hotel_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='roominventory',
+            constraint=models.CheckConstraint(condition=models.Q(('booked_rooms__lte', models.F('total_rooms'))), name='roominventory_booked_lte_total'),
+        ),
+    ]
@@ -1,5 +1,124 @@
-from django.db import models
+import base64
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
 from User.models import User
+from .cache import invalidate_hotel
+
+class HotelQuerySet(models.QuerySet):
+    def search(self, city=None, country=None, min_price=None, max_price=None, amenities=None,
+               check_in=None, check_out=None, rooms=1):
+        """
+        Filters hotels by location, price range, amenities and availability for a stay.
+        """
+        queryset = self
+        if city:
+            queryset = queryset.filter(city=city)
+        if country:
+            queryset = queryset.filter(country=country)
+        if min_price is not None:
+            queryset = queryset.filter(price_night__gte=min_price)
+        if max_price is not None:
+            queryset = queryset.filter(price_night__lte=max_price)
+        if amenities:
+            queryset = queryset.with_amenities(amenities)
+        if check_in and check_out:
+            # Restrict the inventory scan to the hotels matching the other filters.
+            inventory = RoomInventory.objects.filter(hotel__in=queryset.values('pk'))
+            queryset = queryset.filter(pk__in=inventory.available_hotel_ids(check_in, check_out, rooms))
+        return queryset
+
+    def with_amenities(self, names):
+        """
+        Returns the hotels that offer all of the given amenities.
+        Counts the matches per hotel on the (amenity, hotel) index instead of joining once per amenity.
+        """
+        names = {Amenity.normalize(name) for name in names}
+        matching = (
+            HotelAmenity.objects.filter(hotel__in=self.values('pk'), amenity__name__in=names)
+            .values('hotel_id')
+            .annotate(matched=Count('amenity_id'))
+            .filter(matched=len(names))
+            .values('hotel_id')
+        )
+        return self.filter(pk__in=matching)
+
+    def page(self, cursor=None, size=20):
+        """
+        Returns one page ordered by (price_night, id) and the cursor of the next one.
+        Keyset pagination: the cursor is the sort key of the last row, so every page
+        is an index range scan no matter how deep it is.
+        """
+        queryset = self.order_by('price_night', 'pk')
+        if cursor:
+            price, pk = decode_cursor(cursor)
+            queryset = queryset.filter(Q(price_night__gt=price) | Q(price_night=price, pk__gt=pk))
+        hotels = list(queryset[:size + 1])
+        if len(hotels) <= size:
+            return hotels, None
+        hotels = hotels[:size]
+        return hotels, encode_cursor(hotels[-1].price_night, hotels[-1].pk)
+
+
+def encode_cursor(price, pk):
+    """
+    Encodes a (price_night, id) sort key as an opaque pagination cursor.
+    """
+    return base64.urlsafe_b64encode(f"{price}:{pk}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a pagination cursor, raising ValueError if it was tampered with.
+    """
+    try:
+        price, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return Decimal(price), int(pk)
+    except (ValueError, InvalidOperation, UnicodeDecodeError):
+        raise ValueError("Invalid cursor.")
+
+
+class AmenityQuerySet(models.QuerySet):
+    def for_names(self, names):
+        """
+        Returns the amenities with the given names, creating the missing ones in bulk.
+        """
+        names = {Amenity.normalize(name) for name in names if name.strip()}
+        self.bulk_create([Amenity(name=name) for name in names], ignore_conflicts=True)
+        return self.filter(name__in=names)
+
+
+class Amenity(models.Model):
+    # Fields
+    name = models.CharField(max_length=100, unique=True)
+
+    objects = AmenityQuerySet.as_manager()
+
+    #Metadata
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Amenity"
+        verbose_name_plural = "Amenities"
+
+    #Methods
+    def __str__(self):
+        """
+        Return a readable representation of the amenity.
+        """
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        """
+        Returns the canonical form of an amenity name.
+        """
+        return name.strip().lower()
+
 
 class Hotel(models.Model):
     # Fields
@@ -12,16 +131,41 @@ class Hotel(models.Model):
     total_rooms = models.PositiveIntegerField()
     available_rooms = models.PositiveIntegerField()
     price_night = models.DecimalField(max_digits=10, decimal_places=2)
-    amenities = models.TextField(blank=True, null=True)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    amenities = models.ManyToManyField(Amenity, through='HotelAmenity', related_name="hotels", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = HotelQuerySet.as_manager()
+
     #Metadata
     class Meta:
-        ordering = ['name']
         verbose_name = "Hotel"
         verbose_name_plural = "Hotels"
+        indexes = [
+            models.Index(fields=['city', 'price_night', 'id'], name='hotel_city_price_idx'),
+            models.Index(fields=['country', 'price_night', 'id'], name='hotel_country_price_idx'),
+            models.Index(fields=['price_night', 'id'], name='hotel_price_idx'),
+            models.Index(fields=['updated_at'], name='hotel_updated_at_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(available_rooms__lte=models.F('total_rooms')), name='hotel_available_lte_total'
+            ),
+            models.CheckConstraint(condition=models.Q(price_night__gt=0), name='hotel_price_positive'),
+            models.CheckConstraint(
+                condition=models.Q(latitude__isnull=True, longitude__isnull=True) | models.Q(
+                    latitude__gte=-90, latitude__lte=90, longitude__gte=-180, longitude__lte=180
+                ),
+                name='hotel_coordinates_valid',
+            ),
+        ]
     
+    _loaded_owner_id = None
+    _loaded_price_night = None
+    _loaded_total_rooms = None
+
     #Methods
     def __str__(self):
         """
@@ -29,46 +173,636 @@ class Hotel(models.Model):
         """
         return self.name
 
-    def get_available_rooms(self):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the owner, base price and room count loaded from the database to detect their changes on save.
+        """
+        hotel = super().from_db(db, field_names, values)
+        hotel._loaded_owner_id = hotel.__dict__.get('owner_id')
+        hotel._loaded_price_night = hotel.__dict__.get('price_night')
+        hotel._loaded_total_rooms = hotel.__dict__.get('total_rooms')
+        return hotel
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the hotel and runs the post_save receivers (owner counters, repricing) in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_owner_id = self.owner_id
+        self._loaded_price_night = self.price_night
+        self._loaded_total_rooms = self.total_rooms
+
+    def get_available_rooms(self, check_in=None, check_out=None):
         """
         Returns the number of available rooms.
+        When a stay is given, returns the rooms free on every night of it.
         """
+        if check_in and check_out:
+            return RoomInventory.objects.free_rooms(self, check_in, check_out)
         return self.available_rooms
 
-    def book_room(self):
+    def book_room(self, check_in=None, check_out=None):
         """
         Reduces the number of available rooms when a booking is made.
+        When a stay is given, reserves one room on every night of it.
         """
-        if self.available_rooms > 0:
-            self.available_rooms -= 1
-            self.save()
-            return True
-        return False
+        invalidate_hotel(self.pk)
+        if check_in and check_out:
+            return RoomInventory.objects.reserve(self, check_in, check_out)
+        updated = Hotel.objects.filter(pk=self.pk, available_rooms__gt=0).update(
+            available_rooms=F('available_rooms') - 1
+        )
+        self.refresh_from_db(fields=['available_rooms'])
+        return updated == 1
 
-    def cancel_booking(self):
+    def cancel_booking(self, check_in=None, check_out=None):
         """
         Increases the number of available rooms when a booking is canceled.
+        When a stay is given, releases one room on every night of it.
         """
-        if self.available_rooms < self.total_rooms:
-            self.available_rooms += 1
-            self.save()
+        invalidate_hotel(self.pk)
+        if check_in and check_out:
+            RoomInventory.objects.release(self, check_in, check_out)
+            return
+        Hotel.objects.filter(pk=self.pk, available_rooms__lt=F('total_rooms')).update(
+            available_rooms=F('available_rooms') + 1
+        )
+        self.refresh_from_db(fields=['available_rooms'])
 
-    def has_availability(self):
+    def has_availability(self, check_in=None, check_out=None):
         """
         Returns True if there are available rooms in the hotel.
+        When a stay is given, checks every night of it.
         """
-        return self.available_rooms > 0
+        return self.get_available_rooms(check_in, check_out) > 0
 
     def get_amenities_list(self):
         """
-        Returns a list of amenities as an array instead of a comma-separated string.
+        Returns the names of the hotel amenities.
+        Uses the prefetched amenities when available.
+        """
+        return [amenity.name for amenity in self.amenities.all()]
+
+    def set_amenities(self, names):
+        """
+        Replaces the hotel amenities with the given names.
         """
-        return [amenity.strip() for amenity in self.amenities.split(",")] if self.amenities else []
+        self.amenities.set(Amenity.objects.for_names(names))
 
     def update_price(self, new_price):
         """
-        Updates the price per night for the hotel.
+        Updates the price per night for the hotel; the post_save receiver reprices its rate calendar from today on.
         """
         if new_price > 0:
             self.price_night = new_price
-            self.save()
\ No newline at end of file
+            self.save(update_fields=['price_night', 'updated_at'])
+
+    def get_night_rate(self, night, rules, occupancy=0):
+        """
+        Returns the rate of one night: the base price with the multipliers of every rule that applies.
+        `occupancy` is the booked fraction of the night, for occupancy-based surges.
+        """
+        rate = Decimal(self.price_night)
+        for rule in rules:
+            if rule.applies(night, occupancy):
+                rate *= rule.multiplier
+        return rate.quantize(Decimal('0.01'))
+
+
+class HotelAmenity(models.Model):
+    # Fields
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE)
+    amenity = models.ForeignKey(Amenity, on_delete=models.CASCADE)
+
+    #Metadata
+    class Meta:
+        verbose_name = "Hotel amenity"
+        verbose_name_plural = "Hotel amenities"
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'amenity'], name='hotelamenity_hotel_amenity_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['amenity', 'hotel'], name='hotelamenity_amenity_hotel_idx'),
+        ]
+
+
+class RoomInventoryQuerySet(models.QuerySet):
+    def for_stay(self, hotel, check_in, check_out):
+        """
+        Returns the inventory rows for the nights of a stay (check-out night excluded).
+        """
+        return self.filter(hotel=hotel, date__gte=check_in, date__lt=check_out)
+
+    def free_rooms(self, hotel, check_in, check_out):
+        """
+        Returns the number of rooms free on every night of the stay.
+        Nights without an inventory row are not sellable, so they count as zero.
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return 0
+        stats = self.for_stay(hotel, check_in, check_out).aggregate(
+            nights=Count('pk'),
+            free=Min(F('total_rooms') - F('booked_rooms')),
+        )
+        if stats['nights'] < nights:
+            return 0
+        return stats['free']
+
+    def available_hotel_ids(self, check_in, check_out, rooms=1):
+        """
+        Returns the ids of the hotels with at least `rooms` free on every night of the stay,
+        as a single grouped query usable as a subquery.
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return self.none().values('hotel')
+        return (
+            self.filter(date__gte=check_in, date__lt=check_out, booked_rooms__lte=F('total_rooms') - rooms)
+            .values('hotel')
+            .annotate(nights=Count('pk'))
+            .filter(nights=nights)
+            .values('hotel')
+        )
+
+    def free_rooms_by_hotel(self, check_in, check_out):
+        """
+        Returns (hotel, free) rows with the rooms free on every night of the stay,
+        for all the hotels of the queryset that have the whole stay open, in one grouped query.
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return self.none().values('hotel')
+        return (
+            self.filter(date__gte=check_in, date__lt=check_out)
+            .values('hotel')
+            .annotate(nights=Count('pk'), free=Min(F('total_rooms') - F('booked_rooms')))
+            .filter(nights=nights)
+            .values('hotel', 'free')
+        )
+
+    def initialize(self, hotels, start=None, days=365, batch_size=1000):
+        """
+        Creates the inventory rows for `days` nights from `start` for every hotel, priced with its rate rules.
+        Existing rows are left untouched, so it is safe to run it again to extend the calendar.
+        Returns the number of nights processed.
+        """
+        start = start or now().date()
+        hotels = list(hotels)
+        rules = RateRule.objects.by_hotel([hotel.pk for hotel in hotels])
+        rows = (
+            RoomInventory(
+                hotel_id=hotel.pk,
+                date=night,
+                total_rooms=hotel.total_rooms,
+                rate=hotel.get_night_rate(night, rules[hotel.pk]),
+            )
+            for hotel in hotels
+            for night in (start + timedelta(days=offset) for offset in range(days))
+        )
+        processed = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                processed += len(self.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            processed += len(self.bulk_create(batch, ignore_conflicts=True))
+        return processed
+
+    def reserve(self, hotel, check_in, check_out, rooms=1):
+        """
+        Books `rooms` on every night of the stay with a single conditional update.
+        Nothing is reserved unless all the nights have enough free rooms.
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return False
+        with transaction.atomic():
+            updated = self.for_stay(hotel, check_in, check_out).filter(
+                booked_rooms__lte=F('total_rooms') - rooms
+            ).update(booked_rooms=F('booked_rooms') + rooms)
+            if updated != nights:
+                transaction.set_rollback(True)
+                return False
+            self.reprice_occupancy({hotel.pk: (check_in, check_out)})
+        return True
+
+    def release(self, hotel, check_in, check_out, rooms=1):
+        """
+        Returns `rooms` to every night of the stay.
+        """
+        with transaction.atomic():
+            released = self.for_stay(hotel, check_in, check_out).filter(
+                booked_rooms__gte=rooms
+            ).update(booked_rooms=F('booked_rooms') - rooms)
+            self.reprice_occupancy({hotel.pk: (check_in, check_out)})
+        return released
+
+    def quote(self, hotel, check_in, check_out):
+        """
+        Returns the price of a stay as one range-sum over the precomputed nightly rates,
+        or None when some night of the stay has no rate yet.
+        """
+        nights = (check_out - check_in).days
+        if nights <= 0:
+            return None
+        stats = self.for_stay(hotel, check_in, check_out).aggregate(nights=Count('pk'), total=Sum('rate'))
+        if stats['nights'] < nights:
+            return None
+        return stats['total'].quantize(Decimal('0.01'))
+
+    def reprice(self, hotel, start=None, end=None, batch_size=500):
+        """
+        Recomputes the nightly rates of a hotel from its base price and rate rules, from `start`
+        (inclusive) to `end` (exclusive). Nights that end up with the same rate are written
+        with one update, so a whole calendar usually takes a handful of statements.
+        """
+        rows = self.filter(hotel=hotel)
+        if start:
+            rows = rows.filter(date__gte=start)
+        if end:
+            rows = rows.filter(date__lt=end)
+        rules = list(hotel.rate_rules.all())
+
+        nights_by_rate = defaultdict(list)
+        for night, total, booked, rate in rows.values_list('date', 'total_rooms', 'booked_rooms', 'rate'):
+            new_rate = hotel.get_night_rate(night, rules, booked / total if total else 0)
+            if new_rate != rate:
+                nights_by_rate[new_rate].append(night)
+
+        with transaction.atomic():
+            for rate, nights in nights_by_rate.items():
+                for offset in range(0, len(nights), batch_size):
+                    self.filter(hotel=hotel, date__in=nights[offset:offset + batch_size]).update(rate=rate)
+        invalidate_hotel(hotel.pk)
+        return sum(len(nights) for nights in nights_by_rate.values())
+
+    def resize(self, hotel, total_rooms, start=None):
+        """
+        Sets the room count of the nights of a hotel from `start` (today by default) on, with one
+        conditional update. Raises ValidationError, changing nothing, when some of those nights
+        already have more rooms booked than `total_rooms`.
+        """
+        rows = self.filter(hotel=hotel, date__gte=start or now().date())
+        with transaction.atomic():
+            if rows.filter(booked_rooms__gt=total_rooms).exists():
+                raise ValidationError("Some nights already have more rooms booked than the new room count.")
+            resized = rows.exclude(total_rooms=total_rooms).update(total_rooms=total_rooms)
+            if resized:
+                # The booked fraction of every night changed
+                self.reprice_occupancy({hotel.pk: (start or now().date(), None)})
+        return resized
+
+    def reprice_occupancy(self, stays):
+        """
+        Reprices {hotel_id: (start, end)} for the hotels with occupancy rules, whose nightly rates
+        depend on the booked rooms. Costs a single query when none of the hotels has such a rule.
+        """
+        surging = Hotel.objects.filter(pk__in=stays, rate_rules__kind=RateRule.OCCUPANCY).distinct()
+        for hotel in surging:
+            start, end = stays[hotel.pk]
+            self.reprice(hotel, start=start, end=end)
+
+    def month_calendar(self, hotel_ids, month):
+        """
+        Returns {hotel_id: {'total': [...], 'booked': [...], 'confirmed': [...]}} for the month starting
+        at `month`, one array item per day (None for nights without inventory), in one query.
+        Booked rooms (pending and confirmed) come from the inventory and confirmed rooms from the
+        daily rollups, both kept up to date incrementally when bookings are created, confirmed or canceled.
+        """
+        start = month.replace(day=1)
+        end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        days = (end - start).days
+        confirmed = HotelDailyStats.objects.filter(hotel_id=OuterRef('hotel_id'), date=OuterRef('date'))
+        rows = self.filter(hotel_id__in=hotel_ids, date__gte=start, date__lt=end).annotate(
+            confirmed_rooms=Coalesce(Subquery(confirmed.values('rooms_sold')[:1]), 0)
+        ).values_list('hotel_id', 'date', 'total_rooms', 'booked_rooms', 'confirmed_rooms')
+
+        calendars = {
+            hotel_id: {'total': [None] * days, 'booked': [None] * days, 'confirmed': [None] * days}
+            for hotel_id in hotel_ids
+        }
+        for hotel_id, night, total, booked, confirmed_rooms in rows:
+            calendar, day = calendars[hotel_id], night.day - 1
+            calendar['total'][day] = total
+            calendar['booked'][day] = booked
+            calendar['confirmed'][day] = confirmed_rooms
+        return calendars
+
+    def add_nights(self, deltas):
+        """
+        Adds {(hotel_id, night): rooms} to the booked rooms in bulk, one update per hotel and
+        room count (negative values release rooms, never below zero). Positive values only apply
+        where the rooms fit: unless every one of their nights has an inventory row with room
+        for them, nothing is applied and False is returned.
+        """
+        grouped = defaultdict(list)
+        stays = {}
+        for (hotel_id, night), rooms in deltas.items():
+            if rooms:
+                grouped[hotel_id, rooms].append(night)
+                start, end = stays.get(hotel_id, (night, night))
+                stays[hotel_id] = (min(start, night), max(end, night + timedelta(days=1)))
+        with transaction.atomic():
+            for (hotel_id, rooms), nights in grouped.items():
+                if rooms > 0:
+                    updated = self.filter(
+                        hotel_id=hotel_id, date__in=nights, booked_rooms__lte=F('total_rooms') - rooms
+                    ).update(booked_rooms=F('booked_rooms') + rooms)
+                    if updated != len(nights):
+                        transaction.set_rollback(True)
+                        return False
+                else:
+                    self.filter(hotel_id=hotel_id, date__in=nights, booked_rooms__gte=-rooms).update(
+                        booked_rooms=F('booked_rooms') + rooms
+                    )
+            if stays:
+                self.reprice_occupancy(stays)
+        return True
+
+
+class RoomInventory(models.Model):
+    # Fields
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="inventory")
+    date = models.DateField()
+    total_rooms = models.PositiveIntegerField()
+    booked_rooms = models.PositiveIntegerField(default=0)
+    rate = models.DecimalField(max_digits=10, decimal_places=2)
+
+    objects = RoomInventoryQuerySet.as_manager()
+
+    #Metadata
+    class Meta:
+        verbose_name = "Room inventory"
+        verbose_name_plural = "Room inventory"
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'date'], name='roominventory_hotel_date_uniq'),
+            # The ledger itself refuses to oversell, whatever path (bulk or not) writes to it
+            models.CheckConstraint(
+                condition=models.Q(booked_rooms__lte=models.F('total_rooms')), name='roominventory_booked_lte_total'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'hotel'], name='roominventory_date_hotel_idx'),
+        ]
+
+    #Methods
+    def __str__(self):
+        """
+        Return a readable representation of the inventory night.
+        """
+        return f"{self.hotel_id} - {self.date} ({self.booked_rooms}/{self.total_rooms})"
+
+    def get_free_rooms(self):
+        """
+        Returns the number of rooms still free on this night.
+        """
+        return self.total_rooms - self.booked_rooms
+
+
+
+class RateRuleQuerySet(models.QuerySet):
+    def by_hotel(self, hotel_ids):
+        """
+        Returns {hotel_id: [rules]} for the given hotels in one query.
+        """
+        rules = defaultdict(list)
+        for rule in self.filter(hotel_id__in=hotel_ids):
+            rules[rule.hotel_id].append(rule)
+        return rules
+
+
+class RateRule(models.Model):
+    WEEKEND = 'weekend'
+    SEASON = 'season'
+    OCCUPANCY = 'occupancy'
+
+    KIND_CHOICES = (
+        (WEEKEND, 'Weekend (Friday and Saturday nights)'),
+        (SEASON, 'Season (date range)'),
+        (OCCUPANCY, 'Occupancy surge'),
+    )
+
+    # Fields
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="rate_rules")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    multiplier = models.DecimalField(max_digits=4, decimal_places=2, help_text="1.25 adds 25% to the base price.")
+    start_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True, help_text="Last night of the season (inclusive).")
+    min_occupancy = models.PositiveSmallIntegerField(
+        blank=True, null=True, help_text="Booked percentage of the night from which the surge applies."
+    )
+
+    objects = RateRuleQuerySet.as_manager()
+
+    #Metadata
+    class Meta:
+        verbose_name = "Rate rule"
+        verbose_name_plural = "Rate rules"
+        constraints = [
+            models.CheckConstraint(condition=models.Q(multiplier__gt=0), name='raterule_multiplier_positive'),
+        ]
+
+    #Methods
+    def __str__(self):
+        return f"{self.hotel} - {self.get_kind_display()} x{self.multiplier}"
+
+    def applies(self, night, occupancy=0):
+        """
+        Returns True if the rule applies to the given night and booked fraction of the hotel.
+        """
+        if self.kind == self.WEEKEND:
+            return night.weekday() in (4, 5)
+        if self.kind == self.SEASON:
+            return bool(self.start_date and self.end_date) and self.start_date <= night <= self.end_date
+        if self.kind == self.OCCUPANCY:
+            return self.min_occupancy is not None and occupancy * 100 >= self.min_occupancy
+        return False
+
+
+class StatsQuerySet(models.QuerySet):
+    def add_deltas(self, deltas, batch_size=500):
+        """
+        Adds {(hotel_id, date): (rooms, revenue)} deltas in bulk, for set-based booking changes.
+        """
+        if not deltas:
+            return
+        dates_by_hotel = defaultdict(list)
+        for hotel_id, day in deltas:
+            dates_by_hotel[hotel_id].append(day)
+
+        with transaction.atomic():
+            self.bulk_create(
+                [self.model(hotel_id=hotel_id, date=day) for hotel_id, day in deltas],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            rows = []
+            for hotel_id, dates in dates_by_hotel.items():
+                for offset in range(0, len(dates), batch_size):
+                    chunk = dates[offset:offset + batch_size]
+                    for row in self.select_for_update().filter(hotel_id=hotel_id, date__in=chunk):
+                        rooms, revenue = deltas[hotel_id, row.date]
+                        row.rooms_sold += rooms
+                        row.revenue += revenue
+                        rows.append(row)
+            self.bulk_update(rows, ['rooms_sold', 'revenue'], batch_size=batch_size)
+
+    def add(self, hotel_id, dates, rooms, revenue):
+        """
+        Adds the same `rooms` and `revenue` to the rows of the given dates (negative values remove them).
+        Removals only touch existing rows, so they are safe during cascade deletes.
+        """
+        if rooms > 0:
+            self.bulk_create([self.model(hotel_id=hotel_id, date=day) for day in dates], ignore_conflicts=True)
+        self.filter(hotel_id=hotel_id, date__in=dates).update(
+            rooms_sold=F('rooms_sold') + rooms, revenue=F('revenue') + revenue
+        )
+
+
+class HotelDailyStatsQuerySet(StatsQuerySet):
+    def record_stay(self, hotel_id, check_in, check_out, rooms, revenues):
+        """
+        Adds `rooms` sold to every night of a stay and `revenues` (one amount per night) to its nights,
+        in the daily and the monthly rollups (negative values remove them). Nights with the same
+        amount are written with one update.
+        """
+        nights = [check_in + timedelta(days=offset) for offset in range((check_out - check_in).days)]
+        if not nights:
+            return
+        nights_by_revenue = defaultdict(list)
+        monthly = defaultdict(lambda: [0, Decimal('0')])
+        for night, revenue in zip(nights, revenues):
+            nights_by_revenue[revenue].append(night)
+            totals = monthly[night.replace(day=1)]
+            totals[0] += rooms
+            totals[1] += revenue
+        for revenue, dates in nights_by_revenue.items():
+            self.add(hotel_id, dates, rooms, revenue)
+        for month, (month_rooms, month_revenue) in monthly.items():
+            HotelMonthlyStats.objects.add(hotel_id, [month], month_rooms, month_revenue)
+
+    def record_nights(self, deltas):
+        """
+        Adds {(hotel_id, night): (rooms, revenue)} deltas to the daily and the monthly rollups in bulk.
+        """
+        monthly = defaultdict(lambda: [0, Decimal('0')])
+        for (hotel_id, night), (rooms, revenue) in deltas.items():
+            totals = monthly[hotel_id, night.replace(day=1)]
+            totals[0] += rooms
+            totals[1] += revenue
+        self.add_deltas(deltas)
+        HotelMonthlyStats.objects.add_deltas({key: tuple(totals) for key, totals in monthly.items()})
+
+
+class HotelDailyStats(models.Model):
+    # Fields
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    rooms_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+
+    objects = HotelDailyStatsQuerySet.as_manager()
+
+    #Metadata
+    class Meta:
+        verbose_name = "Hotel daily stats"
+        verbose_name_plural = "Hotel daily stats"
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'date'], name='hoteldailystats_hotel_date_uniq'),
+        ]
+
+    #Methods
+    def __str__(self):
+        """
+        Return a readable representation of the daily stats.
+        """
+        return f"{self.hotel_id} - {self.date} ({self.rooms_sold} rooms, {self.revenue})"
+
+
+class HotelMonthlyStats(models.Model):
+    # Fields
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name="monthly_stats")
+    date = models.DateField(help_text="First day of the month.")
+    rooms_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+
+    objects = StatsQuerySet.as_manager()
+
+    #Metadata
+    class Meta:
+        verbose_name = "Hotel monthly stats"
+        verbose_name_plural = "Hotel monthly stats"
+        constraints = [
+            models.UniqueConstraint(fields=['hotel', 'date'], name='hotelmonthlystats_hotel_date_uniq'),
+        ]
+
+    #Methods
+    def __str__(self):
+        """
+        Return a readable representation of the monthly stats.
+        """
+        return f"{self.hotel_id} - {self.date:%Y-%m} ({self.rooms_sold} rooms, {self.revenue})"
+
+
+def month_starts(months, today=None):
+    """
+    Returns the first day of the last `months` months (current one included) and of the next month.
+    """
+    today = today or now().date()
+    year, month = today.year, today.month
+    starts = []
+    for _ in range(months):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    starts.reverse()
+    last = starts[-1]
+    starts.append(date(last.year + last.month // 12, last.month % 12 + 1, 1))
+    return starts
+
+
+def owner_dashboard(owner, months=12, today=None):
+    """
+    Returns the occupancy, revenue and ADR of an owner's hotels for the last months,
+    per month for the whole portfolio and per hotel for the whole period.
+    Reads the monthly rollups, so it runs two small queries whatever the number of bookings.
+    """
+    starts = month_starts(months, today)
+    hotels = list(Hotel.objects.filter(owner=owner).order_by('name').values('id', 'name', 'total_rooms'))
+    stats = HotelMonthlyStats.objects.filter(
+        hotel__owner=owner, date__gte=starts[0], date__lt=starts[-1]
+    ).values_list('hotel_id', 'date', 'rooms_sold', 'revenue')
+
+    rooms_by_hotel = {hotel['id']: hotel['total_rooms'] for hotel in hotels}
+    per_month = {start: {'rooms_sold': 0, 'revenue': Decimal('0')} for start in starts[:-1]}
+    per_hotel = {hotel['id']: {'rooms_sold': 0, 'revenue': Decimal('0')} for hotel in hotels}
+    for hotel_id, month, rooms, revenue in stats:
+        for totals in (per_month[month], per_hotel[hotel_id]):
+            totals['rooms_sold'] += rooms
+            totals['revenue'] += revenue
+
+    total_rooms = sum(rooms_by_hotel.values())
+    period_days = (starts[-1] - starts[0]).days
+
+    def metrics(totals, capacity):
+        return {
+            'rooms_sold': totals['rooms_sold'],
+            'revenue': totals['revenue'],
+            'occupancy': round(100 * totals['rooms_sold'] / capacity, 1) if capacity else 0.0,
+            'adr': (totals['revenue'] / totals['rooms_sold']).quantize(Decimal('0.01')) if totals['rooms_sold'] else Decimal('0'),
+        }
+
+    return {
+        'months': [
+            {'month': start, **metrics(per_month[start], total_rooms * (end - start).days)}
+            for start, end in zip(starts, starts[1:])
+        ],
+        'hotels': [
+            {'name': hotel['name'], **metrics(per_hotel[hotel['id']], hotel['total_rooms'] * period_days)}
+            for hotel in hotels
+        ],
+    }
@@ -0,0 +1,61 @@
+"""
+In-memory stay quotes from the precomputed rate calendar.
+
+RoomInventory stores one rate per hotel and night, so the price of a stay is a range sum.
+RateCalendar loads the rates once and keeps per-hotel prefix sums (in cents), which turns
+every quote into two list lookups, whatever the length of the stay.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from django.utils.timezone import now
+from .models import RoomInventory
+
+class RateCalendar:
+
+    def __init__(self, start, days):
+        self.start = start
+        self.days = days
+        # hotel_id -> prefix sums of the nightly rates (cents) and of the priced nights
+        self._sums = {}
+        self._counts = {}
+
+    @classmethod
+    def load(cls, hotels=None, start=None, days=365):
+        """
+        Loads the rates of `days` nights from `start` for the given hotels (all of them by default).
+        """
+        calendar = cls(start or now().date(), days)
+        rows = RoomInventory.objects.filter(
+            date__gte=calendar.start, date__lt=calendar.start + timedelta(days=days)
+        )
+        if hotels is not None:
+            rows = rows.filter(hotel__in=hotels)
+
+        rates = {}
+        for hotel_id, night, rate in rows.values_list('hotel', 'date', 'rate').iterator(chunk_size=5000):
+            nights = rates.setdefault(hotel_id, [None] * days)
+            nights[(night - calendar.start).days] = int(rate * 100)
+
+        for hotel_id, nights in rates.items():
+            sums, counts = [0], [0]
+            for cents in nights:
+                sums.append(sums[-1] + (cents or 0))
+                counts.append(counts[-1] + (cents is not None))
+            calendar._sums[hotel_id] = sums
+            calendar._counts[hotel_id] = counts
+        return calendar
+
+    def quote(self, hotel_id, check_in, check_out):
+        """
+        Returns the price of a stay, or None when it falls outside the calendar or has unpriced nights.
+        """
+        first = (check_in - self.start).days
+        last = (check_out - self.start).days
+        counts = self._counts.get(hotel_id)
+        if counts is None or first < 0 or last > self.days or first >= last:
+            return None
+        if counts[last] - counts[first] != last - first:
+            return None
+        sums = self._sums[hotel_id]
+        return Decimal(sums[last] - sums[first]) / 100
@@ -0,0 +1,53 @@
+from django.db.models import F
+from django.utils.timezone import now
+from User.models import User
+from .cache import invalidate_hotel
+from .geo import locate_hotel
+from .models import Hotel, RoomInventory
+
+def hotel_saved(sender, instance, created, **kwargs):
+    """
+    Keeps the owners hotels_owned counters in sync when a hotel is created or changes owner,
+    reprices its rate calendar from today on when its base price changes, resizes its room
+    inventory from today on when its room count changes, and drops the cached data of the hotel.
+    """
+    invalidate_hotel(instance.pk)
+    locate_hotel(instance.pk, instance.latitude, instance.longitude)
+    if created:
+        User.objects.filter(pk=instance.owner_id).update(hotels_owned=F('hotels_owned') + 1)
+    elif instance._loaded_owner_id is not None and instance._loaded_owner_id != instance.owner_id:
+        User.objects.filter(pk=instance._loaded_owner_id).update(hotels_owned=F('hotels_owned') - 1)
+        User.objects.filter(pk=instance.owner_id).update(hotels_owned=F('hotels_owned') + 1)
+    if not created and instance._loaded_price_night is not None and instance._loaded_price_night != instance.price_night:
+        RoomInventory.objects.reprice(instance, start=now().date())
+    if not created and instance._loaded_total_rooms is not None and instance._loaded_total_rooms != instance.total_rooms:
+        RoomInventory.objects.resize(instance, instance.total_rooms)
+
+def hotel_deleted(sender, instance, **kwargs):
+    """
+    Removes the deleted hotel from its owner's hotels_owned counter (also on cascades)
+    and from the spatial index.
+    """
+    invalidate_hotel(instance.pk)
+    locate_hotel(instance.pk, None, None)
+    User.objects.filter(pk=instance.owner_id).update(hotels_owned=F('hotels_owned') - 1)
+
+def hotel_amenities_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drops the cached data of the hotels whose amenities changed.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        invalidate_hotel(instance.pk)
+    elif pk_set:
+        for hotel_id in pk_set:
+            invalidate_hotel(hotel_id)
+
+def rate_rule_changed(sender, instance, **kwargs):
+    """
+    Reprices the rate calendar of the hotel, from today on, when one of its rate rules changes.
+    """
+    hotel = Hotel.objects.filter(pk=instance.hotel_id).first()
+    if hotel is not None:
+        RoomInventory.objects.reprice(hotel, start=now().date())
@@ -1,3 +1,652 @@
-from django.test import TestCase
+import random
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from hotel_management_system.middleware import QueryRecorder, reset_routes, slowest_routes
+from hotel_management_system.testing import ChangelistQueryCountMixin
+from Booking.services import create_booking
+from User.models import User
+from .cache import cache_stats, get_availability, get_hotel_detail, reset_cache_stats
+from .geo import GridIndex, haversine, nearby, reset_index
+from .models import Amenity, Hotel, HotelDailyStats, RateRule, RoomInventory, owner_dashboard
+from .pricing import RateCalendar
 
-# Create your tests here.
+class RoomInventoryTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.owner = User.objects.create_user(
+            username="owner",
+            email="owner@example.com",
+            is_hotel_owner=True,
+            is_customer=False,
+            password="securepassword"
+        )
+        self.hotel = Hotel.objects.create(
+            name="Hotel Quito",
+            address="Av. Amazonas",
+            city="Quito",
+            country="Ecuador",
+            owner=self.owner,
+            total_rooms=2,
+            available_rooms=2,
+            price_night=50
+        )
+        self.start = date(2030, 1, 1)
+        RoomInventory.objects.initialize([self.hotel], start=self.start, days=30)
+
+    def test_initialize_full_calendar(self):
+        """Verifica que se creen las noches y que repetir la carga no duplique filas"""
+        RoomInventory.objects.initialize([self.hotel], start=self.start, days=60)
+        self.assertEqual(RoomInventory.objects.filter(hotel=self.hotel).count(), 60)
+
+    def test_free_rooms_for_stay(self):
+        """Verifica la disponibilidad de un rango de noches"""
+        check_in, check_out = self.start, self.start + timedelta(days=3)
+        self.assertEqual(self.hotel.get_available_rooms(check_in, check_out), 2)
+
+        self.assertTrue(self.hotel.book_room(self.start + timedelta(days=1), self.start + timedelta(days=2)))
+        self.assertEqual(self.hotel.get_available_rooms(check_in, check_out), 1)
+        # La noche de salida no se cuenta
+        self.assertEqual(self.hotel.get_available_rooms(check_in, self.start + timedelta(days=1)), 2)
+
+    def test_uninitialized_nights_are_not_sellable(self):
+        """Verifica que las noches sin inventario no estén disponibles"""
+        check_out = self.start + timedelta(days=31)
+        self.assertFalse(self.hotel.has_availability(self.start, check_out))
+        self.assertFalse(self.hotel.book_room(self.start, check_out))
+        self.assertEqual(RoomInventory.objects.filter(hotel=self.hotel, booked_rooms__gt=0).count(), 0)
+
+    def test_reserve_is_all_or_nothing(self):
+        """Verifica que una reserva no descuente noches si alguna está llena"""
+        full_night = self.start + timedelta(days=2)
+        RoomInventory.objects.filter(hotel=self.hotel, date=full_night).update(booked_rooms=2)
+
+        self.assertFalse(self.hotel.book_room(self.start, self.start + timedelta(days=4)))
+        self.assertEqual(RoomInventory.objects.filter(hotel=self.hotel, booked_rooms=1).count(), 0)
+
+    def test_cancel_releases_nights(self):
+        """Verifica que cancelar devuelva las habitaciones a cada noche"""
+        check_in, check_out = self.start, self.start + timedelta(days=2)
+        self.hotel.book_room(check_in, check_out)
+        self.hotel.book_room(check_in, check_out)
+        self.assertFalse(self.hotel.has_availability(check_in, check_out))
+
+        self.hotel.cancel_booking(check_in, check_out)
+        self.assertEqual(self.hotel.get_available_rooms(check_in, check_out), 1)
+
+    def test_available_hotel_ids(self):
+        """Verifica la búsqueda de hoteles disponibles en una sola consulta"""
+        other = Hotel.objects.create(
+            name="Hotel Cuenca", address="Centro", city="Cuenca", country="Ecuador",
+            owner=self.owner, total_rooms=1, available_rooms=1, price_night=40
+        )
+        RoomInventory.objects.initialize([other], start=self.start, days=30)
+        other.book_room(self.start, self.start + timedelta(days=1))
+
+        check_in, check_out = self.start, self.start + timedelta(days=2)
+        with self.assertNumQueries(1):
+            hotel_ids = list(RoomInventory.objects.available_hotel_ids(check_in, check_out).values_list('hotel', flat=True))
+        self.assertEqual(hotel_ids, [self.hotel.pk])
+
+
+class HotelSearchTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.start = date(2030, 1, 1)
+        for i in range(5):
+            hotel = Hotel.objects.create(
+                name=f"Hotel Quito {i}", address="Centro", city="Quito", country="Ecuador",
+                owner=self.owner, total_rooms=1, available_rooms=1, price_night=100 - 10 * i
+            )
+            hotel.set_amenities(["WiFi", " Pool"] if i % 2 else ["wifi"])
+        Hotel.objects.create(
+            name="Hotel Lima", address="Miraflores", city="Lima", country="Peru",
+            owner=self.owner, total_rooms=1, available_rooms=1, price_night=10
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse("hotel_search"), params)
+        return response.status_code, response.json()
+
+    def test_filters(self):
+        """Verifica los filtros por ciudad, precio y servicios"""
+        status, data = self.search(city="Quito", min_price=70, max_price=90)
+        self.assertEqual(status, 200)
+        self.assertEqual([hotel["name"] for hotel in data["results"]], ["Hotel Quito 3", "Hotel Quito 2", "Hotel Quito 1"])
+
+        _, data = self.search(country="Ecuador", amenities="pool")
+        self.assertEqual([hotel["name"] for hotel in data["results"]], ["Hotel Quito 3", "Hotel Quito 1"])
+
+    def test_invalid_page_size_and_rooms(self):
+        """Verifica que un tamaño de página o número de habitaciones menor a 1 se rechace"""
+        for params in ({"size": 0}, {"size": -1}, {"rooms": 0}, {"rooms": "x"}):
+            self.assertEqual(self.search(**params)[0], 400)
+
+    def test_keyset_pagination(self):
+        """Verifica que el cursor recorra todas las páginas sin repetir hoteles"""
+        names, cursor = [], None
+        while True:
+            params = {"size": 2, "city": "Quito"}
+            if cursor:
+                params["cursor"] = cursor
+            _, data = self.search(**params)
+            names += [hotel["name"] for hotel in data["results"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(names, [f"Hotel Quito {i}" for i in range(4, -1, -1)])
+
+    def test_deep_page_is_single_query(self):
+        """Verifica que una página profunda sea una sola consulta por rango"""
+        _, cursor = Hotel.objects.all().page(size=4)
+        with self.assertNumQueries(1):
+            hotels, next_cursor = Hotel.objects.all().page(cursor, size=4)
+        self.assertEqual([hotel.name for hotel in hotels], ["Hotel Quito 1", "Hotel Quito 0"])
+        self.assertIsNone(next_cursor)
+
+    def test_availability_filter(self):
+        """Verifica el filtro por disponibilidad de fechas"""
+        hotels = Hotel.objects.filter(city="Quito")
+        RoomInventory.objects.initialize(hotels, start=self.start, days=5)
+        hotels.get(name="Hotel Quito 0").book_room(self.start, self.start + timedelta(days=1))
+
+        _, data = self.search(city="Quito", check_in="2030-01-01", check_out="2030-01-03")
+        self.assertEqual(len(data["results"]), 4)
+        self.assertNotIn("Hotel Quito 0", [hotel["name"] for hotel in data["results"]])
+
+    def test_async_availability(self):
+        """Verifica la disponibilidad de varios hoteles en la vista asíncrona"""
+        hotels = Hotel.objects.filter(city="Quito")
+        RoomInventory.objects.initialize(hotels, start=self.start, days=5)
+        hotels.get(name="Hotel Quito 0").book_room(self.start, self.start + timedelta(days=1))
+
+        response = self.client.get(
+            reverse("hotel_availability"), {"city": "Quito", "check_in": "2030-01-01", "check_out": "2030-01-03"}
+        )
+        results = {hotel["name"]: hotel["available"] for hotel in response.json()["results"]}
+        self.assertEqual(len(results), 5)
+        self.assertFalse(results["Hotel Quito 0"])
+        self.assertTrue(results["Hotel Quito 1"])
+
+        response = self.client.get(reverse("hotel_availability"), {"check_in": "2030-01-03", "check_out": "2030-01-01"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_parameters(self):
+        """Verifica que los parámetros inválidos devuelvan 400"""
+        self.assertEqual(self.search(cursor="not-a-cursor")[0], 400)
+        self.assertEqual(self.search(min_price="abc")[0], 400)
+        self.assertEqual(self.search(check_in="2030-01-03", check_out="2030-01-01")[0], 400)
+
+
+class AmenityTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.hotel = Hotel.objects.create(
+            name="Hotel Quito", address="Centro", city="Quito", country="Ecuador",
+            owner=owner, total_rooms=1, available_rooms=1, price_night=50
+        )
+        self.hotel.set_amenities(["WiFi", "Pool", "wifi "])
+
+    def test_amenities_are_normalized(self):
+        """Verifica que los servicios se guarden normalizados y sin duplicados"""
+        self.assertEqual(self.hotel.get_amenities_list(), ["pool", "wifi"])
+        self.assertEqual(Amenity.objects.count(), 2)
+
+    def test_all_amenities_filter(self):
+        """Verifica el filtro que exige todos los servicios en una sola consulta"""
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Hotel.objects.with_amenities(["wifi", "POOL"])), [self.hotel])
+        self.assertFalse(Hotel.objects.with_amenities(["wifi", "spa"]).exists())
+
+    def test_prefetched_amenities_list(self):
+        """Verifica que la lista de servicios use los datos precargados"""
+        hotel = Hotel.objects.prefetch_related("amenities").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(hotel.get_amenities_list(), ["pool", "wifi"])
+
+
+class HotelAdminTest(ChangelistQueryCountMixin, TestCase):
+
+    def test_changelist_query_count(self):
+        """Verifica que el listado de hoteles no haga consultas por fila"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+
+        def add_rows(count):
+            start = Hotel.objects.count()
+            for i in range(start, start + count):
+                owner = User.objects.create_user(
+                    username=f"owner_{i}", email=f"owner_{i}@example.com", is_hotel_owner=True, is_customer=False
+                )
+                hotel = Hotel.objects.create(
+                    name=f"Hotel {i}", address="Centro", city="Quito", country="Ecuador",
+                    owner=owner, total_rooms=1, available_rooms=1, price_night=50
+                )
+                hotel.set_amenities(["wifi", "pool"])
+
+        self.assertChangelistQueriesConstant(Hotel, add_rows, superuser)
+
+
+class OwnerDashboardTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False, password="x"
+        )
+        self.hotels = [
+            Hotel.objects.create(
+                name=f"Hotel {i}", address="Centro", city="Quito", country="Ecuador",
+                owner=self.owner, total_rooms=10, available_rooms=10, price_night=50
+            )
+            for i in range(3)
+        ]
+        HotelDailyStats.objects.record_nights({
+            (self.hotels[0].pk, date(2030, 3, 1)): (10, 500),
+            (self.hotels[1].pk, date(2030, 3, 2)): (5, 400),
+            (self.hotels[1].pk, date(2029, 1, 1)): (5, 400),
+        })
+
+    def test_metrics(self):
+        """Verifica ocupación, ingresos y tarifa media por mes y por hotel"""
+        with self.assertNumQueries(2):
+            dashboard = owner_dashboard(self.owner, months=12, today=date(2030, 3, 15))
+
+        self.assertEqual(len(dashboard["months"]), 12)
+        march = dashboard["months"][-1]
+        self.assertEqual((march["month"], march["rooms_sold"], march["revenue"]), (date(2030, 3, 1), 15, 900))
+        self.assertEqual(march["adr"], 60)
+        self.assertEqual(march["occupancy"], round(100 * 15 / (30 * 31), 1))
+        self.assertEqual([hotel["rooms_sold"] for hotel in dashboard["hotels"]], [10, 5, 0])
+
+    def test_dashboard_view(self):
+        """Verifica que el panel solo lo vean los dueños de hotel"""
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(reverse("owner_dashboard")).status_code, 200)
+
+        customer = User.objects.create_user(username="customer", email="customer@example.com")
+        self.client.force_login(customer)
+        self.assertEqual(self.client.get(reverse("owner_dashboard")).status_code, 403)
+
+
+class HotelCacheTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        cache.clear()
+        reset_cache_stats()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel = Hotel.objects.create(
+                name="Hotel Quito", address="Centro", city="Quito", country="Ecuador",
+                owner=self.owner, total_rooms=2, available_rooms=2, price_night=50
+            )
+            self.hotel.set_amenities(["wifi"])
+        self.check_in = date(2030, 1, 10)
+        self.check_out = self.check_in + timedelta(days=2)
+        RoomInventory.objects.initialize([self.hotel], start=self.check_in, days=5)
+
+    def test_hits_and_misses(self):
+        """Verifica que la segunda lectura se sirva desde la caché"""
+        get_hotel_detail(self.hotel.pk)
+        with self.assertNumQueries(0):
+            detail = get_hotel_detail(self.hotel.pk)
+        self.assertEqual(detail["amenities"], ["wifi"])
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_invalidation_on_price_change(self):
+        """Verifica que cambiar el precio invalide el detalle en caché"""
+        get_hotel_detail(self.hotel.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.update_price(80)
+        self.assertEqual(get_hotel_detail(self.hotel.pk)["price_night"], 80)
+
+    def test_evicted_version_does_not_revive_stale_entries(self):
+        """Verifica que si se expulsa la clave de versión no vuelvan a servirse entradas de versiones anteriores"""
+        get_hotel_detail(self.hotel.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.update_price(150)
+        cache.delete(f"hotel:{self.hotel.pk}:version")
+        self.assertEqual(get_hotel_detail(self.hotel.pk)["price_night"], 150)
+
+    def test_invalidation_on_booking(self):
+        """Verifica que una reserva invalide la disponibilidad en caché"""
+        self.assertEqual(get_availability(self.hotel.pk, self.check_in, self.check_out), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.book_room(check_in=self.check_in, check_out=self.check_out)
+        self.assertEqual(get_availability(self.hotel.pk, self.check_in, self.check_out), 1)
+
+    def test_detail_view(self):
+        """Verifica la vista de detalle y el 404 de hoteles inexistentes"""
+        url = reverse("hotel_detail", args=[self.hotel.pk])
+        response = self.client.get(url, {"check_in": "2030-01-10", "check_out": "2030-01-12"})
+        self.assertContains(response, "Hotel Quito")
+        self.assertEqual(response.context["free_rooms"], 2)
+        self.assertEqual(self.client.get(reverse("hotel_detail", args=[0])).status_code, 404)
+
+
+class RateCalendarTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.hotel = Hotel.objects.create(
+            name="Hotel Quito", address="Centro", city="Quito", country="Ecuador",
+            owner=self.owner, total_rooms=2, available_rooms=2, price_night=100
+        )
+        # 2030-01-04 es viernes
+        self.start = date(2030, 1, 1)
+        RateRule.objects.create(hotel=self.hotel, kind=RateRule.WEEKEND, multiplier=Decimal("1.50"))
+        RateRule.objects.create(
+            hotel=self.hotel, kind=RateRule.SEASON, multiplier=Decimal("2.00"),
+            start_date=date(2030, 1, 10), end_date=date(2030, 1, 11),
+        )
+        RoomInventory.objects.initialize([self.hotel], start=self.start, days=14)
+
+    def rates(self):
+        return list(RoomInventory.objects.filter(hotel=self.hotel).order_by("date").values_list("rate", flat=True))
+
+    def test_rules_are_precomputed(self):
+        """Verifica que las reglas de fin de semana y temporada se precalculen por noche"""
+        rates = self.rates()
+        self.assertEqual(rates[:6], [100, 100, 100, 150, 150, 100])
+        self.assertEqual(rates[9:12], [200, 300, 150])
+
+    def test_quotes(self):
+        """Verifica que la cotización por suma de rango y por sumas prefijas coincidan"""
+        check_in, check_out = self.start, self.start + timedelta(days=14)
+        quote = RoomInventory.objects.quote(self.hotel, check_in, check_out)
+        self.assertEqual(quote, sum(self.rates()))
+        self.assertEqual(RateCalendar.load([self.hotel], start=self.start, days=30).quote(self.hotel.pk, check_in, check_out), quote)
+
+        # Las noches sin tarifa no se pueden cotizar
+        self.assertIsNone(RoomInventory.objects.quote(self.hotel, check_in, check_out + timedelta(days=1)))
+        self.assertIsNone(RateCalendar.load(start=self.start, days=30).quote(self.hotel.pk, check_in, check_out + timedelta(days=1)))
+
+    def test_repricing(self):
+        """Verifica que cambiar el precio o una regla recalcule el calendario en bloque"""
+        RoomInventory.objects.filter(hotel=self.hotel).update(booked_rooms=1)
+        RateRule.objects.create(hotel=self.hotel, kind=RateRule.OCCUPANCY, multiplier=Decimal("1.10"), min_occupancy=50)
+        self.assertEqual(self.rates()[:4], [110, 110, 110, Decimal("165.00")])
+
+        self.hotel.rate_rules.all().delete()
+        self.assertEqual(set(self.rates()), {100})
+
+        self.hotel.update_price(80)
+        self.assertEqual(set(self.rates()), {80})
+
+    def test_room_count_change_resizes_inventory(self):
+        """Verifica que cambiar el número de habitaciones del hotel actualice el inventario futuro"""
+        hotel = Hotel.objects.get(pk=self.hotel.pk)
+        hotel.total_rooms = hotel.available_rooms = 5
+        hotel.save()
+        self.assertEqual(set(RoomInventory.objects.filter(hotel=self.hotel).values_list("total_rooms", flat=True)), {5})
+
+        # No se puede bajar por debajo de las habitaciones ya reservadas
+        RoomInventory.objects.filter(hotel=self.hotel, date=self.start).update(booked_rooms=3)
+        hotel.total_rooms = hotel.available_rooms = 2
+        with self.assertRaises(ValidationError):
+            hotel.save()
+        self.assertEqual(Hotel.objects.get(pk=self.hotel.pk).total_rooms, 5)
+        self.assertEqual(set(RoomInventory.objects.filter(hotel=self.hotel).values_list("total_rooms", flat=True)), {5})
+
+    def test_direct_price_save_reprices(self):
+        """Verifica que guardar el precio directamente (p. ej. desde el admin) recalcule el calendario"""
+        hotel = Hotel.objects.get(pk=self.hotel.pk)
+        hotel.price_night = 80
+        hotel.save()
+        self.assertEqual(self.rates()[:4], [80, 80, 80, 120])
+
+    def test_occupancy_follows_bookings(self):
+        """Verifica que las reservas y liberaciones recalculen las noches con recargo por ocupación"""
+        RateRule.objects.create(hotel=self.hotel, kind=RateRule.OCCUPANCY, multiplier=Decimal("1.10"), min_occupancy=50)
+        self.assertTrue(RoomInventory.objects.reserve(self.hotel, self.start, self.start + timedelta(days=2)))
+        self.assertEqual(self.rates()[:3], [110, 110, 100])
+
+        RoomInventory.objects.release(self.hotel, self.start, self.start + timedelta(days=2))
+        self.assertEqual(self.rates()[:3], [100, 100, 100])
+
+        RoomInventory.objects.add_nights({(self.hotel.pk, self.start + timedelta(days=2)): 1})
+        self.assertEqual(self.rates()[:3], [100, 100, 110])
+
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0, REQUEST_PROFILING_DUPLICATE_THRESHOLD=3)
+class RequestProfilingTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        cache.clear()
+        reset_routes()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.hotel = Hotel.objects.create(
+            name="Hotel Quito", address="Centro", city="Quito", country="Ecuador",
+            owner=self.owner, total_rooms=2, available_rooms=2, price_night=50
+        )
+
+    def test_server_timing_and_routes(self):
+        """Verifica que se agregue Server-Timing y se acumulen las rutas perfiladas"""
+        with self.assertLogs("hotel_management_system.middleware", "INFO"):
+            response = self.client.get(reverse("hotel_detail", args=[self.hotel.pk]))
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertEqual([row["route"] for row in slowest_routes()], ["hotel/<int:pk>/"])
+
+        # Solo el personal puede consultar las rutas más lentas
+        self.assertEqual(self.client.get(reverse("slow_routes")).status_code, 302)
+        self.owner.is_staff = True
+        self.owner.save()
+        self.client.force_login(self.owner)
+        routes = self.client.get(reverse("slow_routes")).json()["routes"]
+        self.assertEqual(routes[0]["requests"], 1)
+
+        # Las URLs sin ruta comparten un único acumulado en lugar de uno por dirección
+        for path in ("/no-such-page-1/", "/no-such-page-2/"):
+            self.assertEqual(self.client.get(path).status_code, 404)
+        routes = {row["route"]: row["requests"] for row in slowest_routes()}
+        self.assertEqual(routes["<unresolved>"], 2)
+        self.assertFalse([route for route in routes if "no-such-page" in route])
+
+    def test_duplicate_queries(self):
+        """Verifica que se detecten consultas repetidas con distintos parámetros (N+1)"""
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for pk in range(4):
+                list(Hotel.objects.filter(pk=pk))
+            list(User.objects.all())
+        self.assertEqual(recorder.count, 5)
+        self.assertEqual(recorder.duplicates(3), 3)
+        self.assertEqual(recorder.duplicates(5), 0)
+
+
+class OccupancyCalendarTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.hotel = Hotel.objects.create(
+            name="Hotel Quito", address="Centro", city="Quito", country="Ecuador",
+            owner=self.owner, total_rooms=2, available_rooms=2, price_night=50
+        )
+        RoomInventory.objects.initialize([self.hotel], start=date(2030, 1, 10), days=10)
+        self.customers = [
+            User.objects.create_user(username=f"customer_{i}", email=f"customer_{i}@example.com") for i in range(3)
+        ]
+
+    def test_incremental_calendar(self):
+        """Verifica que el calendario refleje reservas, confirmaciones y cancelaciones"""
+        first = create_booking(self.customers[0], self.hotel, date(2030, 1, 10), date(2030, 1, 13))
+        second = create_booking(self.customers[1], self.hotel, date(2030, 1, 12), date(2030, 1, 14))
+        first.confirm_booking()
+
+        with self.assertNumQueries(1):
+            calendar = RoomInventory.objects.month_calendar([self.hotel.pk], date(2030, 1, 1))[self.hotel.pk]
+        self.assertEqual(len(calendar["total"]), 31)
+        self.assertIsNone(calendar["total"][8])
+        self.assertEqual(calendar["booked"][9:14], [1, 1, 2, 1, 0])
+        self.assertEqual(calendar["confirmed"][9:14], [1, 1, 1, 0, 0])
+
+        second.cancel_booking()
+        first.cancel_booking()
+        calendar = RoomInventory.objects.month_calendar([self.hotel.pk], date(2030, 1, 1))[self.hotel.pk]
+        self.assertEqual(calendar["booked"][9:14], [0] * 5)
+        self.assertEqual(calendar["confirmed"][9:14], [0] * 5)
+
+    def test_month_grid(self):
+        """Verifica que la grilla del mes marque las noches completas y solo la vean el dueño y el personal"""
+        create_booking(self.customers[0], self.hotel, date(2030, 1, 12), date(2030, 1, 13))
+        create_booking(self.customers[1], self.hotel, date(2030, 1, 12), date(2030, 1, 13))
+        url = reverse("hotel_calendar", args=[self.hotel.pk])
+
+        self.client.force_login(self.customers[2])
+        self.assertEqual(self.client.get(url, {"month": "2030-01"}).status_code, 403)
+
+        self.client.force_login(self.owner)
+        response = self.client.get(url, {"month": "2030-01"})
+        cells = [cell for week in response.context["weeks"] for cell in week if cell]
+        self.assertEqual(len(cells), 31)
+        self.assertEqual([cell["day"] for cell in cells if cell["full"]], [12])
+        self.assertContains(response, "Completo")
+        self.assertEqual(response.context["following"], date(2030, 2, 1))
+
+        # Los meses fuera del rango representable vuelven al mes actual
+        current = now().date().replace(day=1)
+        for month in ("9999-12", "0001-01"):
+            response = self.client.get(url, {"month": month})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["month"], current)
+
+
+class HotelGeoTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        reset_index()
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", is_hotel_owner=True, is_customer=False
+        )
+        self.hotels = {
+            name: Hotel.objects.create(
+                name=name, address="Centro", city=city, country="Ecuador", owner=self.owner,
+                total_rooms=2, available_rooms=2, price_night=50, latitude=latitude, longitude=longitude,
+            )
+            for name, city, latitude, longitude in [
+                ("Hotel Quito", "Quito", -0.2201, -78.5123),
+                ("Hotel Cumbayá", "Quito", -0.2040, -78.4300),
+                ("Hotel Guayaquil", "Guayaquil", -2.1894, -79.8891),
+                ("Hotel Cuenca", "Cuenca", None, None),
+            ]
+        }
+
+    def test_grid_matches_full_scan(self):
+        """Verifica que la búsqueda por radio del índice coincida con un recorrido completo, incluso cerca del antimeridiano y los polos"""
+        rng = random.Random(3)
+        index = GridIndex(cell_size=1.0)
+        points = {}
+        for hotel_id in range(2000):
+            latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            index.add(hotel_id, latitude, longitude)
+            points[hotel_id] = (latitude, longitude)
+        index.add(0, 10.0, 10.0)
+        points[0] = (10.0, 10.0)
+
+        for latitude, longitude, radius in [(0, 179.9, 500), (89.5, 0, 300), (-45, -120, 1500), (10, 10, 0.1)]:
+            expected = sorted(
+                hotel_id for hotel_id, (lat, lon) in points.items() if haversine(latitude, longitude, lat, lon) <= radius
+            )
+            self.assertEqual(sorted(hotel_id for _, hotel_id in index.within(latitude, longitude, radius)), expected)
+
+        nearest = [hotel_id for _, hotel_id in index.nearest(10.0, 10.0, 5)]
+        by_distance = sorted(points, key=lambda hotel_id: haversine(10.0, 10.0, *points[hotel_id]))
+        self.assertEqual(nearest, by_distance[:5])
+
+    def test_nearby_endpoint(self):
+        """Verifica la búsqueda de hoteles cercanos y que el índice se actualice al guardar un hotel"""
+        url = reverse("hotel_nearby")
+        results = self.client.get(url, {"lat": -0.21, "lon": -78.50, "radius": 20}).json()["results"]
+        self.assertEqual([hotel["name"] for hotel in results], ["Hotel Quito", "Hotel Cumbayá"])
+        self.assertLess(results[0]["distance_km"], 2)
+
+        results = self.client.get(url, {"lat": -2.9, "lon": -79.0, "limit": 1}).json()["results"]
+        self.assertEqual([hotel["name"] for hotel in results], ["Hotel Guayaquil"])
+
+        cuenca = self.hotels["Hotel Cuenca"]
+        cuenca.latitude, cuenca.longitude = -2.8974, -79.0045
+        with self.captureOnCommitCallbacks(execute=True):
+            cuenca.save()
+        results = self.client.get(url, {"lat": -2.9, "lon": -79.0, "limit": 1}).json()["results"]
+        self.assertEqual([hotel["name"] for hotel in results], ["Hotel Cuenca"])
+
+        self.assertEqual(self.client.get(url, {"lat": 95, "lon": 0}).status_code, 400)
+
+    def test_index_syncs_changes_of_other_processes(self):
+        """Verifica que el índice incorpore los cambios guardados sin señales y olvide los hoteles borrados"""
+        self.assertEqual(len(nearby(-2.9, -79.0, radius_km=10)), 0)
+        # Un update() simula a otro proceso: no pasa por las señales de este
+        Hotel.objects.filter(name="Hotel Cuenca").update(latitude=-2.8974, longitude=-79.0045, updated_at=now())
+        self.assertEqual(len(nearby(-2.9, -79.0, radius_km=10)), 0)
+        with self.settings(GEO_INDEX_MAX_AGE=-1):
+            self.assertEqual(len(nearby(-2.9, -79.0, radius_km=10)), 1)
+
+        # Sin ejecutar los callbacks on_commit, el índice no se entera del borrado
+        self.hotels["Hotel Cumbayá"].delete()
+        url = reverse("hotel_nearby")
+        results = self.client.get(url, {"lat": -0.21, "lon": -78.50, "radius": 20}).json()["results"]
+        self.assertEqual([hotel["name"] for hotel in results], ["Hotel Quito"])
+        self.assertEqual(len(nearby(-0.21, -78.50, radius_km=20)), 1)
+
+    def test_import_geocodes(self):
+        """Verifica la importación de coordenadas por hotel y por ciudad"""
+        Hotel.objects.update(latitude=None, longitude=None)
+        path = self.enterContext(tempfile.TemporaryDirectory()) + "/geocodes.csv"
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write("hotel,city,country,latitude,longitude\n")
+            handle.write("Hotel Quito,,,-0.2201,-78.5123\n")
+            handle.write(",Quito,Ecuador,-0.1807,-78.4678\n")
+            handle.write(",Cuenca,Ecuador,-2.9001,-79.0059\n")
+            handle.write("Hotel Guayaquil,,,-200,0\n")
+
+        out = StringIO()
+        call_command("import_geocodes", path, stdout=out, stderr=StringIO())
+        self.assertIn("Located 3 hotels (1 invalid rows skipped)", out.getvalue())
+        coordinates = dict(Hotel.objects.values_list("name", "latitude"))
+        self.assertEqual(coordinates["Hotel Quito"], -0.2201)
+        self.assertEqual(coordinates["Hotel Cumbayá"], -0.1807)
+        self.assertEqual(coordinates["Hotel Cuenca"], -2.9001)
+        self.assertIsNone(coordinates["Hotel Guayaquil"])
+        self.assertEqual(len(nearby(-0.2, -78.5, radius_km=10)), 2)
+
+    def test_import_geocodes_skips_malformed_lines(self):
+        """Verifica que una línea JSONL inválida solo descarte esa fila"""
+        path = self.enterContext(tempfile.TemporaryDirectory()) + "/geocodes.jsonl"
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write('{"hotel": "Hotel Cuenca", "latitude": -2.8974, "longitude": -79.0045}\n')
+            handle.write('{"hotel": "Hotel Quito",\n')
+            handle.write('[1, 2]\n')
+
+        out = StringIO()
+        call_command("import_geocodes", path, stdout=out, stderr=StringIO())
+        self.assertIn("Located 1 hotels (2 invalid rows skipped)", out.getvalue())
+        self.assertEqual(Hotel.objects.get(name="Hotel Cuenca").latitude, -2.8974)
@@ -2,5 +2,11 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-
-]
\ No newline at end of file
+    path('dashboard/', views.OwnerDashboardView.as_view(), name="owner_dashboard"),
+    path('search/', views.HotelSearchView.as_view(), name="hotel_search"),
+    path('nearby/', views.HotelNearbyView.as_view(), name="hotel_nearby"),
+    path('availability/', views.HotelAvailabilityView.as_view(), name="hotel_availability"),
+    path('cache-stats/', views.CacheStatsView.as_view(), name="hotel_cache_stats"),
+    path('<int:pk>/', views.HotelDetailView.as_view(), name="hotel_detail"),
+    path('<int:pk>/calendar/', views.HotelCalendarView.as_view(), name="hotel_calendar"),
+]
@@ -1,3 +1,243 @@
-from django.shortcuts import render
+import asyncio
+import calendar
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.timezone import now
+from django.views import View
+from django.views.generic import TemplateView
+from .cache import cache_stats, get_availability, get_hotel_detail
+from .geo import forget_hotels, nearby
+from .models import Hotel, RoomInventory, owner_dashboard
 
-# Create your views here.
+class HotelSearchView(View):
+    page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        """
+        Searches hotels by city, country, price range, amenities and availability.
+        Results are paginated with an opaque `cursor` returned as `next_cursor`.
+        """
+        params = request.GET
+        try:
+            check_in = date.fromisoformat(params['check_in']) if params.get('check_in') else None
+            check_out = date.fromisoformat(params['check_out']) if params.get('check_out') else None
+            min_price = Decimal(params['min_price']) if params.get('min_price') else None
+            max_price = Decimal(params['max_price']) if params.get('max_price') else None
+            rooms = int(params.get('rooms', 1))
+            size = min(int(params.get('size', self.page_size)), self.max_page_size)
+        except (ValueError, InvalidOperation):
+            return JsonResponse({'error': "Invalid search parameters."}, status=400)
+        if rooms < 1 or size < 1:
+            return JsonResponse({'error': "Invalid search parameters."}, status=400)
+        if bool(check_in) != bool(check_out) or (check_in and check_in >= check_out):
+            return JsonResponse({'error': "Check-in date must be before check-out date."}, status=400)
+
+        hotels = Hotel.objects.search(
+            city=params.get('city'),
+            country=params.get('country'),
+            min_price=min_price,
+            max_price=max_price,
+            amenities=[amenity.strip() for amenity in params.get('amenities', '').split(',') if amenity.strip()],
+            check_in=check_in,
+            check_out=check_out,
+            rooms=rooms,
+        ).only('id', 'name', 'city', 'country', 'price_night')
+        try:
+            page, next_cursor = hotels.page(params.get('cursor'), size)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+        return JsonResponse({
+            'results': [
+                {
+                    'id': hotel.pk,
+                    'name': hotel.name,
+                    'city': hotel.city,
+                    'country': hotel.country,
+                    'price_night': hotel.price_night,
+                }
+                for hotel in page
+            ],
+            'next_cursor': next_cursor,
+        })
+
+
+class HotelNearbyView(View):
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        """
+        Returns the hotels nearest to `lat`/`lon` with their distance, all within `radius` km when given,
+        from the in-memory spatial index (one query to fetch the names of the results).
+        """
+        params = request.GET
+        try:
+            latitude = float(params['lat'])
+            longitude = float(params['lon'])
+            radius = float(params['radius']) if params.get('radius') else None
+            limit = min(int(params.get('limit', self.default_limit)), self.max_limit)
+        except (KeyError, ValueError):
+            return JsonResponse({'error': "Invalid location parameters."}, status=400)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or (radius is not None and radius <= 0) or limit <= 0:
+            return JsonResponse({'error': "Invalid location parameters."}, status=400)
+
+        found = nearby(latitude, longitude, radius, limit)
+        hotels = Hotel.objects.only('id', 'name', 'city', 'country').in_bulk([hotel_id for _, hotel_id in found])
+        if len(hotels) < len(found):
+            forget_hotels([hotel_id for _, hotel_id in found if hotel_id not in hotels])
+        return JsonResponse({
+            'results': [
+                {
+                    'id': hotel_id,
+                    'name': hotels[hotel_id].name,
+                    'city': hotels[hotel_id].city,
+                    'country': hotels[hotel_id].country,
+                    'distance_km': round(distance, 3),
+                }
+                for distance, hotel_id in found if hotel_id in hotels
+            ],
+        })
+
+
+class HotelAvailabilityView(View):
+    max_hotels = 200
+
+    async def get(self, request):
+        """
+        Returns the rooms free for a stay in many hotels at once (by `ids` or by `city`),
+        without blocking a worker while the database answers.
+        """
+        params = request.GET
+        try:
+            check_in = date.fromisoformat(params.get('check_in', ''))
+            check_out = date.fromisoformat(params.get('check_out', ''))
+            rooms = int(params.get('rooms', 1))
+            ids = [int(pk) for pk in params.get('ids', '').split(',') if pk.strip()]
+        except ValueError:
+            return JsonResponse({'error': "Invalid availability parameters."}, status=400)
+        if check_in >= check_out:
+            return JsonResponse({'error': "Check-in date must be before check-out date."}, status=400)
+
+        hotels = Hotel.objects.order_by('pk')
+        if ids:
+            hotels = hotels.filter(pk__in=ids)
+        if params.get('city'):
+            hotels = hotels.filter(city=params['city'])
+        hotels = hotels[:self.max_hotels]
+
+        async def names():
+            return {hotel['pk']: hotel['name'] async for hotel in hotels.values('pk', 'name')}
+
+        async def free_rooms():
+            inventory = RoomInventory.objects.filter(hotel__in=hotels.values('pk'))
+            return {row['hotel']: row['free'] async for row in inventory.free_rooms_by_hotel(check_in, check_out)}
+
+        names, free = await asyncio.gather(names(), free_rooms())
+        return JsonResponse({
+            'results': [
+                {'id': pk, 'name': name, 'free_rooms': free.get(pk, 0), 'available': free.get(pk, 0) >= rooms}
+                for pk, name in names.items()
+            ],
+        })
+
+
+class OwnerDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    template_name = "hotels/dashboard.html"
+    months = 12
+
+    def test_func(self):
+        """
+        Only hotel owners have a dashboard.
+        """
+        return self.request.user.is_hotel_owner
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(owner_dashboard(self.request.user, months=self.months))
+        return context
+
+
+class HotelDetailView(TemplateView):
+    template_name = "hotels/detail.html"
+
+    def get_context_data(self, **kwargs):
+        """
+        Serves the hotel data, and the availability of the requested stay, from the cache.
+        """
+        context = super().get_context_data(**kwargs)
+        hotel = get_hotel_detail(self.kwargs['pk'])
+        if hotel is None:
+            raise Http404("Hotel not found.")
+        context['hotel'] = hotel
+
+        try:
+            check_in = date.fromisoformat(self.request.GET.get('check_in', ''))
+            check_out = date.fromisoformat(self.request.GET.get('check_out', ''))
+        except ValueError:
+            return context
+        if check_in < check_out:
+            context.update(check_in=check_in, check_out=check_out,
+                           free_rooms=get_availability(hotel['id'], check_in, check_out))
+        return context
+
+
+class HotelCalendarView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    template_name = "hotels/calendar.html"
+
+    def test_func(self):
+        """
+        Staff and the hotel owner can see the occupancy calendar.
+        """
+        self.hotel = Hotel.objects.filter(pk=self.kwargs['pk']).values('id', 'name', 'owner_id').first()
+        if self.hotel is None:
+            raise Http404("Hotel not found.")
+        return self.request.user.is_staff or self.hotel['owner_id'] == self.request.user.pk
+
+    def get_context_data(self, **kwargs):
+        """
+        Builds the month grid (`?month=YYYY-MM`, the current month by default) from the
+        materialized calendar, with one query for the whole month.
+        """
+        context = super().get_context_data(**kwargs)
+        try:
+            month = datetime.strptime(self.request.GET['month'], "%Y-%m").date()
+        except (KeyError, ValueError):
+            month = None
+        # The previous and following months must be representable dates too
+        if month is None or not date.min.year < month.year < date.max.year:
+            month = now().date().replace(day=1)
+        days = RoomInventory.objects.month_calendar([self.hotel['id']], month)[self.hotel['id']]
+
+        weeks = []
+        for week in calendar.Calendar().monthdayscalendar(month.year, month.month):
+            cells = []
+            for day in week:
+                if not day:
+                    cells.append(None)
+                    continue
+                total, booked, confirmed = (days[key][day - 1] for key in ('total', 'booked', 'confirmed'))
+                cells.append({
+                    'day': day, 'total': total, 'booked': booked, 'confirmed': confirmed,
+                    'full': total is not None and booked >= total,
+                })
+            weeks.append(cells)
+
+        previous = (month - timedelta(days=1)).replace(day=1)
+        following = (month + timedelta(days=31)).replace(day=1)
+        context.update(hotel=self.hotel, month=month, weeks=weeks, days=days, previous=previous, following=following)
+        return context
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class CacheStatsView(View):
+    def get(self, request):
+        """
+        Returns the hit/miss counters of the hotel cache.
+        """
+        return JsonResponse(cache_stats())
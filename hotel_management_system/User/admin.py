@@ -1,24 +1,84 @@
-from django.contrib import admin
-from .models import User
+import time
+from django.contrib import admin, messages
+from .models import User, UserBulkJob
 
-def deactivate_users(modeladmin, request, queryset):
-    queryset.update(is_active=False)
+# Bulk actions run in chunks for at most ADMIN_TIME_BUDGET seconds within the request;
+# whatever is left is resumed from the job list or with `manage.py run_user_jobs`.
+CHUNK_SIZE = 500
+ADMIN_TIME_BUDGET = 5
 
-deactivate_users.short_description = "Deactivate selected users"
+def run_job(modeladmin, request, job):
+    try:
+        finished = job.run(chunk_size=CHUNK_SIZE, deadline=time.monotonic() + ADMIN_TIME_BUDGET)
+    except Exception as exc:
+        modeladmin.message_user(request, f"{job}: stopped after {job.processed} users: {exc}", messages.ERROR)
+        return
+    if finished:
+        modeladmin.message_user(request, f"{job}: {job.processed} of {job.total} users processed.", messages.SUCCESS)
+    else:
+        modeladmin.message_user(
+            request,
+            f"{job}: {job.processed} of {job.total} users processed so far. "
+            "Resume it from the user bulk jobs list or with `manage.py run_user_jobs`.",
+            messages.WARNING,
+        )
 
-def activate_users(modeladmin, request, queryset):
-    queryset.update(is_active=True)
+def bulk_action(action, description):
+    """
+    Builds an admin action that records a UserBulkJob for the selection and starts running it.
+    """
+    def start_job(modeladmin, request, queryset):
+        run_job(modeladmin, request, UserBulkJob.start(action, queryset, created_by=request.user))
 
-activate_users.short_description = "Reactivate selected users"
+    start_job.__name__ = f"{action}_users"
+    start_job.short_description = description
+    return start_job
+
+deactivate_users = bulk_action(UserBulkJob.DEACTIVATE, "Deactivate selected users")
+activate_users = bulk_action(UserBulkJob.ACTIVATE, "Reactivate selected users")
+make_customers = bulk_action(UserBulkJob.MAKE_CUSTOMER, "Make selected users customers")
+make_hotel_owners = bulk_action(UserBulkJob.MAKE_HOTEL_OWNER, "Make selected users hotel owners")
+delete_users = bulk_action(UserBulkJob.DELETE, "Delete selected users with their bookings and hotels")
 
 class UserAdmin(admin.ModelAdmin):
-    list_display = ('username', 'email', 'phone_number', 'is_hotel_owner', 'is_customer', 'is_superuser', 'groups')
+    list_display = ('username', 'email', 'phone_number', 'is_hotel_owner', 'is_customer', 'is_superuser', 'group_names')
     search_fields = ('username', 'email', 'phone_number')
     list_filter = ('is_hotel_owner', 'is_customer', 'is_superuser', 'is_active')
-    actions = [deactivate_users, activate_users]
+    actions = [deactivate_users, activate_users, make_customers, make_hotel_owners, delete_users]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('groups')
 
-    def groups(self, obj):
+    def get_actions(self, request):
+        # delete_users replaces the unbounded built-in delete
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def group_names(self, obj):
         return ", ".join([group.name for group in obj.groups.all()])
-    groups.short_description = 'Groups'
+    group_names.short_description = 'Groups'
+
+def resume_jobs(modeladmin, request, queryset):
+    for job in queryset.exclude(status=UserBulkJob.DONE):
+        run_job(modeladmin, request, job)
+
+resume_jobs.short_description = "Resume selected jobs"
+
+class UserBulkJobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'action', 'status', 'progress', 'created_by', 'created_at', 'updated_at')
+    list_filter = ('action', 'status')
+    list_select_related = ('created_by',)
+    readonly_fields = ('action', 'status', 'total', 'processed', 'last_pk', 'error', 'created_by')
+    actions = [resume_jobs]
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def progress(self, obj):
+        return f"{obj.processed}/{obj.total}"
+    progress.short_description = 'Progress'
 
-admin.site.register(User, UserAdmin)
\ No newline at end of file
+admin.site.register(User, UserAdmin)
+admin.site.register(UserBulkJob, UserBulkJobAdmin)
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'User'
-    verbose_name= "User Management"
\ No newline at end of file
+    verbose_name= "User Management"
+
+    def ready(self):
+        from django.contrib.auth.models import Group
+        from .models import clear_role_group_cache
+
+        post_save.connect(clear_role_group_cache, sender=Group)
+        post_delete.connect(clear_role_group_cache, sender=Group)
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.db.models import Q
 from .models import User
 import re
 
@@ -9,14 +10,11 @@ class CustomUserCreationForm(UserCreationForm):
         model = User
         fields = ['username', 'email', 'phone_number', 'is_hotel_owner', 'is_customer']
 
-        
-    def clean_email(self):
-        """Validate that the email is unique"""
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError("This email is already registered.")
-        return email
-    
+
+    def clean_username(self):
+        """The case-insensitive username check runs with the other unique fields in validate_unique"""
+        return self.cleaned_data.get('username')
+
     def clean_phone_number(self):
         """Validate that the phone number is in a valid format"""
         phone_number = self.cleaned_data.get('phone_number')
@@ -35,18 +33,42 @@ class CustomUserCreationForm(UserCreationForm):
         
         return cleaned_data
     
+    def validate_unique(self):
+        """Check username (ignoring case), email and phone number in one query instead of one per field"""
+        username, email, phone_number = (self.cleaned_data.get(field) for field in ('username', 'email', 'phone_number'))
+        lookups = Q()
+        if username:
+            lookups |= Q(username__iexact=username)
+        if email:
+            lookups |= Q(email=email)
+        if phone_number:
+            lookups |= Q(phone_number=phone_number)
+        if not lookups:
+            return
+
+        taken = set()
+        for existing in User.objects.filter(lookups).values_list('username', 'email', 'phone_number'):
+            if username and existing[0].lower() == username.lower():
+                taken.add('username')
+            if email and existing[1] == email:
+                taken.add('email')
+            if phone_number and existing[2] == phone_number:
+                taken.add('phone_number')
+        if taken:
+            self._update_errors(ValidationError({
+                field: self.instance.unique_error_message(User, [field]) for field in taken
+            }))
+
     def save(self, commit=True):
-        user = super().save(commit=False)
-        
-        if commit:
-            user.save()
-        
-        if user.is_hotel_owner:
-            group = Group.objects.get(name='hotel_owner')
-            user.groups.add(group)
-        
-        if user.is_customer:
-            group = Group.objects.get(name='customer')
-            user.groups.add(group)
-        
-        return user
\ No newline at end of file
+        """Create the user and their role group membership in one transaction"""
+        if not commit:
+            return super().save(commit=False)
+        data = self.cleaned_data
+        self.instance = User.objects.create_with_role(
+            data['username'],
+            data['email'],
+            data['password1'],
+            role=self.instance.get_role_group(),
+            phone_number=data.get('phone_number'),
+        )
+        return self.instance
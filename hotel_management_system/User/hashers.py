@@ -0,0 +1,79 @@
+"""
+Password hashers whose cost comes from the settings (PBKDF2_ITERATIONS, SCRYPT_* and ARGON2_*).
+
+They keep the algorithm names of Django's hashers, so existing hashes keep verifying. When the
+configured hasher or cost changes, must_update() makes check_password() rehash the password on the
+user's next successful login.
+"""
+
+import base64
+import hashlib
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.SCRYPT_PARALLELISM
+
+    @staticmethod
+    def memory_limit(work_factor, block_size):
+        """
+        scrypt needs about 128 * block_size * work_factor bytes, more than OpenSSL's 32 MiB default
+        once the work factor goes past 2**14; twice that leaves room for OpenSSL's own accounting.
+        """
+        return 2 * 128 * block_size * work_factor
+
+    @property
+    def maxmem(self):
+        return self.memory_limit(self.work_factor, self.block_size)
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        """
+        Same as Django's, but sizes the memory limit for the cost being computed: verify() passes the
+        cost stored in the hash, which may be higher than the configured one after lowering it.
+        """
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=self.memory_limit(n, r), dklen=64
+        )
+        hash_ = base64.b64encode(hash_).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash_)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Requires the argon2-cffi package.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from hotel_management_system.benchmarking import database_profile, summarize
+from User.models import User
+
+PASSWORD = "Benchmark-Password-1"
+
+class Command(BaseCommand):
+    help = (
+        "Measures login throughput (login plus one authenticated page) for each password hasher "
+        "and session backend, with concurrent clients in a throwaway test database. "
+        "Hashing releases the GIL, so worker threads use every core."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashers', nargs='+', choices=list(settings.PASSWORD_HASHER_CHOICES),
+                            default=list(settings.PASSWORD_HASHER_CHOICES))
+        parser.add_argument('--sessions', nargs='+', choices=list(settings.SESSION_BACKENDS),
+                            default=list(settings.SESSION_BACKENDS))
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--logins', type=int, default=200, help="Logins per hasher and session backend.")
+        parser.add_argument('--users', type=int, default=50)
+
+    def handle(self, *args, **options):
+        hashers = options['hashers']
+        if 'argon2' in hashers and importlib.util.find_spec('argon2') is None:
+            self.stderr.write("Skipping argon2: the argon2-cffi package is not installed.")
+            hashers = [name for name in hashers if name != 'argon2']
+        if not hashers:
+            raise CommandError("No password hasher to benchmark.")
+
+        # A file database, since concurrent writers on a shared in-memory SQLite database fail with "table is locked".
+        old_name = connection.settings_dict['NAME']
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark_login.sqlite3')
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                with override_settings(ALLOWED_HOSTS=['testserver']):
+                    self.stdout.write(f"workers={options['workers']} cpus={os.cpu_count()}")
+                    self.stdout.write("database: " + " ".join(f"{key}={value}" for key, value in database_profile().items()))
+                    for name in hashers:
+                        self.run_hasher(name, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_hasher(self, name, options):
+        chosen = settings.PASSWORD_HASHER_CHOICES[name]
+        ordered = [chosen] + [path for path in settings.PASSWORD_HASHERS if path != chosen]
+        with override_settings(PASSWORD_HASHERS=ordered):
+            started = time.perf_counter()
+            encoded = make_password(PASSWORD)
+            hash_ms = (time.perf_counter() - started) * 1000
+
+            # One hash shared by every account: only verification cost matters here.
+            User.objects.all().delete()
+            usernames = [f"bench_login_{i}" for i in range(options['users'])]
+            User.objects.bulk_create_with_role(
+                [{'username': username, 'email': f"{username}@example.com"} for username in usernames]
+            )
+            User.objects.update(password=encoded)
+
+            for session in options['sessions']:
+                with override_settings(SESSION_ENGINE=settings.SESSION_BACKENDS[session]):
+                    rate, samples = self.run(usernames, options['workers'], options['logins'])
+                stats = summarize(samples)
+                self.stdout.write(
+                    f"hasher={name:<7} session={session:<15} hash={hash_ms:>7.1f} ms  "
+                    f"logins={rate:>8,.1f}/s  p50={stats['p50_ms']:>8.1f} ms  p95={stats['p95_ms']:>8.1f} ms"
+                )
+
+    def run(self, usernames, workers, logins):
+        """
+        Spreads `logins` login + profile page round trips over the workers.
+        Returns the logins per second and the latency of each login.
+        """
+        login_url, profile_url = reverse('login'), reverse('user_detail')
+
+        def worker(index):
+            samples = []
+            client = Client()
+            try:
+                for i in range(index, logins, workers):
+                    client.cookies.clear()
+                    started = time.perf_counter()
+                    response = client.post(login_url, {'username': usernames[i % len(usernames)], 'password': PASSWORD})
+                    samples.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 302 or client.get(profile_url).status_code != 200:
+                        raise CommandError("Login failed.")
+            finally:
+                connection.close()
+            return samples
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            samples = [sample for chunk in pool.map(worker, range(workers)) for sample in chunk]
+        return logins / (time.perf_counter() - started), samples
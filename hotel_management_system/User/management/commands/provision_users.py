@@ -0,0 +1,73 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from User.models import CUSTOMER_GROUP, HOTEL_OWNER_GROUP, User
+
+ROLES = {'customer': CUSTOMER_GROUP, 'hotel_owner': HOTEL_OWNER_GROUP, 'none': None}
+FIELDS = ('username', 'email', 'phone_number', 'first_name', 'last_name', 'password')
+
+class Command(BaseCommand):
+    help = (
+        "Creates user accounts in bulk from a CSV file (columns: username, email and optionally "
+        "phone_number, first_name, last_name, password) through the same path as registration. "
+        "Rows without a password get an unusable one; existing usernames and emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--role', choices=list(ROLES), default='none', help="Role of the new accounts.")
+        parser.add_argument('--staff', action='store_true', help="Give the accounts access to the admin site.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        role = ROLES[options['role']]
+        batch_size = options['batch_size']
+
+        rows = created = 0
+        batch = []
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as handle:
+                for row in csv.DictReader(handle):
+                    rows += 1
+                    fields = {field: row[field].strip() for field in FIELDS if (row.get(field) or '').strip()}
+                    if 'username' not in fields or 'email' not in fields:
+                        self.stderr.write(f"Row {rows}: username and email are required.")
+                        continue
+                    fields['email'] = User.objects.normalize_email(fields['email'])
+                    fields['is_staff'] = options['staff']
+                    batch.append(fields)
+                    if len(batch) >= batch_size:
+                        created += self.provision(batch, role)
+                        batch = []
+        except OSError as exc:
+            raise CommandError(exc)
+        created += self.provision(batch, role)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} users ({rows - created} rows skipped)."))
+
+    def provision(self, batch, role):
+        """
+        Creates the accounts of a batch whose username, email and phone number are free,
+        with one query to find the taken ones. Returns the number of created users.
+        """
+        if not batch:
+            return 0
+        unique_fields = ('username', 'email', 'phone_number')
+        lookups = Q()
+        for field in unique_fields:
+            values = [fields[field] for fields in batch if field in fields]
+            if values:
+                lookups |= Q(**{f'{field}__in': values})
+        taken = {
+            (field, value)
+            for existing in User.objects.filter(lookups).values_list(*unique_fields)
+            for field, value in zip(unique_fields, existing) if value
+        }
+
+        new = []
+        for fields in batch:
+            keys = {(field, fields[field]) for field in unique_fields if field in fields}
+            if taken.isdisjoint(keys):
+                taken.update(keys)
+                new.append(fields)
+        return len(User.objects.bulk_create_with_role(new, role))
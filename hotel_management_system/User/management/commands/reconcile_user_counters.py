@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from Booking.models import Booking
+from Hotel.models import Hotel
+from User.models import User
+
+def count_of(queryset, **filters):
+    """
+    Correlated COUNT(*) of the rows of queryset that belong to the outer user.
+    """
+    counted = queryset.filter(**filters).order_by().values(*filters).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized booking and hotel counters of every user in a single UPDATE."
+
+    def handle(self, *args, **options):
+        updated = User.objects.update(
+            total_bookings=count_of(Booking.objects, customer=OuterRef('pk')),
+            confirmed_bookings=count_of(Booking.objects.filter(status=Booking.CONFIRMED), customer=OuterRef('pk')),
+            hotels_owned=count_of(Hotel.objects, owner=OuterRef('pk')),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled the counters of {updated} users."))
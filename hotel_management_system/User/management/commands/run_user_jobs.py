@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from User.models import UserBulkJob
+
+class Command(BaseCommand):
+    help = (
+        "Runs or resumes the pending and interrupted user bulk jobs started from the admin, "
+        "in primary key chunks with a pause between them so booking traffic is not starved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', help="Only these job ids (repeatable).")
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--pause', type=float, default=0.05, help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        jobs = UserBulkJob.objects.exclude(status=UserBulkJob.DONE).order_by('pk')
+        if options['job']:
+            jobs = jobs.filter(pk__in=options['job'])
+
+        def progress(job):
+            self.stdout.write(f"Job {job.pk}: {job.processed}/{job.total}")
+
+        failed = 0
+        for job in jobs:
+            self.stdout.write(f"Job {job.pk}: {job}")
+            try:
+                job.run(chunk_size=options['chunk_size'], pause=options['pause'], progress=progress)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Job {job.pk} failed: {exc}")
+        if failed:
+            raise CommandError(f"{failed} jobs failed; fix the cause and run the command again to resume them.")
+        self.stdout.write(self.style.SUCCESS("User bulk jobs done."))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from User.models import ROLE_GROUPS, User, get_role_group_id
+
+class Command(BaseCommand):
+    help = "Re-syncs the role groups (hotel_owner, customer) of every user in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        membership = User.groups.through
+        batch_size = options['batch_size']
+
+        for name, members in ROLE_GROUPS.items():
+            with transaction.atomic():
+                group_id = get_role_group_id(name)
+                users = User.objects.filter(members)
+                removed, _ = membership.objects.filter(group_id=group_id).exclude(
+                    user_id__in=users.values('pk')
+                ).delete()
+
+                added = 0
+                missing = users.exclude(groups=group_id).order_by().values_list('pk', flat=True)
+                batch = []
+                for user_id in missing.iterator(chunk_size=batch_size):
+                    batch.append(membership(user_id=user_id, group_id=group_id))
+                    if len(batch) >= batch_size:
+                        added += len(membership.objects.bulk_create(batch, ignore_conflicts=True))
+                        batch = []
+                added += len(membership.objects.bulk_create(batch, ignore_conflicts=True))
+
+            self.stdout.write(f"{name}: {added} added, {removed} removed.")
+        self.stdout.write(self.style.SUCCESS("Role groups synced."))
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:11
+
+import User.models
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_counters(apps, schema_editor):
+    """
+    Fills the new counters of the existing users.
+    """
+    User = apps.get_model('User', 'User')
+    Booking = apps.get_model('Booking', 'Booking')
+    Hotel = apps.get_model('Hotel', 'Hotel')
+
+    def count_of(queryset, **filters):
+        counted = queryset.filter(**filters).order_by().values(*filters).annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+    User.objects.update(
+        total_bookings=count_of(Booking.objects, customer=OuterRef('pk')),
+        confirmed_bookings=count_of(Booking.objects.filter(status='confirmed'), customer=OuterRef('pk')),
+        hotels_owned=count_of(Hotel.objects, owner=OuterRef('pk')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0001_initial'),
+        ('Booking', '0001_initial'),
+        ('Hotel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', User.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='confirmed_bookings',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='hotels_owned',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='total_bookings',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_counters, migrations.RunPython.noop),
+    ]
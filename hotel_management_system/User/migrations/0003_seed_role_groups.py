@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:02
+
+from django.db import migrations
+
+
+ROLE_GROUPS = ('hotel_owner', 'customer')
+
+
+def seed_role_groups(apps, schema_editor):
+    """
+    Creates the role groups so registration never has to create them.
+    """
+    Group = apps.get_model('auth', 'Group')
+    existing = set(Group.objects.filter(name__in=ROLE_GROUPS).values_list('name', flat=True))
+    Group.objects.bulk_create([Group(name=name) for name in ROLE_GROUPS if name not in existing])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0002_user_counters'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_role_groups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0003_seed_role_groups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBulkJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('activate', 'Activate'), ('deactivate', 'Deactivate'), ('make_customer', 'Make customer'), ('make_hotel_owner', 'Make hotel owner'), ('delete', 'Delete (with their bookings and hotels)')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('user_ids', models.JSONField(default=list, editable=False, help_text='Selected user ids, sorted.')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('last_pk', models.BigIntegerField(default=0, help_text='Last user id of the last committed chunk.')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User bulk job',
+                'verbose_name_plural': 'User bulk jobs',
+            },
+        ),
+    ]
@@ -1,8 +1,155 @@
-from django.db import models
-from django.contrib.auth.models import AbstractUser, Group, Permission
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.contrib.auth.models import AbstractUser, Group, Permission, UserManager as BaseUserManager
 from django.core.exceptions import ValidationError
 import re
 
+HOTEL_OWNER_GROUP = 'hotel_owner'
+CUSTOMER_GROUP = 'customer'
+
+# Users that belong to each role group.
+ROLE_GROUPS = {
+    HOTEL_OWNER_GROUP: Q(is_hotel_owner=True),
+    CUSTOMER_GROUP: Q(is_hotel_owner=False, is_customer=True),
+}
+ROLE_FIELDS = ('is_hotel_owner', 'is_customer')
+
+# Role flags set for each role group (None: neither owner nor customer, e.g. staff accounts).
+ROLE_FLAGS = {
+    HOTEL_OWNER_GROUP: {'is_hotel_owner': True, 'is_customer': False},
+    CUSTOMER_GROUP: {'is_hotel_owner': False, 'is_customer': True},
+    None: {'is_hotel_owner': False, 'is_customer': False},
+}
+
+_UNKNOWN_ROLE = object()
+_role_group_ids = {}
+
+def get_role_group_id(name):
+    """
+    Returns the id of a role group, creating the group if needed.
+    Ids are cached in-process once the group is known to be committed.
+    """
+    if name not in _role_group_ids:
+        group, _ = Group.objects.get_or_create(name=name)
+        transaction.on_commit(lambda: _role_group_ids.setdefault(name, group.pk))
+        return group.pk
+    return _role_group_ids[name]
+
+def clear_role_group_cache(**kwargs):
+    """
+    Forgets the cached role group ids (connected to Group changes).
+    """
+    _role_group_ids.clear()
+
+class UserQuerySet(models.QuerySet):
+    def search(self, term):
+        """
+        Finds users by exact email or phone number, or by username prefix,
+        so each search is a lookup on one of the unique indexes.
+        """
+        term = (term or '').strip()
+        if not term:
+            return self
+        if '@' in term:
+            return self.filter(email=BaseUserManager.normalize_email(term))
+        if term.isdigit():
+            return self.filter(phone_number=term)
+        return self.filter(username__startswith=term)
+
+    def page(self, after=None, size=50):
+        """
+        Returns one page ordered by username and the username to continue after, or None on the last page.
+        Keyset pagination on the unique username index, so deep pages cost the same as the first one.
+        """
+        queryset = self.order_by('username')
+        if after:
+            queryset = queryset.filter(username__gt=after)
+        users = list(queryset[:size + 1])
+        if len(users) <= size:
+            return users, None
+        users = users[:size]
+        return users, users[-1].username
+
+    def set_role(self, role):
+        """
+        Gives every user of the queryset the given role, with one update for the flags
+        and one delete plus one insert for the role group memberships.
+        """
+        user_ids = list(self.values_list('pk', flat=True))
+        self.model.objects.filter(pk__in=user_ids).update(**ROLE_FLAGS[role])
+        membership = self.model.groups.through
+        membership.objects.filter(
+            user_id__in=user_ids, group_id__in=[get_role_group_id(name) for name in ROLE_GROUPS]
+        ).delete()
+        if role:
+            group_id = get_role_group_id(role)
+            membership.objects.bulk_create([membership(user_id=pk, group_id=group_id) for pk in user_ids])
+        return len(user_ids)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    def build_with_role(self, username, email, password=None, role=CUSTOMER_GROUP, **extra_fields):
+        """
+        Returns an unsaved user with the flags of the given role.
+        Without a password the account gets an unusable one (e.g. to be set through a reset link).
+        """
+        if role not in ROLE_FLAGS:
+            raise ValueError(f"Unknown role: {role}")
+        user = self.model(
+            username=self.model.normalize_username(username),
+            email=self.normalize_email(email),
+            **ROLE_FLAGS[role],
+            **extra_fields,
+        )
+        user.set_password(password)
+        return user
+
+    def create_with_role(self, username, email, password=None, role=CUSTOMER_GROUP, **extra_fields):
+        """
+        Creates a user and their role group membership in one transaction:
+        one insert for the user and one for the membership once the group id is cached.
+        """
+        user = self.build_with_role(username, email, password, role, **extra_fields)
+        with transaction.atomic(using=self.db):
+            user.save(using=self.db)
+        return user
+
+    def bulk_create_with_role(self, users, role=CUSTOMER_GROUP, batch_size=1000):
+        """
+        Creates many users of one role ({field: value} dicts accepted by build_with_role)
+        with chunked bulk inserts for the users and their role group memberships.
+        """
+        built = [self.build_with_role(role=role, **fields) for fields in users]
+        membership = self.model.groups.through
+        with transaction.atomic(using=self.db):
+            created = self.bulk_create(built, batch_size=batch_size)
+            if role:
+                group_id = get_role_group_id(role)
+                membership.objects.using(self.db).bulk_create(
+                    [membership(user_id=user.pk, group_id=group_id) for user in created], batch_size=batch_size
+                )
+        for user in created:
+            user._loaded_role = role
+        return created
+
+    def adjust_counter(self, field, deltas):
+        """
+        Adds the given deltas ({user_id: delta}) to a counter field,
+        with one update per distinct delta instead of one per user.
+        """
+        users_by_delta = defaultdict(list)
+        for user_id, delta in deltas.items():
+            if delta:
+                users_by_delta[delta].append(user_id)
+        for delta, user_ids in users_by_delta.items():
+            self.filter(pk__in=user_ids).update(**{field: F(field) + delta})
+
+
 class User(AbstractUser):
     # Fields
     email = models.EmailField(unique=True)
@@ -10,6 +157,11 @@ class User(AbstractUser):
     is_hotel_owner = models.BooleanField(default=False)
     is_customer = models.BooleanField(default=True)
 
+    # Denormalized counters, kept up to date by the Booking and Hotel signal receivers
+    total_bookings = models.PositiveIntegerField(default=0, editable=False)
+    confirmed_bookings = models.PositiveIntegerField(default=0, editable=False)
+    hotels_owned = models.PositiveIntegerField(default=0, editable=False)
+
     groups = models.ManyToManyField(
         Group,
         related_name="custom_user_groups",
@@ -28,6 +180,10 @@ class User(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
 
+    objects = UserManager()
+
+    _loaded_role = _UNKNOWN_ROLE
+
     # Methods
     def __str__(self):
         """
@@ -35,6 +191,16 @@ class User(AbstractUser):
         """
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the role loaded from the database to detect role changes on save.
+        """
+        user = super().from_db(db, field_names, values)
+        if all(field in user.__dict__ for field in ROLE_FIELDS):
+            user._loaded_role = user.get_role_group()
+        return user
+
     def get_full_name(self):
         """
         Returns the user's full name.
@@ -48,19 +214,19 @@ class User(AbstractUser):
         """
         Returns True if the user has any bookings.
         """
-        return self.bookings.exists()
+        return self.total_bookings > 0
 
     def get_total_bookings(self):
         """
         Returns the total number of bookings the user has made.
         """
-        return self.bookings.count()
+        return self.total_bookings
 
     def is_active_customer(self):
         """
         Returns True if the user is a customer and has active bookings.
         """
-        return self.is_customer and self.bookings.filter(status='confirmed').exists()
+        return self.is_customer and self.confirmed_bookings > 0
 
     def get_hotels_owned(self):
         """
@@ -72,7 +238,7 @@ class User(AbstractUser):
         """
         Returns the total number of hotels the user owns.
         """
-        return self.hotels.count()
+        return self.hotels_owned
     
     def clean(self):
         """Validations to ensure data consistency."""
@@ -86,18 +252,189 @@ class User(AbstractUser):
         if self.is_hotel_owner and self.is_customer:
             raise ValidationError("A user cannot be both a hotel owner and a customer at the same time.")
 
+    def get_role_group(self):
+        """
+        Returns the name of the group matching the user's role, or None.
+        """
+        if self.is_hotel_owner:
+            return HOTEL_OWNER_GROUP
+        if self.is_customer:
+            return CUSTOMER_GROUP
+        return None
+
+    def sync_role_groups(self, created=False):
+        """
+        Puts the user in the group of their role and takes them out of the other role groups.
+        """
+        role = self.get_role_group()
+        membership = User.groups.through
+        if not created:
+            membership.objects.filter(
+                user_id=self.pk, group__name__in=[name for name in ROLE_GROUPS if name != role]
+            ).delete()
+        if role:
+            membership.objects.bulk_create(
+                [membership(user_id=self.pk, group_id=get_role_group_id(role))], ignore_conflicts=True
+            )
+
     def save(self, *args, **kwargs):
         """
         Override save method to enforce business rules.
-        Automatically assign users to their respective groups based on their role.
+        Automatically assign users to their respective groups based on their role,
+        only when the user is created or the role actually changes.
         """
+        created = self._state.adding
+        update_fields = kwargs.get('update_fields')
         super().save(*args, **kwargs)
 
-        self.groups.clear()
+        if update_fields is not None and not set(ROLE_FIELDS) & set(update_fields):
+            return
+        role = self.get_role_group()
+        if created or role != self._loaded_role:
+            self.sync_role_groups(created=created)
+        self._loaded_role = role
 
-        if self.is_hotel_owner:
-            group, _ = Group.objects.get_or_create(name='hotel_owner')
-            self.groups.add(group)
-        elif self.is_customer:
-            group, _ = Group.objects.get_or_create(name='customer')
-            self.groups.add(group)
\ No newline at end of file
+
+class UserBulkJob(models.Model):
+    """
+    A bulk admin action over many users, applied in primary key chunks.
+    Each chunk runs in its own short transaction together with the progress update,
+    so an interrupted job resumes exactly after the last committed chunk.
+    """
+    ACTIVATE = 'activate'
+    DEACTIVATE = 'deactivate'
+    MAKE_CUSTOMER = 'make_customer'
+    MAKE_HOTEL_OWNER = 'make_hotel_owner'
+    DELETE = 'delete'
+
+    ACTION_CHOICES = [
+        (ACTIVATE, 'Activate'),
+        (DEACTIVATE, 'Deactivate'),
+        (MAKE_CUSTOMER, 'Make customer'),
+        (MAKE_HOTEL_OWNER, 'Make hotel owner'),
+        (DELETE, 'Delete (with their bookings and hotels)'),
+    ]
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Bookings canceled per statement when deleting users
+    BOOKING_BATCH_SIZE = 500
+
+    # Fields
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    user_ids = models.JSONField(default=list, editable=False, help_text="Selected user ids, sorted.")
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    last_pk = models.BigIntegerField(default=0, help_text="Last user id of the last committed chunk.")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    #Metadata
+    class Meta:
+        verbose_name = "User bulk job"
+        verbose_name_plural = "User bulk jobs"
+
+    #Methods
+    def __str__(self):
+        return f"{self.get_action_display()} {self.total} users ({self.get_status_display()})"
+
+    @classmethod
+    def start(cls, action, users, created_by=None):
+        """
+        Records a job for the users of a queryset. Only their ids are kept, so the
+        selection does not change if the job is resumed later.
+        """
+        user_ids = list(users.order_by('pk').values_list('pk', flat=True))
+        return cls.objects.create(action=action, user_ids=user_ids, total=len(user_ids), created_by=created_by)
+
+    def apply(self, user_ids):
+        """
+        Applies the action to one chunk of users.
+        """
+        users = User.objects.filter(pk__in=user_ids)
+        if self.action == self.ACTIVATE:
+            users.update(is_active=True)
+        elif self.action == self.DEACTIVATE:
+            users.update(is_active=False)
+        elif self.action == self.MAKE_CUSTOMER:
+            users.set_role(CUSTOMER_GROUP)
+        elif self.action == self.MAKE_HOTEL_OWNER:
+            users.set_role(HOTEL_OWNER_GROUP)
+        elif self.action == self.DELETE:
+            self.delete_users(user_ids)
+
+    def delete_users(self, user_ids):
+        """
+        Deletes users with their hotels and bookings. The bookings that still hold rooms (theirs, and
+        the ones of other customers at their hotels) are first canceled in pk batches through
+        BookingQuerySet.cancel, which releases the rooms and fixes the customer counters in bulk
+        instead of leaving them to the cascade.
+        """
+        Booking = apps.get_model('Booking', 'Booking')
+        Hotel = apps.get_model('Hotel', 'Hotel')
+        holding = Booking.objects.filter(
+            Q(customer_id__in=user_ids) | Q(hotel__owner_id__in=user_ids), status__in=Booking.HOLDS_INVENTORY
+        ).order_by('pk')
+        last_pk = 0
+        while True:
+            pks = list(holding.filter(pk__gt=last_pk).values_list('pk', flat=True)[:self.BOOKING_BATCH_SIZE])
+            if not pks:
+                break
+            Booking.objects.filter(pk__in=pks).cancel()
+            last_pk = pks[-1]
+        Hotel.objects.filter(owner_id__in=user_ids).delete()
+        User.objects.filter(pk__in=user_ids).delete()
+
+    def run(self, chunk_size=500, pause=0.05, deadline=None, progress=None):
+        """
+        Processes the remaining users in chunks of `chunk_size` ids, sleeping `pause` seconds
+        between chunks so concurrent writers (bookings, logins) get the database in between.
+        Stops early at `deadline` (a time.monotonic() value) and calls progress(job) after each chunk.
+        Returns True once the job is done.
+        """
+        self.status = self.RUNNING
+        self.save(update_fields=['status', 'updated_at'])
+        try:
+            start = bisect_right(self.user_ids, self.last_pk)
+            for offset in range(start, len(self.user_ids), chunk_size):
+                chunk = self.user_ids[offset:offset + chunk_size]
+                with transaction.atomic():
+                    # Lock the job row: a second runner waits here and then finds the chunk already done.
+                    last_pk = UserBulkJob.objects.select_for_update().values_list('last_pk', flat=True).get(pk=self.pk)
+                    if last_pk != self.last_pk:
+                        self.refresh_from_db()
+                        return self.status == self.DONE
+                    self.apply(chunk)
+                    self.processed = offset + len(chunk)
+                    self.last_pk = chunk[-1]
+                    self.save(update_fields=['processed', 'last_pk', 'updated_at'])
+                if progress:
+                    progress(self)
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                if pause:
+                    time.sleep(pause)
+        except Exception as exc:
+            self.status = self.FAILED
+            self.error = str(exc)
+            self.save(update_fields=['status', 'error', 'updated_at'])
+            raise
+
+        self.status = self.DONE
+        self.save(update_fields=['status', 'updated_at'])
+        return True
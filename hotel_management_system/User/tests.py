@@ -1,8 +1,21 @@
-from django.test import TestCase
-from django.contrib.auth.models import Group
-from .models import User
+import csv
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import Group, update_last_login
+from Booking.models import Booking
+from Booking.services import create_booking
+from Hotel.models import Hotel, RoomInventory
+from .models import User, UserBulkJob, clear_role_group_cache
 from .forms import CustomUserCreationForm
 from django.core.exceptions import ValidationError
+from hotel_management_system.testing import ChangelistQueryCountMixin
 
 class UserModelTest(TestCase):
 
@@ -128,4 +141,334 @@ class UserFormTest(TestCase):
         )
 
         self.assertTrue(user.groups.filter(name="customer").exists())
-        self.assertFalse(user.groups.filter(name="hotel_owner").exists())
\ No newline at end of file
+        self.assertFalse(user.groups.filter(name="hotel_owner").exists())
+
+
+class UserAdminTest(ChangelistQueryCountMixin, TestCase):
+
+    def test_changelist_query_count(self):
+        """Verifica que el listado de usuarios no haga una consulta de grupos por fila"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+
+        def add_rows(count):
+            start = User.objects.count()
+            for i in range(start, start + count):
+                User.objects.create_user(username=f"user_{i}", email=f"user_{i}@example.com")
+
+        self.assertChangelistQueriesConstant(User, add_rows, superuser)
+
+
+
+class UserGroupSyncTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        clear_role_group_cache()
+        self.user = User.objects.create_user(
+            username="customer", email="customer@example.com", password="securepassword"
+        )
+
+    def group_names(self, user):
+        return sorted(user.groups.values_list("name", flat=True))
+
+    def test_profile_edit_does_not_touch_groups(self):
+        """Verifica que editar el perfil no vuelva a sincronizar los grupos"""
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = "Ana"
+        with self.assertNumQueries(1):
+            user.save()
+        self.assertEqual(self.group_names(user), ["customer"])
+
+    def test_login_does_not_touch_groups(self):
+        """Verifica que actualizar last_login al iniciar sesión no sincronice los grupos"""
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            update_last_login(None, user)
+        self.assertEqual(self.group_names(user), ["customer"])
+
+    def test_role_change_switches_groups(self):
+        """Verifica que cambiar el rol cambie el grupo"""
+        user = User.objects.get(pk=self.user.pk)
+        user.is_hotel_owner = True
+        user.is_customer = False
+        user.save()
+        self.assertEqual(self.group_names(user), ["hotel_owner"])
+
+    def test_sync_command(self):
+        """Verifica la resincronización masiva de grupos"""
+        User.groups.through.objects.all().delete()
+        owner = User.objects.create_user(username="owner", email="owner@example.com", is_hotel_owner=True)
+        owner.groups.clear()
+        owner.groups.add(Group.objects.get(name="customer"))
+
+        call_command("sync_user_groups", stdout=StringIO())
+        self.assertEqual(self.group_names(self.user), ["customer"])
+        self.assertEqual(self.group_names(owner), ["hotel_owner"])
+
+
+
+class UserListViewTest(TestCase):
+
+    def test_list_has_no_per_row_queries(self):
+        """Verifica que el listado de usuarios no haga consultas por fila"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(superuser)
+
+        def render_queries():
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(self.client.get(reverse("user_list")).status_code, 200)
+            return len(context)
+
+        User.objects.create_user(username="user_0", email="user_0@example.com")
+        few = render_queries()
+        for i in range(1, 20):
+            User.objects.create_user(username=f"user_{i}", email=f"user_{i}@example.com")
+        self.assertEqual(render_queries(), few)
+
+    def test_keyset_pages_and_search(self):
+        """Verifica la paginación por username, la búsqueda y que no se lean las contraseñas"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(superuser)
+        User.objects.bulk_create_with_role([
+            {"username": f"user_{i:02}", "email": f"user_{i:02}@example.com", "phone_number": f"09900000{i:02}"}
+            for i in range(55)
+        ])
+
+        with CaptureQueriesContext(connection) as context:
+            first = self.client.get(reverse("user_list"))
+        listing = [query["sql"] for query in context if "LIMIT 51" in query["sql"]]
+        second = self.client.get(reverse("user_list"), {"after": first.context["next_after"]})
+        self.assertEqual(len(first.context["users"]), 50)
+        self.assertEqual(first.context["next_after"], "user_48")
+        self.assertEqual([user.username for user in second.context["users"]], ["user_49", "user_50", "user_51", "user_52", "user_53", "user_54"])
+        self.assertIsNone(second.context["next_after"])
+        self.assertEqual(len(listing), 1)
+        self.assertNotIn("password", listing[0])
+
+        for term, expected in [("user_03@example.com", ["user_03"]), ("0990000001", ["user_01"]), ("user_1", 10)]:
+            users = self.client.get(reverse("user_list"), {"q": term}).context["users"]
+            if isinstance(expected, int):
+                self.assertEqual(len(users), expected)
+            else:
+                self.assertEqual([user.username for user in users], expected)
+
+    def test_csv_export(self):
+        """Verifica la exportación en CSV por streaming"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        User.objects.create_user(username="customer", email="customer@example.com")
+        self.assertEqual(self.client.get(reverse("user_export")).status_code, 302)
+
+        self.client.force_login(superuser)
+        response = self.client.get(reverse("user_export"))
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:2], ["username", "email"])
+        self.assertEqual([row[0] for row in rows[1:]], ["admin", "customer"])
+
+        response = self.client.get(reverse("user_export"), {"q": "customer@example.com"})
+        self.assertEqual(len(b"".join(response.streaming_content).decode().splitlines()), 2)
+
+    def test_csv_export_neutralizes_formulas(self):
+        """Verifica que las celdas que una hoja de cálculo ejecutaría como fórmula se exporten como texto"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        User.objects.create_user(
+            username="customer", email="customer@example.com", first_name="=HYPERLINK(\"http://x\")", last_name="@SUM(A1)"
+        )
+        self.client.force_login(superuser)
+        response = self.client.get(reverse("user_export"), {"q": "customer@example.com"})
+        header, row = csv.reader(b"".join(response.streaming_content).decode().splitlines())
+        values = dict(zip(header, row))
+        self.assertEqual(values["first_name"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(values["last_name"], "'@SUM(A1)")
+        self.assertEqual(values["username"], "customer")
+
+
+class RegistrationTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        clear_role_group_cache()
+        self.form_data = {
+            "username": "new_user",
+            "email": "newuser@example.com",
+            "phone_number": "1234567890",
+            "is_hotel_owner": True,
+            "is_customer": False,
+            "password1": "TestPassword123",
+            "password2": "TestPassword123"
+        }
+
+    def test_roles_are_seeded(self):
+        """Verifica que la migración cree los grupos de roles"""
+        self.assertEqual(sorted(Group.objects.values_list("name", flat=True)), ["customer", "hotel_owner"])
+
+    def test_registration_queries(self):
+        """Verifica que el registro valide los campos únicos en una consulta y cree el usuario con su grupo"""
+        form = CustomUserCreationForm(data=self.form_data)
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(form.is_valid())
+        self.assertEqual(len(context), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = form.save()
+        self.assertTrue(user.check_password("TestPassword123"))
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["hotel_owner"])
+
+        # Con el id del grupo en caché solo se insertan el usuario y su grupo
+        form = CustomUserCreationForm(data={**self.form_data, "username": "other", "email": "other@example.com", "phone_number": ""})
+        self.assertTrue(form.is_valid())
+        with CaptureQueriesContext(connection) as context:
+            form.save()
+        self.assertEqual(len(context), 4)  # SAVEPOINT, INSERT del usuario y de su grupo, RELEASE
+
+    def test_taken_fields(self):
+        """Verifica que se informen todos los campos únicos ya registrados"""
+        User.objects.create_with_role("New_User", "newuser@example.com", phone_number="1234567890")
+        form = CustomUserCreationForm(data=self.form_data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(sorted(form.errors), ["email", "phone_number", "username"])
+
+    def test_register_view(self):
+        """Verifica el registro desde la vista"""
+        response = self.client.post(reverse("user_register"), self.form_data)
+        self.assertRedirects(response, reverse("login"), fetch_redirect_response=False)
+        self.assertTrue(User.objects.filter(username="new_user", groups__name="hotel_owner").exists())
+
+    def test_provision_command(self):
+        """Verifica la creación masiva de cuentas omitiendo las ya existentes"""
+        User.objects.create_with_role("taken", "taken@example.com")
+        path = self.enterContext(tempfile.TemporaryDirectory()) + "/staff.csv"
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write("username,email,first_name\n")
+            handle.write("staff_0,staff_0@example.com,Ana\n")
+            handle.write("staff_1,taken@example.com,Luis\n")
+            handle.write("staff_2,staff_2@example.com,\n")
+            handle.write("staff_2,staff_3@example.com,\n")
+
+        out = StringIO()
+        call_command("provision_users", path, "--role", "customer", "--staff", "--batch-size", "2", stdout=out, stderr=StringIO())
+        self.assertIn("Created 2 users (2 rows skipped)", out.getvalue())
+
+        staff = User.objects.filter(is_staff=True).order_by("username")
+        self.assertEqual([user.username for user in staff], ["staff_0", "staff_2"])
+        self.assertFalse(staff[0].has_usable_password())
+        self.assertEqual(User.objects.filter(groups__name="customer", is_staff=True).count(), 2)
+
+
+SCRYPT_FIRST = ["User.hashers.ScryptPasswordHasher", "User.hashers.PBKDF2PasswordHasher"]
+
+@override_settings(SCRYPT_WORK_FACTOR=2 ** 10, PBKDF2_ITERATIONS=1000)
+class LoginPerformanceTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.user = User.objects.create_user(
+            username="customer", email="customer@example.com", password="securepassword"
+        )
+
+    def login(self):
+        response = self.client.post(reverse("login"), {"username": "customer", "password": "securepassword"})
+        self.assertEqual(response.status_code, 302)
+        self.user.refresh_from_db()
+
+    def test_rehash_on_login(self):
+        """Verifica que al iniciar sesión se vuelva a cifrar la contraseña con el hasher preferido"""
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with self.settings(PASSWORD_HASHERS=SCRYPT_FIRST):
+            self.login()
+        self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+
+        # Cambiar el costo también vuelve a cifrar en el siguiente inicio de sesión
+        with self.settings(PASSWORD_HASHERS=SCRYPT_FIRST, SCRYPT_WORK_FACTOR=2 ** 11):
+            self.login()
+        self.assertTrue(self.user.password.startswith("scrypt$2048$"))
+
+    def test_lowering_scrypt_cost_keeps_logins(self):
+        """Verifica que bajar el costo de scrypt no rompa la verificación de los hashes más caros ya guardados"""
+        with self.settings(PASSWORD_HASHERS=SCRYPT_FIRST, SCRYPT_WORK_FACTOR=2 ** 14):
+            self.user.set_password("securepassword")
+            self.user.save()
+        with self.settings(PASSWORD_HASHERS=SCRYPT_FIRST):
+            self.login()
+        self.assertTrue(self.user.password.startswith("scrypt$1024$"))
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_signed_cookie_sessions(self):
+        """Verifica que las sesiones en cookies firmadas no escriban en la tabla de sesiones"""
+        self.login()
+        self.assertEqual(self.client.get(reverse("user_detail")).status_code, 200)
+        self.assertFalse(Session.objects.exists())
+
+
+class UserBulkJobTest(TestCase):
+
+    def setUp(self):
+        """Setup inicial para las pruebas"""
+        self.users = User.objects.bulk_create_with_role(
+            [{"username": f"user_{i}", "email": f"user_{i}@example.com"} for i in range(5)]
+        )
+
+    def start(self, action):
+        return UserBulkJob.start(action, User.objects.filter(username__startswith="user_"))
+
+    def test_chunks_and_resume(self):
+        """Verifica que el trabajo avance por bloques y se reanude donde quedó"""
+        job = self.start(UserBulkJob.DEACTIVATE)
+        self.assertFalse(job.run(chunk_size=2, pause=0, deadline=0))
+        job = UserBulkJob.objects.get(pk=job.pk)
+        self.assertEqual((job.status, job.processed), (UserBulkJob.RUNNING, 2))
+        self.assertEqual(User.objects.filter(is_active=False).count(), 2)
+
+        out = StringIO()
+        call_command("run_user_jobs", "--chunk-size", "2", "--pause", "0", stdout=out)
+        self.assertIn(f"Job {job.pk}: 5/5", out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, UserBulkJob.DONE)
+        self.assertEqual(User.objects.filter(is_active=False).count(), 5)
+
+    def test_change_role(self):
+        """Verifica el cambio de rol masivo con sus grupos"""
+        self.assertTrue(self.start(UserBulkJob.MAKE_HOTEL_OWNER).run(chunk_size=2, pause=0))
+        self.assertEqual(User.objects.filter(is_hotel_owner=True, is_customer=False).count(), 5)
+        self.assertEqual(
+            set(User.groups.through.objects.filter(user__in=self.users).values_list("group__name", flat=True)),
+            {"hotel_owner"},
+        )
+
+    def test_delete_cascades(self):
+        """Verifica que el borrado masivo elimine reservas y hoteles, liberando habitaciones y contadores"""
+        hotels = {}
+        for username in ("user_owner", "owner"):
+            owner = User.objects.create_user(
+                username=username, email=f"{username}@example.com", is_hotel_owner=True, is_customer=False
+            )
+            hotels[username] = Hotel.objects.create(
+                name=f"Hotel {username}", address="Centro", city="Quito", country="Ecuador",
+                owner=owner, total_rooms=2, available_rooms=2, price_night=50
+            )
+        customer = User.objects.create_user(username="customer", email="customer@example.com")
+        check_in = date(2030, 1, 10)
+        RoomInventory.objects.initialize(hotels.values(), start=check_in, days=5)
+        create_booking(self.users[0], hotels["owner"], check_in, check_in + timedelta(days=2))
+        create_booking(customer, hotels["user_owner"], check_in, check_in + timedelta(days=2)).confirm_booking()
+
+        self.assertTrue(self.start(UserBulkJob.DELETE).run(chunk_size=2, pause=0))
+        self.assertFalse(User.objects.filter(username__startswith="user_").exists())
+        self.assertEqual(list(Hotel.objects.values_list("name", flat=True)), ["Hotel owner"])
+        self.assertFalse(Booking.objects.exists())
+        # Las noches del hotel que sigue existiendo quedan libres
+        self.assertEqual(hotels["owner"].get_available_rooms(check_in, check_in + timedelta(days=2)), 2)
+        customer.refresh_from_db()
+        self.assertEqual((customer.total_bookings, customer.confirmed_bookings), (0, 0))
+
+    def test_admin_action(self):
+        """Verifica que la acción del admin cree y complete el trabajo"""
+        superuser = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(superuser)
+        response = self.client.post(reverse("admin:User_user_changelist"), {
+            "action": "deactivate_users", "_selected_action": [user.pk for user in self.users],
+        })
+        self.assertEqual(response.status_code, 302)
+        job = UserBulkJob.objects.get()
+        self.assertEqual((job.status, job.processed, job.created_by), (UserBulkJob.DONE, 5, superuser))
+        self.assertFalse(User.objects.filter(pk__in=[user.pk for user in self.users], is_active=True).exists())
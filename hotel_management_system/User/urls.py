@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import (UserDetailView, UserListView, UserRegisterView, UserUpdateView, CustomLoginView)
+from .views import (UserDetailView, UserExportView, UserListView, UserRegisterView, UserUpdateView, CustomLoginView)
 from django.contrib.auth.views import LogoutView
 
 urlpatterns = [
@@ -9,6 +9,7 @@ urlpatterns = [
     
     # User routes
     path('', UserListView.as_view(), name= "user_list"),
+    path('export/', UserExportView.as_view(), name= "user_export"),
     path('profile/', UserDetailView.as_view(), name= "user_detail"),
     path('edit-profile/', UserUpdateView.as_view(), name= "user_edit"),
     path('register/', UserRegisterView.as_view(), name= "user_register"),
@@ -1,21 +1,86 @@
+import csv
+from itertools import chain
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import StreamingHttpResponse
+from django.views import View
 from django.views.generic import ListView, DetailView, UpdateView, CreateView
 from django.contrib.auth.views import LoginView
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.contrib.auth import login
+from django.db import IntegrityError
 from .models import User
 from .forms import CustomUserCreationForm
 
-class UserListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
-    model= User
-    template_name= "users/list.html"
-    context_object_name= "users"
+class SuperuserRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
 
     def test_func(self):
         """"""
         return self.request.user.is_superuser
-    
+
+
+class UserListView(SuperuserRequiredMixin, ListView):
+    model= User
+    template_name= "users/list.html"
+    context_object_name= "users"
+    page_size = 50
+    # Only the columns the template shows (no password hashes)
+    columns = ('pk', 'username', 'email', 'total_bookings', 'hotels_owned')
+
+    def get_queryset(self):
+        users = User.objects.search(self.request.GET.get('q')).only(*self.columns)
+        users, self.next_after = users.page(self.request.GET.get('after'), self.page_size)
+        return users
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(next_after=self.next_after, q=self.request.GET.get('q', ''))
+        return context
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: write() hands back the line instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+# Leading characters that make spreadsheets read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_safe(value):
+    """
+    Quotes a text cell that a spreadsheet would run as a formula (CSV injection) with a leading apostrophe.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class UserExportView(SuperuserRequiredMixin, View):
+    chunk_size = 2000
+    columns = (
+        'username', 'email', 'phone_number', 'first_name', 'last_name', 'is_hotel_owner', 'is_customer',
+        'is_active', 'date_joined', 'total_bookings', 'confirmed_bookings', 'hotels_owned',
+    )
+
+    def get(self, request):
+        """
+        Streams every user (or the ones matching `q`) as CSV, reading the table in chunks
+        so memory stays flat whatever the number of accounts.
+        """
+        rows = (
+            User.objects.search(request.GET.get('q')).order_by('pk')
+            .values_list(*self.columns).iterator(chunk_size=self.chunk_size)
+        )
+        writer = csv.writer(Echo())
+        lines = chain([writer.writerow(self.columns)], (writer.writerow(map(csv_safe, row)) for row in rows))
+        return StreamingHttpResponse(
+            lines, content_type="text/csv", headers={'Content-Disposition': 'attachment; filename="users.csv"'}
+        )
+
+
 class UserDetailView(LoginRequiredMixin, DetailView):
     model= User
     template_name= "users/detail.html"
@@ -37,6 +102,16 @@ class UserRegisterView(CreateView):
     template_name= "users/register.html"
     success_url = reverse_lazy('login')
 
+    def form_valid(self, form):
+        try:
+            return super().form_valid(form)
+        except IntegrityError:
+            # A concurrent registration took the username, email or phone number after validation.
+            form.validate_unique()
+            if not form.errors:
+                form.add_error(None, "This account already exists.")
+            return self.form_invalid(form)
+
 class CustomLoginView(LoginView):
     def form_valid(self, form):
         user = form.get_user()
@@ -0,0 +1,97 @@
+"""
+Small timing helpers shared by the benchmark management commands.
+"""
+
+import time
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database():
+    """
+    Runs the block against a freshly created test database and destroys it afterwards,
+    so the rows a benchmark seeds never reach the configured database.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def percentile(samples, pct):
+    """
+    Returns the pct-th percentile (nearest rank) of a list of samples.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def measure(func, repeat):
+    """
+    Calls func `repeat` times and returns the latency of each call in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def measure_queries(func, repeat):
+    """
+    Like measure, but also counts the queries of each call.
+    Returns (latencies in milliseconds, query counts).
+    """
+    samples, queries = [], []
+    calls = [0]
+
+    def count(execute, sql, params, many, context):
+        calls[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        for _ in range(repeat):
+            calls[0] = 0
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+            queries.append(calls[0])
+    return samples, queries
+
+
+def summarize(samples):
+    """
+    Returns the count, mean and p50/p95/p99 latencies (ms) of a list of samples.
+    """
+    return {
+        'count': len(samples),
+        'mean_ms': round(sum(samples) / len(samples), 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+    }
+
+
+def database_profile():
+    """
+    Describes the active database configuration, so benchmark results can be compared across profiles.
+    """
+    settings = connection.settings_dict
+    profile = {
+        'vendor': connection.vendor,
+        'conn_max_age': settings['CONN_MAX_AGE'],
+        'pool': bool(settings['OPTIONS'].get('pool')),
+    }
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                profile[pragma] = cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+        profile['transaction_mode'] = connection.transaction_mode
+    return profile
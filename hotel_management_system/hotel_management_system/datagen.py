@@ -0,0 +1,100 @@
+"""
+Realistic data generator for the benchmark suite.
+
+Users and hotels are loaded in bulk (with their counters and role groups fixed up afterwards),
+while bookings go through create_booking, so inventory, counters, rollups and the overlap guard
+behave as in production.
+"""
+
+import random
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.utils.timezone import now
+from Booking.models import Booking
+from Booking.services import OverlappingBooking, RoomsUnavailable, create_booking
+from Hotel.models import Amenity, Hotel, HotelAmenity, RateRule, RoomInventory
+from User.models import User
+
+CITIES = [
+    ("Quito", "Ecuador"), ("Guayaquil", "Ecuador"), ("Cuenca", "Ecuador"),
+    ("Lima", "Peru"), ("Cusco", "Peru"), ("Bogotá", "Colombia"), ("Santiago", "Chile"),
+]
+AMENITIES = ["wifi", "pool", "parking", "gym", "spa", "breakfast", "restaurant", "bar"]
+# Length of stay in nights and its relative frequency
+STAY_NIGHTS = [1, 2, 3, 4, 5, 7, 14]
+STAY_WEIGHTS = [30, 25, 18, 10, 8, 6, 3]
+
+
+def generate_dataset(users=1000, hotels=100, bookings=2000, days=90, confirmed=0.6, seed=42, password="benchmark"):
+    """
+    Creates `users` users (one in twenty owns hotels), `hotels` hotels with amenities, a weekend
+    rate rule and `days` nights of inventory, and tries `bookings` stays, confirming a share of them.
+    Every user gets `password`. Returns the owners, customers and hotels created.
+    """
+    rng = random.Random(seed)
+    today = now().date()
+    # Hashing is the slow part of creating users, and the hash does not need to be unique.
+    password_hash = make_password(password)
+
+    owner_count = max(1, users // 20)
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"bench_owner_{i}", email=f"bench_owner_{i}@example.com", password=password_hash,
+                is_hotel_owner=True, is_customer=False,
+            )
+            for i in range(owner_count)
+        ]
+        + [
+            User(username=f"bench_customer_{i}", email=f"bench_customer_{i}@example.com", password=password_hash)
+            for i in range(users - owner_count)
+        ],
+        batch_size=1000,
+    )
+    owners = list(User.objects.filter(username__startswith="bench_owner_").order_by('pk'))
+    customers = list(User.objects.filter(username__startswith="bench_customer_").order_by('pk'))
+    call_command('sync_user_groups', stdout=StringIO())
+
+    new_hotels = []
+    for i in range(hotels):
+        city, country = rng.choice(CITIES)
+        rooms = rng.choice([10, 20, 40, 80, 150])
+        new_hotels.append(Hotel(
+            name=f"Bench Hotel {i}", address=f"Calle {i}", city=city, country=country,
+            owner=rng.choice(owners), total_rooms=rooms, available_rooms=rooms,
+            price_night=Decimal(rng.randint(30, 400)),
+        ))
+    hotel_list = Hotel.objects.bulk_create(new_hotels, batch_size=1000)
+    User.objects.adjust_counter('hotels_owned', Counter(hotel.owner_id for hotel in hotel_list))
+
+    amenities = list(Amenity.objects.for_names(AMENITIES))
+    HotelAmenity.objects.bulk_create(
+        [
+            HotelAmenity(hotel=hotel, amenity=amenity)
+            for hotel in hotel_list
+            for amenity in rng.sample(amenities, rng.randint(1, len(amenities)))
+        ],
+        batch_size=2000,
+    )
+    RateRule.objects.bulk_create(
+        [RateRule(hotel=hotel, kind=RateRule.WEEKEND, multiplier=Decimal('1.20')) for hotel in hotel_list]
+    )
+    RoomInventory.objects.initialize(hotel_list, start=today, days=days)
+
+    created = []
+    for i in range(bookings):
+        check_in = today + timedelta(days=rng.randint(0, days - max(STAY_NIGHTS) - 1))
+        nights = rng.choices(STAY_NIGHTS, STAY_WEIGHTS)[0]
+        try:
+            created.append(create_booking(
+                customers[i % len(customers)], rng.choice(hotel_list), check_in, check_in + timedelta(days=nights)
+            ))
+        except (RoomsUnavailable, OverlappingBooking):
+            continue
+    Booking.objects.filter(pk__in=[booking.pk for booking in rng.sample(created, int(len(created) * confirmed))]).confirm()
+
+    return {'owners': owners, 'customers': customers, 'hotels': hotel_list}
@@ -0,0 +1,156 @@
+"""
+Per-request SQL and timing instrumentation.
+
+RequestProfilingMiddleware times a sample of the requests, counts their queries and database
+time through connection.execute_wrapper, flags queries repeated with different parameters
+(the N+1 pattern), and reports it all in a Server-Timing header and a structured log line.
+Per-route totals are kept in-process for the admin slow routes endpoint.
+
+With REQUEST_PROFILING_SAMPLE_RATE = 0 (the default) the middleware removes itself at startup.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+# Route key of the requests that match no URL pattern: keying them by path would let any
+# stream of random 404 URLs grow the per-route totals without bound
+UNRESOLVED_ROUTE = '<unresolved>'
+
+_routes = {}
+_routes_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """
+    execute_wrapper that counts queries, database time and repeated SQL templates.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.templates[sql] += 1
+
+    def duplicates(self, threshold):
+        """
+        Returns the number of extra executions of the SQL templates run at least `threshold` times.
+        """
+        return sum(runs - 1 for runs in self.templates.values() if runs >= threshold)
+
+
+class RequestProfilingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        self.slow_ms = settings.REQUEST_PROFILING_SLOW_MS
+        self.duplicate_threshold = settings.REQUEST_PROFILING_DUPLICATE_THRESHOLD
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates(self.duplicate_threshold)
+
+        match = request.resolver_match
+        route = match.route if match else UNRESOLVED_ROUTE
+        record_route(route, total_ms, recorder.count, db_ms, duplicates)
+
+        response['Server-Timing'] = (
+            f'total;dur={total_ms:.1f}, db;dur={db_ms:.1f};desc="{recorder.count} queries"'
+        )
+        level = logging.WARNING if duplicates or total_ms >= self.slow_ms else logging.INFO
+        logger.log(level, json.dumps({
+            'method': request.method,
+            'route': route,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'db_ms': round(db_ms, 1),
+            'queries': recorder.count,
+            'duplicate_queries': duplicates,
+        }))
+        return response
+
+
+def record_route(route, total_ms, queries, db_ms, duplicates):
+    """
+    Adds a profiled request to the in-process totals of its route.
+    """
+    with _routes_lock:
+        stats = _routes.setdefault(route, {
+            'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'queries': 0, 'db_ms': 0.0, 'duplicate_queries': 0,
+        })
+        stats['requests'] += 1
+        stats['total_ms'] += total_ms
+        stats['max_ms'] = max(stats['max_ms'], total_ms)
+        stats['queries'] += queries
+        stats['db_ms'] += db_ms
+        stats['duplicate_queries'] += duplicates
+
+
+def slowest_routes(limit=10):
+    """
+    Returns the routes with the highest mean latency, with their mean queries and database time.
+    """
+    with _routes_lock:
+        routes = [(route, dict(stats)) for route, stats in _routes.items()]
+    rows = [
+        {
+            'route': route,
+            'requests': stats['requests'],
+            'mean_ms': round(stats['total_ms'] / stats['requests'], 1),
+            'max_ms': round(stats['max_ms'], 1),
+            'mean_queries': round(stats['queries'] / stats['requests'], 1),
+            'mean_db_ms': round(stats['db_ms'] / stats['requests'], 1),
+            'duplicate_queries': stats['duplicate_queries'],
+        }
+        for route, stats in routes
+    ]
+    return sorted(rows, key=lambda row: row['mean_ms'], reverse=True)[:limit]
+
+
+def reset_routes():
+    """
+    Clears the per-route totals.
+    """
+    with _routes_lock:
+        _routes.clear()
+
+
+@staff_member_required
+def slow_routes_view(request):
+    """
+    Lists the slowest profiled routes of this process (?limit=N, 10 by default).
+    """
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+    return JsonResponse({'sample_rate': settings.REQUEST_PROFILING_SAMPLE_RATE, 'routes': slowest_routes(limit)})
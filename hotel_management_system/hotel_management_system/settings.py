@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'hotel_management_system.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +57,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request profiling (see hotel_management_system/middleware.py): share of the requests to profile,
+# latency logged as a warning, and repetitions of one SQL template reported as duplicated queries.
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILING_SAMPLE_RATE", "0"))
+REQUEST_PROFILING_SLOW_MS = float(os.getenv("REQUEST_PROFILING_SLOW_MS", "500"))
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = int(os.getenv("REQUEST_PROFILING_DUPLICATE_THRESHOLD", "5"))
+
 ROOT_URLCONF = 'hotel_management_system.urls'
 
 TEMPLATES = [
@@ -80,13 +87,77 @@ WSGI_APPLICATION = 'hotel_management_system.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE: sqlite (default) or postgresql (requires psycopg).
+
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv("DB_NAME", "hotel_management_system"),
+            'USER': os.getenv("DB_USER", ""),
+            'PASSWORD': os.getenv("DB_PASSWORD", ""),
+            'HOST': os.getenv("DB_HOST", ""),
+            'PORT': os.getenv("DB_PORT", ""),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.getenv("DB_POOL", "False") == "True":
+        # psycopg pool; Django requires persistent connections to be disabled when pooling.
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            'max_size': int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        }
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+else:
+    # WAL lets readers run alongside the writer, synchronous=NORMAL is safe under WAL, and
+    # IMMEDIATE transactions take the write lock up front instead of failing on lock upgrade.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv("DB_NAME", os.path.join(BASE_DIR, 'db.sqlite3')),
+            'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "0")),
+            'OPTIONS': {
+                'timeout': int(os.getenv("SQLITE_TIMEOUT", "20")),
+                'transaction_mode': os.getenv("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+                'init_command': (
+                    f"PRAGMA journal_mode={os.getenv('SQLITE_JOURNAL_MODE', 'WAL')};"
+                    f"PRAGMA synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')};"
+                    f"PRAGMA busy_timeout={int(os.getenv('SQLITE_TIMEOUT', '20')) * 1000};"
+                ),
+            },
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# CACHE_BACKEND: locmem (default), file or redis (requires the redis package).
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': CACHE_BACKENDS[os.getenv("CACHE_BACKEND", "locmem")],
+        'LOCATION': os.getenv("CACHE_LOCATION", "hotel-management-system"),
+        'TIMEOUT': int(os.getenv("CACHE_TIMEOUT", "300")),
+        'KEY_PREFIX': os.getenv("CACHE_KEY_PREFIX", "hms"),
     }
 }
 
+# In-memory hotel spatial index (see Hotel/geo.py): grid cell size in degrees, and seconds
+# after which a process syncs its index with the hotels changed by other processes.
+GEO_INDEX_CELL_SIZE = float(os.getenv("GEO_INDEX_CELL_SIZE", "0.1"))
+GEO_INDEX_MAX_AGE = int(os.getenv("GEO_INDEX_MAX_AGE", "300"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -106,6 +177,44 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER: pbkdf2 (default), scrypt or argon2 (requires argon2-cffi). New passwords use it;
+# the others stay listed so existing hashes still verify and get rehashed on the next login.
+
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'User.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'User.hashers.ScryptPasswordHasher',
+    'argon2': 'User.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+]
+
+# Hasher costs (see User/hashers.py), Django's defaults unless set; changing one rehashes passwords on login.
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "870000"))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", str(2 ** 14)))
+SCRYPT_BLOCK_SIZE = int(os.getenv("SCRYPT_BLOCK_SIZE", "8"))
+SCRYPT_PARALLELISM = int(os.getenv("SCRYPT_PARALLELISM", "5"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/
+# SESSION_BACKEND: db (default), cached_db, cache or signed_cookies. cache needs a cache shared by every
+# worker (CACHE_BACKEND=redis) and loses sessions on eviction; signed_cookies keeps the session in the
+# browser and skips the session table entirely.
+
+SESSION_BACKENDS = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_BACKENDS[os.getenv("SESSION_BACKEND", "db")]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
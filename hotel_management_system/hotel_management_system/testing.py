@@ -0,0 +1,35 @@
+"""
+Test helpers shared by the apps test suites.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class ChangelistQueryCountMixin:
+    """
+    Asserts that an admin changelist runs the same number of queries whatever the number of rows,
+    which catches N+1 queries in list_display.
+    """
+
+    def changelist_queries(self, model):
+        """
+        Loads the changelist of the model and returns the number of queries it ran.
+        """
+        url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def assertChangelistQueriesConstant(self, model, add_rows, superuser):
+        """
+        Compares the changelist queries after add_rows(n) is called with a few rows and with many more.
+        """
+        self.client.force_login(superuser)
+        add_rows(2)
+        few = self.changelist_queries(model)
+        add_rows(20)
+        many = self.changelist_queries(model)
+        self.assertEqual(few, many, f"{model.__name__} changelist queries grow with the number of rows.")
@@ -20,7 +20,10 @@ from django.views.generic import RedirectView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .middleware import slow_routes_view
+
 urlpatterns = [
+    path('admin/slow-routes/', slow_routes_view, name="slow_routes"),
     path('admin/', admin.site.urls),
     # paths from the system app
     path('booking/', include('Booking.urls')),